@@ -0,0 +1,431 @@
+"""HTTP service exposing the meeting-notes pipeline to other services
+
+Run locally with:
+
+    python api_server.py --port 8080 --workers 2 --max-queued 8
+
+Endpoints:
+    POST /jobs                 multipart upload (field "file"), returns 202 + job id
+                               query: transcription_model (or "auto"), summarization_model,
+                               diarize, two_pass (whisper-tiny preview before the selected model),
+                               preset (fast|balanced|accurate), language (e.g. "en", default auto
+                               or MEETING_NOTES_LANGUAGE);
+                               header X-Session-Id groups a client's jobs for fair scheduling
+    GET  /jobs/{job_id}        job status, current stage, admission queue position/ETA
+                               and preview transcript
+    GET  /jobs/{job_id}/result full result once the job is done
+    GET  /health               queue depth and worker usage
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+# Force PyTorch and disable TensorFlow completely (same as app.py)
+os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
+os.environ["USE_TORCH"] = "1"
+os.environ["TRANSFORMERS_NO_TF"] = "1"
+os.environ["NO_TF"] = "1"
+
+from aiohttp import web
+
+from utils.admission import AdmissionController, cpu_cores, set_torch_threads
+from utils.checkpoints import CheckpointStore
+from utils.decode_options import DECODE_PRESETS, DecodeOptions, default_language
+from utils.model_selection import AUTO_MODEL, MODEL_NAMES, ModelSelector
+from utils.nltk_resources import get_nltk_resources
+from utils.pipeline import MeetingPipeline, build_result
+from utils.summarizer_registry import summarizer_names
+
+SUPPORTED_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.flac')
+TRANSCRIPTION_MODELS = tuple(MODEL_NAMES.values()) + (AUTO_MODEL,)
+SUMMARIZATION_MODELS = tuple(summarizer_names())
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# One pipeline per settings and per worker process. Stages go to whichever
+# process is free, so a pipeline's Whisper models are unloaded after every
+# transcription stage: a model is only resident while an admitted job uses it.
+_worker_pipelines = {}
+_checkpoint_store = None
+
+
+def _init_worker(threads=None):
+    """Load NLTK data once when a worker process starts, never from the network
+
+    ``threads`` caps torch's intra-op threads so concurrent workers do not
+    oversubscribe the cores.
+    """
+    if threads:
+        set_torch_threads(threads)
+    get_nltk_resources().preload()
+
+
+def _get_checkpoint_store():
+    """Per-process connection to the shared checkpoint database"""
+    global _checkpoint_store
+    if _checkpoint_store is None:
+        _checkpoint_store = CheckpointStore()
+    return _checkpoint_store
+
+
+def _get_worker_pipeline(transcription_model, summarization_model, diarize, preset="balanced", language=None):
+    key = (transcription_model, summarization_model, diarize, preset, language)
+    if key not in _worker_pipelines:
+        _worker_pipelines[key] = MeetingPipeline(
+            transcription_model, summarization_model, diarize=diarize,
+            decode_options=DecodeOptions.from_preset(preset, language=language),
+            checkpoints=_get_checkpoint_store()
+        )
+    return _worker_pipelines[key]
+
+
+def run_pipeline_stage(transcription_model, summarization_model, diarize, stage, argument,
+                       preset="balanced", language=None):
+    """Executed inside a worker process: run one pipeline stage"""
+    pipeline = _get_worker_pipeline(transcription_model, summarization_model, diarize, preset, language)
+    if stage == "audio_info":
+        return pipeline.get_audio_info(argument)
+    if stage == "transcription":
+        # A resubmitted file resumes from the chunks a crashed or restarted worker finished;
+        # finished checkpoints are left for CheckpointStore's age-based pruning
+        try:
+            checkpoint = pipeline.open_checkpoint(argument, transcription_model)
+            return pipeline.transcribe(argument, checkpoint=checkpoint)
+        finally:
+            pipeline.unload_models()
+    if stage == "preview":
+        # whisper-tiny draft: no diarization and no checkpoint, the full pass follows
+        try:
+            return pipeline.transcribe_preview(argument)
+        finally:
+            pipeline.unload_models()
+    if stage == "summary":
+        return pipeline.summarize(argument)
+    if stage == "statistics":
+        segments, keyphrases = argument
+        return pipeline.compute_statistics(segments, keyphrases=keyphrases)
+    raise ValueError(f"Unknown pipeline stage: {stage}")
+
+
+class Job:
+    """State of one submitted meeting"""
+
+    def __init__(self, audio_path, filename, transcription_model, summarization_model,
+                 diarize=False, two_pass=False, preset="balanced", language=None, session_id=None):
+        self.id = uuid.uuid4().hex
+        self.audio_path = audio_path
+        self.filename = filename
+        self.transcription_model = transcription_model
+        self.summarization_model = summarization_model
+        self.diarize = diarize
+        self.two_pass = two_pass
+        self.session_id = session_id
+        # AdmissionController ticket while the job waits for or holds resources
+        self.ticket = None
+        self.decode_options = DecodeOptions.from_preset(preset, language=language)
+        # Filled in when the job starts: the model actually used and, for
+        # "auto", why it was picked; preview holds the two-pass draft transcript
+        self.model = None if transcription_model == AUTO_MODEL else transcription_model
+        self.model_selection = None
+        self.preview = None
+        self.status = "queued"
+        self.stage = None
+        self.error = None
+        self.result = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "stage": self.stage,
+            "error": self.error,
+            "transcription_model": self.transcription_model,
+            "summarization_model": self.summarization_model,
+            "diarize": self.diarize,
+            "decode_options": self.decode_options.to_dict(),
+            "model": self.model,
+            "model_selection": self.model_selection,
+            "preview": self.preview,
+            "admission": self.ticket.to_dict() if self.ticket is not None else None,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """Bounded job queue feeding a fixed number of pipeline workers
+
+    At most ``max_queued`` jobs wait in the queue; further submissions are
+    rejected so callers back off instead of piling up uploads on disk. At most
+    ``workers`` jobs run at once, each stage on a process-pool executor so the
+    event loop only handles I/O. Before transcription a job also waits for
+    the AdmissionController, which keeps the loaded models within the
+    memory budget and takes clients in turn.
+    """
+
+    def __init__(self, workers=2, max_queued=8, max_finished=1000, latency_slo=120.0,
+                 admission=None):
+        self.workers = workers
+        # Memory/CPU budget and per-client fairness on top of the worker limit
+        self.admission = admission or AdmissionController(threads_per_job=max(1, cpu_cores() // workers))
+        self.model_selector = ModelSelector(latency_slo=latency_slo)
+        self.queue = asyncio.Queue(maxsize=max_queued)
+        self.jobs = {}
+        self.max_finished = max_finished
+        self.running = 0
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            initargs=(self.admission.threads_per_job,))
+        self._worker_tasks = []
+
+    def start(self):
+        for _ in range(self.workers):
+            self._worker_tasks.append(asyncio.create_task(self._worker()))
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, job):
+        """Queue a job; raises asyncio.QueueFull when the service is saturated"""
+        self.queue.put_nowait(job)
+        self.jobs[job.id] = job
+        self._forget_old_jobs()
+        return job
+
+    def _forget_old_jobs(self):
+        finished = [job for job in self.jobs.values() if job.status in ("done", "failed")]
+        if len(finished) <= self.max_finished:
+            return
+        finished.sort(key=lambda job: job.finished_at)
+        for job in finished[:len(finished) - self.max_finished]:
+            del self.jobs[job.id]
+
+    async def _run_stage(self, job, stage, argument):
+        job.stage = stage
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, run_pipeline_stage,
+            job.model or job.transcription_model, job.summarization_model, job.diarize,
+            stage, argument, job.decode_options.preset, job.decode_options.language
+        )
+
+    async def _process(self, job):
+        timings = {}
+
+        async def timed(stage, argument):
+            started = time.perf_counter()
+            value = await self._run_stage(job, stage, argument)
+            timings[stage] = time.perf_counter() - started
+            return value
+
+        # The SegmentStore is pickled between processes as a handful of flat arrays
+        audio_info = await timed("audio_info", job.audio_path)
+        if job.transcription_model == AUTO_MODEL:
+            # Counting the backlog as queue depth trades accuracy for throughput under load
+            choice = self.model_selector.choose(audio_info["duration"], queue_depth=self.queue.qsize(),
+                                                workers=self.workers)
+            job.model = choice.model
+            job.model_selection = choice.to_dict()
+        preview = job.two_pass and job.model != MODEL_NAMES["tiny"]
+        job.stage = "admission"
+        job.ticket = self.admission.request(job.session_id or job.id, job.model, audio_info["duration"],
+                                            extra_models=(MODEL_NAMES["tiny"],) if preview else ())
+        while not job.ticket.granted:
+            await asyncio.sleep(0.5)
+        if preview:
+            preview = await timed("preview", job.audio_path)
+            job.preview = preview.text
+        segments = await timed("transcription", job.audio_path)
+        summary = await timed("summary", segments)
+        statistics = await timed("statistics", (segments, summary.get("keyphrase_scores")))
+
+        result = build_result(
+            job.filename, audio_info, segments, summary, statistics,
+            transcription_model=job.model,
+            summarization_model=job.summarization_model,
+            timings=timings,
+            model_selection=job.model_selection,
+            decode_options=job.decode_options.to_dict(),
+        )
+        return result
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            self.running += 1
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                job.result = await self._process(job)
+                job.status = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                if job.ticket is not None:
+                    job.ticket.release()
+                job.finished_at = time.time()
+                job.stage = None
+                self.running -= 1
+                self.queue.task_done()
+                if os.path.exists(job.audio_path):
+                    os.unlink(job.audio_path)
+
+    def health(self):
+        return {
+            "queued": self.queue.qsize(),
+            "max_queued": self.queue.maxsize,
+            "running": self.running,
+            "workers": self.workers,
+            "admission": self.admission.status(),
+        }
+
+
+def _json_error(status, message, **headers):
+    return web.json_response({"error": message}, status=status, headers=headers or None)
+
+
+async def _save_upload(field, max_bytes):
+    """Stream a multipart field to a temporary file without buffering it in memory"""
+    extension = os.path.splitext(field.filename or "")[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise web.HTTPUnsupportedMediaType(
+            text=f"Unsupported format '{extension}'. Supported formats: {', '.join(SUPPORTED_EXTENSIONS)}"
+        )
+
+    loop = asyncio.get_running_loop()
+    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=extension)
+    size = 0
+    try:
+        while True:
+            chunk = await field.read_chunk(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise web.HTTPRequestEntityTooLarge(max_size=max_bytes, actual_size=size)
+            await loop.run_in_executor(None, tmp_file.write, chunk)
+    except Exception:
+        tmp_file.close()
+        os.unlink(tmp_file.name)
+        raise
+    tmp_file.close()
+    return tmp_file.name
+
+
+async def create_job(request):
+    manager = request.app["job_manager"]
+    if manager.queue.full():
+        return _json_error(503, "Job queue is full, retry later", **{"Retry-After": "10"})
+
+    transcription_model = request.query.get("transcription_model", "openai/whisper-tiny")
+    summarization_model = request.query.get("summarization_model", "lsa")
+    diarize = request.query.get("diarize", "false").lower() in ("1", "true", "yes")
+    two_pass = request.query.get("two_pass", "false").lower() in ("1", "true", "yes")
+    preset = request.query.get("preset", "balanced")
+    language = request.query.get("language", default_language())
+    if transcription_model not in TRANSCRIPTION_MODELS:
+        return _json_error(400, f"Unknown transcription model: {transcription_model}")
+    if summarization_model not in SUMMARIZATION_MODELS:
+        return _json_error(400, f"Unknown summarization model: {summarization_model}")
+    if preset not in DECODE_PRESETS:
+        return _json_error(400, f"Unknown decode preset: {preset}")
+
+    reader = await request.multipart()
+    field = await reader.next()
+    while field is not None and field.name != "file":
+        field = await reader.next()
+    if field is None:
+        return _json_error(400, "Missing multipart field 'file'")
+
+    audio_path = await _save_upload(field, request.app["max_upload_bytes"])
+    job = Job(audio_path, field.filename, transcription_model, summarization_model,
+              diarize=diarize, two_pass=two_pass, preset=preset, language=language,
+              session_id=request.headers.get("X-Session-Id") or request.remote)
+    try:
+        manager.submit(job)
+    except asyncio.QueueFull:
+        os.unlink(audio_path)
+        return _json_error(503, "Job queue is full, retry later", **{"Retry-After": "10"})
+
+    return web.json_response(job.to_dict(), status=202,
+                             headers={"Location": f"/jobs/{job.id}"})
+
+
+def _get_job(request):
+    job = request.app["job_manager"].jobs.get(request.match_info["job_id"])
+    if job is None:
+        raise web.HTTPNotFound(text="Unknown job id")
+    return job
+
+
+async def job_status(request):
+    return web.json_response(_get_job(request).to_dict())
+
+
+async def job_result(request):
+    job = _get_job(request)
+    if job.status == "failed":
+        return _json_error(500, job.error)
+    if job.status != "done":
+        return _json_error(409, f"Job is {job.status}")
+    return web.json_response(job.result)
+
+
+async def health(request):
+    return web.json_response(request.app["job_manager"].health())
+
+
+def create_app(workers=2, max_queued=8, max_upload_mb=200, latency_slo=120.0):
+    app = web.Application(client_max_size=max_upload_mb * 1024 * 1024)
+    app["max_upload_bytes"] = max_upload_mb * 1024 * 1024
+
+    async def on_startup(app):
+        app["job_manager"] = JobManager(workers=workers, max_queued=max_queued,
+                                            latency_slo=latency_slo)
+        app["job_manager"].start()
+
+    async def on_cleanup(app):
+        await app["job_manager"].stop()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.add_routes([
+        web.post("/jobs", create_job),
+        web.get("/jobs/{job_id}", job_status),
+        web.get("/jobs/{job_id}/result", job_result),
+        web.get("/health", health),
+    ])
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Meeting Notes Generator HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=2,
+                        help="Maximum number of meetings processed concurrently")
+    parser.add_argument("--max-queued", type=int, default=8,
+                        help="Jobs allowed to wait before uploads are rejected with 503")
+    parser.add_argument("--max-upload-mb", type=int, default=200)
+    parser.add_argument("--latency-slo", type=float, default=120.0,
+                        help="Target seconds per job when transcription_model=auto")
+    args = parser.parse_args()
+
+    app = create_app(workers=args.workers, max_queued=args.max_queued,
+                     max_upload_mb=args.max_upload_mb, latency_slo=args.latency_slo)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import streamlit as st
 import os
 import tempfile
+import uuid
 
 # Force PyTorch and disable TensorFlow completely
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
@@ -8,11 +9,19 @@ os.environ["USE_TORCH"] = "1"
 os.environ["TRANSFORMERS_NO_TF"] = "1"
 os.environ["NO_TF"] = "1"
 
-# Import after setting environment
-from utils.audio_processor import AudioProcessor
-from utils.transcription import TranscriptGenerator
-from utils.summarization import SummaryGenerator
-from utils.visualization import TextVisualizer  # NEW IMPORT
+# Import after setting environment. Stores, indexes, exports and charts are
+# imported by the pages and cached resources that use them, so a cold start
+# only loads what the upload page needs.
+from utils.pipeline import MeetingPipeline, build_result
+from utils.admission import AdmissionController
+from utils.model_selection import MODEL_NAMES, ModelSelector
+from utils.decode_options import AUTO_LANGUAGE, DECODE_PRESETS, DecodeOptions, default_language
+from utils.diarization import format_speaker_transcript
+from utils.postprocessing import TranscriptPostProcessor, low_confidence_segments
+from utils.profiling import PROFILE_ENV, RunProfiler, profiling_enabled
+from utils.segments import format_timestamp
+from utils.sentence_segmenter import split_sentences
+from utils.summarizer_registry import summarizer_names
 from datetime import datetime
 
 # Page configuration - FULL SCREEN
@@ -88,6 +97,10 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 def main():
+    # Identifies this browser session in the shared admission queue
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    
     # Header - Full Width
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
@@ -109,7 +122,7 @@ def main():
         """, unsafe_allow_html=True)
         
         st.title("Navigation")
-        app_mode = st.selectbox("Choose Mode", ["Upload Audio", "About Project"])
+        app_mode = st.selectbox("Choose Mode", ["Upload Audio", "Search Meetings", "Meeting Analytics", "About Project"])
         
         if app_mode == "Upload Audio":
             st.markdown("---")
@@ -118,12 +131,85 @@ def main():
             # Model selection
             transcription_model = st.selectbox(
                 "Transcription Model",
-                ["openai/whisper-tiny", "openai/whisper-base", "openai/whisper-small"]
+                ["openai/whisper-tiny", "openai/whisper-base", "openai/whisper-small", "auto"],
+                help="'auto' picks the largest model expected to finish within the latency target"
+            )
+            
+            if transcription_model == "auto":
+                st.number_input(
+                    "Latency target (seconds)",
+                    min_value=10,
+                    value=120,
+                    step=10,
+                    key="latency_slo"
+                )
+                st.checkbox(
+                    "Two-pass preview",
+                    key="two_pass",
+                    help="Show a quick whisper-tiny transcript while the selected model runs"
+                )
+            
+            st.selectbox(
+                "Decoding preset",
+                list(DECODE_PRESETS),
+                index=list(DECODE_PRESETS).index("balanced"),
+                key="decode_preset",
+                help="fast: greedy, no retries; balanced: greedy with temperature fallback; accurate: beam search"
+            )
+            
+            # Auto-detect first unless the deployment pins a language (MEETING_NOTES_LANGUAGE)
+            languages = list(dict.fromkeys([default_language(), AUTO_LANGUAGE, "en"]))
+            st.selectbox(
+                "Language",
+                languages,
+                format_func=lambda code: "Auto-detect" if code == AUTO_LANGUAGE else code,
+                key="language",
+                help="Pinning the language skips Whisper's detection pass"
             )
             
             summarization_model = st.selectbox(
                 "Summarization Model",
-                ["lsa", "textrank"]
+                summarizer_names(),
+                help="Longer meetings are summarized by this model together with LSA, TextRank and Luhn"
+            )
+            
+            st.checkbox(
+                "Speaker diarization",
+                key="diarize",
+                help="Label who said what (slower, CPU only)"
+            )
+            
+            st.checkbox(
+                "Skip silence",
+                value=True,
+                key="trim_silence",
+                help="Cut long pauses before transcription; timestamps still match the original audio"
+            )
+            
+            st.checkbox(
+                "Normalize loudness",
+                key="normalize_loudness",
+                help="Boost quiet recordings before transcription"
+            )
+            
+            st.checkbox(
+                "Re-check unclear passages",
+                key="refine_low_confidence",
+                help="Re-transcribe low-confidence passages with the next larger Whisper model"
+            )
+            
+            st.text_input(
+                "Tags",
+                key="tags",
+                placeholder="e.g. sales, weekly-sync",
+                help="Comma-separated tags (team, project) used to group meeting analytics"
+            )
+            
+            st.checkbox(
+                "Profile this run",
+                value=profiling_enabled(),
+                key="profile_run",
+                help=f"Save a cProfile/flame graph/memory report per meeting (default from {PROFILE_ENV})"
             )
             
             return transcription_model, summarization_model, app_mode
@@ -174,9 +260,15 @@ def upload_audio_interface(transcription_model, summarization_model):
     
     return None, None, None
 
-def display_results_fullscreen(transcript, summary_result):
+def display_results_fullscreen(segments, summary_result, postprocessing=None):
     """Display results in full-screen layout"""
     
+    # Show who said what when the segments were diarized
+    if segments.has_speakers:
+        transcript = format_speaker_transcript(segments)
+    else:
+        transcript = segments.text
+    
     # Main Results Header - BLUE BOX
     st.markdown("""
     <div class="section-header" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);">
@@ -203,6 +295,7 @@ def display_results_fullscreen(transcript, summary_result):
             height=400,
             label_visibility="collapsed"
         )
+        display_transcript_quality(segments, postprocessing)
     
     with col2:
         # Summary Section - Full height with BLUE HEADER
@@ -214,13 +307,14 @@ def display_results_fullscreen(transcript, summary_result):
         
         # Overall Summary
         st.markdown('<div class="summary-card">', unsafe_allow_html=True)
-        if summary_result["overall_summary"]:
-            summary_points = clean_text_for_display(summary_result["overall_summary"])
+        summary_points = summary_section_points(summary_result, "overall_summary")
+        if summary_points:
             for point in summary_points:
-                if point.strip():
-                    st.markdown(f"<div class='point-item'>• {point.strip()}</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='point-item'>• {point}</div>", unsafe_allow_html=True)
         else:
             st.info("No overall summary generated.")
+        if summary_result.get("keyphrases"):
+            st.caption(f"🔑 {', '.join(summary_result['keyphrases'])}")
         st.markdown('</div>', unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
@@ -237,11 +331,10 @@ def display_results_fullscreen(transcript, summary_result):
         """, unsafe_allow_html=True)
         
         st.markdown('<div class="summary-card">', unsafe_allow_html=True)
-        if summary_result["action_items"] and summary_result["action_items"] != "No specific action items identified.":
-            action_points = clean_text_for_display(summary_result["action_items"])
+        action_points = summary_section_points(summary_result, "action_items")
+        if action_points:
             for action in action_points:
-                if action.strip():
-                    st.markdown(f"<div class='action-item'>☐ {action.strip()}</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='action-item'>☐ {action}</div>", unsafe_allow_html=True)
         else:
             st.info("No specific action items identified.")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -255,11 +348,10 @@ def display_results_fullscreen(transcript, summary_result):
         """, unsafe_allow_html=True)
         
         st.markdown('<div class="summary-card">', unsafe_allow_html=True)
-        if summary_result["decisions"] and summary_result["decisions"] != "No specific decisions identified.":
-            decision_points = clean_text_for_display(summary_result["decisions"])
+        decision_points = summary_section_points(summary_result, "decisions")
+        if decision_points:
             for decision in decision_points:
-                if decision.strip():
-                    st.markdown(f"<div class='decision-item'>✓ {decision.strip()}</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='decision-item'>✓ {decision}</div>", unsafe_allow_html=True)
         else:
             st.info("No specific decisions identified.")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -274,17 +366,67 @@ def display_results_fullscreen(transcript, summary_result):
     """, unsafe_allow_html=True)
     
     st.markdown('<div class="summary-card">', unsafe_allow_html=True)
-    if summary_result["key_points"] and summary_result["key_points"] != "No key points identified.":
-        key_points_list = clean_text_for_display(summary_result["key_points"])
+    key_points_list = summary_section_points(summary_result, "key_points")
+    if key_points_list:
         for i, point in enumerate(key_points_list, 1):
-            if point.strip():
-                st.markdown(f"<div class='key-point-item'>{i}. {point.strip()}</div>", unsafe_allow_html=True)
+            st.markdown(f"<div class='key-point-item'>{i}. {point}</div>", unsafe_allow_html=True)
     else:
         st.info("No key points identified.")
     st.markdown('</div>', unsafe_allow_html=True)
+    
+    display_agenda(summary_result.get("topics") or [])
+
+def display_transcript_quality(segments, postprocessing=None):
+    """Passages Whisper was unsure about, and what post-processing removed or re-transcribed"""
+    uncertain = low_confidence_segments(segments)
+    if uncertain:
+        with st.expander(f"⚠️ {len(uncertain)} low-confidence passage(s) - worth checking against the audio"):
+            for index in uncertain:
+                segment = segments[index]
+                st.markdown(f"`{format_timestamp(segment.start) or '--:--'}` *{segment.text}* "
+                            f"({segment.confidence:.0%} confidence)")
+    
+    if postprocessing and (postprocessing["dropped"] or postprocessing["refined"]):
+        with st.expander(f"🧹 Post-processing: {len(postprocessing['dropped'])} segment(s) removed, "
+                         f"{len(postprocessing['refined'])} passage(s) re-transcribed"):
+            for segment in postprocessing["dropped"]:
+                st.markdown(f"`{format_timestamp(segment['start']) or '--:--'}` ~~{segment['text'].strip()}~~ "
+                            f"({segment['reason']})")
+            for span in postprocessing["refined"]:
+                st.markdown(f"`{format_timestamp(span['start']) or '--:--'}` ~~{span['before']}~~ → "
+                            f"**{span['after']}**")
+
+def display_agenda(topics):
+    """One expander per topic of a meeting with more than one"""
+    if len(topics) < 2:
+        return
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("""
+    <div class="section-header" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);">
+        <h3 style="margin: 0;">🗂️ Agenda</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    for i, topic in enumerate(topics, 1):
+        start, end = format_timestamp(topic.get("start")), format_timestamp(topic.get("end"))
+        label = f"{i}. {topic['title']}" + (f" ({start} - {end})" if start and end else "")
+        with st.expander(label, expanded=i == 1):
+            if topic.get("keywords"):
+                st.caption(", ".join(topic["keywords"]))
+            for point in summary_section_points(topic, "summary"):
+                st.markdown(f"<div class='point-item'>• {point}</div>", unsafe_allow_html=True)
+            for action in summary_section_points(topic, "action_items"):
+                st.markdown(f"<div class='action-item'>☐ {action}</div>", unsafe_allow_html=True)
+            for decision in summary_section_points(topic, "decisions"):
+                st.markdown(f"<div class='decision-item'>✓ {decision}</div>", unsafe_allow_html=True)
 
-def display_visualizations(transcript):
-    """Display word cloud and frequency analysis"""
+def display_visualizations(segments, keyphrases=None):
+    """Display word cloud and frequency analysis
+    
+    ``keyphrases`` are the summary's scored key phrases, reused rather
+    than extracted again from the transcript.
+    """
     
     st.markdown("---")
     st.markdown("""
@@ -293,12 +435,14 @@ def display_visualizations(transcript):
     </div>
     """, unsafe_allow_html=True)
     
+    from utils.visualization import TextVisualizer
+
     # Initialize visualizer
     visualizer = TextVisualizer()
     
     # Generate visualizations
     with st.spinner("🔄 Generating text insights and visualizations..."):
-        viz_data = visualizer.create_visualization_section(transcript)
+        viz_data = visualizer.create_visualization_section(segments, keyphrases=keyphrases)
     
     if viz_data:
         # Display in two columns
@@ -308,7 +452,7 @@ def display_visualizations(transcript):
             st.markdown("#### ☁️ Word Cloud Analysis")
             if viz_data['wordcloud']:
                 st.image(viz_data['wordcloud'], use_column_width=True)
-                st.caption("Visual representation of most frequent terms in the meeting")
+                st.caption("Visual representation of the key phrases of the meeting")
             else:
                 st.info("Could not generate word cloud from the text")
         
@@ -336,6 +480,13 @@ def display_visualizations(transcript):
         with stats_col4:
             st.metric("Avg. Sentence Length", f"{viz_data['statistics']['avg_sentence_length']:.1f}")
         
+        if viz_data['statistics'].get('keyphrases'):
+            st.markdown("#### 🔑 Key Phrases")
+            st.dataframe({
+                'Phrase': [phrase for phrase, score in viz_data['statistics']['keyphrases']],
+                'Score': [score for phrase, score in viz_data['statistics']['keyphrases']]
+            }, use_container_width=True)
+        
         # Most Common Words Table
         st.markdown("#### 🏆 Top 10 Most Frequent Words")
         if viz_data['statistics']['most_common_words']:
@@ -344,23 +495,69 @@ def display_visualizations(transcript):
                 'Frequency': [count for word, count in viz_data['statistics']['most_common_words']]
             }
             st.dataframe(common_words_data, use_container_width=True)
+        
+        if viz_data['statistics'].get('top_phrases'):
+            st.markdown("#### 🔗 Top Phrases")
+            st.dataframe({
+                'Phrase': [phrase for phrase, count in viz_data['statistics']['top_phrases']],
+                'Frequency': [count for phrase, count in viz_data['statistics']['top_phrases']]
+            }, use_container_width=True)
     else:
         st.warning("Not enough text data to generate meaningful visualizations")
 
+def summary_section_points(summary_result, section):
+    """Display lines for one summary section, prefixed with their audio position
+    
+    Uses the per-item data from the summarizer, so nothing is re-split here.
+    """
+    # Topic dicts keep their item lists at the top level
+    items = summary_result.get("items", {}).get(section, summary_result.get(section))
+    if not isinstance(items, list):
+        return clean_text_for_display(summary_result[section])
+    
+    points = []
+    for item in items:
+        timestamp = format_timestamp(item["start"])
+        points.append(f"[{timestamp}] {item['text']}" if timestamp else item["text"])
+    return points
+
 def clean_text_for_display(text):
     """Clean and split text for better display"""
     import re
     # Remove "So, " patterns at the beginning
     text = re.sub(r'^So,\s+', '', text.strip())
-    # Split by sentences or newlines
-    sentences = re.split(r'[.!?]\s+|\n', text)
+    # Split by lines, then into sentences with the pipeline's segmenter
+    sentences = [sentence for line in text.split('\n') for sentence in split_sentences(line)]
     # Filter out empty strings and very short sentences
     cleaned = [s.strip() for s in sentences if len(s.strip()) > 10]
     return cleaned
 
 def process_audio_file(uploaded_file, transcription_model, summarization_model):
+    """Process the uploaded audio file, profiled when the sidebar (or MEETING_NOTES_PROFILE) asks for it"""
+    profiler = RunProfiler(uploaded_file.name, enabled=st.session_state.get("profile_run", profiling_enabled()))
+    with profiler:
+        generate_meeting_notes(uploaded_file, transcription_model, summarization_model)
+    if profiler.path:
+        display_profile(profiler)
+
+def display_profile(profiler):
+    """Where the profile of this run was saved, with the report for a slow-meeting ticket"""
+    with st.expander("🔬 Profile of this run"):
+        summary = profiler.summary
+        st.markdown(f"**{summary['seconds']:.1f} s** wall time, peak traced memory "
+                    f"**{summary['peak_traced_mb']} MB**, {summary['samples']} stack samples")
+        st.caption(f"Saved to {profiler.path} (profile.prof, flamegraph.folded, report.txt)")
+        with open(os.path.join(profiler.path, "report.txt"), encoding="utf-8") as f:
+            report = f.read()
+        st.download_button("📥 Download report", report, file_name="profile_report.txt", mime="text/plain")
+        st.code(report[:5000])
+
+def generate_meeting_notes(uploaded_file, transcription_model, summarization_model):
     """Process the uploaded audio file and generate meeting notes"""
     
+    checkpoint = None
+    ticket = None
+    pipeline = None
     try:
         # Initialize progress
         progress_bar = st.progress(0)
@@ -368,14 +565,31 @@ def process_audio_file(uploaded_file, transcription_model, summarization_model):
         
         # Step 1: Save and validate audio file
         status_text.text("Step 1/5: Processing audio file...")
-        audio_processor = AudioProcessor()
+        pipeline = MeetingPipeline(
+            transcription_model, summarization_model,
+            diarize=st.session_state.get("diarize", False),
+            trim_silence=st.session_state.get("trim_silence", True),
+            normalize_loudness=st.session_state.get("normalize_loudness", False),
+            model_selector=ModelSelector(latency_slo=st.session_state.get("latency_slo", 120)),
+            decode_options=DecodeOptions.from_preset(
+                st.session_state.get("decode_preset", "balanced"),
+                language=st.session_state.get("language", default_language())
+            ),
+            search_index=get_search_index(),
+            meeting_store=get_meeting_store(),
+            analytics=get_analytics(),
+            checkpoints=get_checkpoint_store(),
+            num_threads=get_admission_controller().threads_per_job,
+            duplicate_index=get_duplicate_index(),
+            postprocessor=TranscriptPostProcessor(refine=st.session_state.get("refine_low_confidence", False))
+        )
         
         with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
             tmp_file.write(uploaded_file.getvalue())
             temp_audio_path = tmp_file.name
         
         # Validate and get audio info
-        audio_info = audio_processor.get_audio_info(temp_audio_path)
+        audio_info = pipeline.get_audio_info(temp_audio_path)
         progress_bar.progress(20)
         
         # Display audio info
@@ -388,21 +602,55 @@ def process_audio_file(uploaded_file, transcription_model, summarization_model):
         with col3:
             st.metric("Channels", audio_info['channels'])
         
+        # Resolve "auto" to a concrete model for this file, counting every other session's jobs as load
+        admission = get_admission_controller()
+        load = admission.status()
+        choice = pipeline.select_model(audio_info['duration'], queue_depth=load['queued'] + load['running'],
+                                       workers=admission.slots)
+        if choice:
+            transcription_model = choice.model
+            st.info(f"🤖 Auto-selected **{choice.model}** (~{choice.estimated_seconds:.0f}s): {choice.reason}")
+        
+        # Wait for CPU and memory to be free; sessions take turns
+        two_pass = st.session_state.get("two_pass", False) and transcription_model != MODEL_NAMES["tiny"]
+        ticket = admission.request(st.session_state.session_id, transcription_model, audio_info['duration'],
+                                   extra_models=(MODEL_NAMES["tiny"],) if two_pass else ())
+        while not ticket.wait(timeout=1.0):
+            status_text.text(f"⏳ Waiting for a free slot: position {ticket.position} in queue, "
+                             f"starting in ~{ticket.eta:.0f}s")
+        
         # Step 2: Transcribe audio
-        status_text.text("Step 2/5: Transcribing audio...")
-        transcript_generator = TranscriptGenerator(model_name=transcription_model)
+        preview_area = st.empty()
+        if two_pass:
+            status_text.text("Step 2/5: Transcribing a quick preview...")
+            with st.spinner("⚡ Generating a quick preview with whisper-tiny..."):
+                preview = pipeline.transcribe_preview(temp_audio_path)
+            with preview_area.container():
+                st.markdown("#### ⚡ Preview Transcript")
+                st.caption(f"Quick whisper-tiny draft; refining with {transcription_model}...")
+                st.write(preview.text)
         
+        # Chunks finished by an earlier, interrupted attempt on the same file are reused
+        checkpoint = pipeline.open_checkpoint(temp_audio_path, transcription_model, source=uploaded_file.name)
+        status_text.text("Step 2/5: Transcribing audio...")
         with st.spinner("🎙️ Transcribing audio content... This may take a few moments."):
-            transcript = transcript_generator.transcribe_audio(temp_audio_path)
+            segments = pipeline.transcribe(temp_audio_path, model=transcription_model, checkpoint=checkpoint)
+        preview_area.empty()
         
         progress_bar.progress(40)
         
         # Step 3: Generate summary
         status_text.text("Step 3/5: Generating summary...")
-        summary_generator = SummaryGenerator(model_name=summarization_model)
-        
         with st.spinner("📊 Analyzing and summarizing content... Extracting key insights."):
-            summary_result = summary_generator.generate_summary(transcript)
+            reused = pipeline.reuse_results(segments)
+            if reused is not None:
+                summary_result, statistics = reused
+                st.info("♻️ This transcript matches an earlier meeting; its summary was reused.")
+            else:
+                summary_result = pipeline.summarize(segments, checkpoint)
+                statistics = pipeline.compute_statistics(segments, checkpoint,
+                                                         summary_result.get("keyphrase_scores"))
+            related = pipeline.find_related(segments, summary_result)
         
         progress_bar.progress(60)
         
@@ -410,54 +658,42 @@ def process_audio_file(uploaded_file, transcription_model, summarization_model):
         status_text.text("Step 4/5: Finalizing results...")
         
         st.markdown("---")
-        display_results_fullscreen(transcript, summary_result)
+        postprocessing = pipeline.get_transcript_generator(transcription_model).last_postprocessing
+        display_results_fullscreen(segments, summary_result, postprocessing)
+        display_related_meetings(related)
         
         progress_bar.progress(80)
         
         # Step 5: Generate and display visualizations (NEW STEP)
         status_text.text("Step 5/5: Generating text insights...")
-        display_visualizations(transcript)
+        display_visualizations(segments, summary_result.get("keyphrase_scores"))
+        
+        # Keep the meeting stored and searchable after the download buttons are gone
+        result = build_result(
+            temp_audio_path, audio_info, segments, summary_result,
+            statistics,
+            transcription_model=transcription_model,
+            summarization_model=summarization_model,
+            source=uploaded_file.name,
+            tags=[tag.strip() for tag in st.session_state.get("tags", "").split(",") if tag.strip()],
+            model_selection=choice.to_dict() if choice else None,
+            decode_options=pipeline.decode_options.to_dict(),
+            related=related,
+            postprocessing=postprocessing
+        )
+        try:
+            pipeline.record(result)
+            checkpoint.clear()
+        except Exception as e:
+            st.warning(f"⚠️ Meeting could not be saved to the meeting history: {str(e)}")
         
         progress_bar.progress(100)
         status_text.text("✅ Processing complete!")
         
         # Download section
+        st.session_state["last_result"] = result
         st.markdown("---")
-        st.markdown("#### 💾 Download Results")
-        
-        col1, col2, col3 = st.columns(3)  # Updated to 3 columns
-        
-        with col1:
-            # Download transcript
-            st.download_button(
-                label="📥 Download Transcript",
-                data=transcript,
-                file_name=f"meeting_transcript_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                mime="text/plain",
-                use_container_width=True
-            )
-        
-        with col2:
-            # Download summary
-            summary_text = format_summary_for_download(summary_result)
-            st.download_button(
-                label="📥 Download Summary",
-                data=summary_text,
-                file_name=f"meeting_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                mime="text/plain",
-                use_container_width=True
-            )
-        
-        with col3:
-            # Download statistics (NEW)
-            stats_text = format_statistics_for_download(transcript)
-            st.download_button(
-                label="📊 Download Statistics",
-                data=stats_text,
-                file_name=f"meeting_statistics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                mime="text/plain",
-                use_container_width=True
-            )
+        display_export_panel(result)
         
         # Cleanup
         os.unlink(temp_audio_path)
@@ -466,72 +702,249 @@ def process_audio_file(uploaded_file, transcription_model, summarization_model):
         
     except Exception as e:
         st.error(f"❌ Error processing audio file: {str(e)}")
-        st.info("💡 Please try again with a different audio file or check the file format.")
+        if checkpoint is not None and checkpoint.chunks():
+            st.info("💾 Progress was saved. Process the same file again with the same settings to resume.")
+        else:
+            st.info("💡 Please try again with a different audio file or check the file format.")
+    finally:
+        # The admission budget only covers models while their ticket is held
+        if pipeline is not None:
+            pipeline.unload_models()
+        if ticket is not None:
+            ticket.release()
 
-def format_summary_for_download(summary_result):
-    """Format summary result for download"""
-    download_text = f"""MEETING SUMMARY
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+def display_related_meetings(related):
+    """Point out earlier meetings this one repeats and action items that keep coming back"""
+    if not related or not (related["similar_meetings"] or related["recurring_action_items"]):
+        return
+    
+    with st.expander("🔁 Discussed Before", expanded=True):
+        for meeting in related["similar_meetings"]:
+            st.markdown(f"- **{meeting['source']}** ({(meeting['created_at'] or '')[:10]}): "
+                        f"{meeting['similarity']:.0%} similar transcript")
+        for item in related["recurring_action_items"]:
+            earlier = item["matches"][0]
+            st.markdown(f"- Action item *{item['text']}* also came up in **{earlier['source']}** "
+                        f"({(earlier['created_at'] or '')[:10]})")
 
-EXECUTIVE SUMMARY:
-{summary_result['overall_summary']}
+def display_export_panel(result, key="export"):
+    """Download one result in the chosen format
+    
+    Only the selected format is rendered, from the stored result dict, and
+    kept in the session so switching back and forth does not rebuild it.
+    (Streamlit 1.28 download buttons need their data up front, so the format
+    picker is what keeps the other formats from being built.)
+    """
+    from utils.exports import EXPORT_FORMATS, export_bytes, export_filename
 
-KEY DISCUSSION POINTS:
-"""
+    st.markdown("#### 💾 Download Results")
     
-    if summary_result["key_points"] and summary_result["key_points"] != "No key points identified.":
-        key_points_list = clean_text_for_display(summary_result["key_points"])
-        for i, point in enumerate(key_points_list, 1):
-            if point.strip():
-                download_text += f"{i}. {point.strip()}\n"
-    else:
-        download_text += "No key points identified.\n"
-    
-    download_text += "\nACTION ITEMS:\n"
-    if summary_result["action_items"] and summary_result["action_items"] != "No specific action items identified.":
-        action_points = clean_text_for_display(summary_result["action_items"])
-        for action in action_points:
-            if action.strip():
-                download_text += f"[ ] {action.strip()}\n"
-    else:
-        download_text += "No specific action items identified.\n"
-    
-    download_text += "\nDECISIONS MADE:\n"
-    if summary_result["decisions"] and summary_result["decisions"] != "No specific decisions identified.":
-        decision_points = clean_text_for_display(summary_result["decisions"])
-        for decision in decision_points:
-            if decision.strip():
-                download_text += f"✓ {decision.strip()}\n"
-    else:
-        download_text += "No specific decisions identified.\n"
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        export_format = st.selectbox(
+            "Format",
+            list(EXPORT_FORMATS),
+            format_func=lambda name: EXPORT_FORMATS[name].label,
+            key=f"{key}_format"
+        )
     
-    download_text += "\n---\nGenerated by Intelligent Meeting Notes Generator"
+    result_key = (result.get("meeting_id"), result.get("source"), result.get("created_at"))
+    cache = st.session_state.get(f"{key}_cache")
+    if cache is None or cache["result"] != result_key:
+        cache = st.session_state[f"{key}_cache"] = {"result": result_key, "payloads": {}}
+    if export_format not in cache["payloads"]:
+        cache["payloads"][export_format] = export_bytes(result, export_format)
     
-    return download_text
+    with col2:
+        st.markdown("<div style='height: 28px'></div>", unsafe_allow_html=True)
+        st.download_button(
+            label="📥 Download",
+            data=cache["payloads"][export_format],
+            file_name=export_filename(result, export_format),
+            mime=EXPORT_FORMATS[export_format].mime,
+            use_container_width=True,
+            key=f"{key}_download"
+        )
 
-def format_statistics_for_download(text):
-    """Format text statistics for download"""
-    visualizer = TextVisualizer()
-    stats = visualizer.generate_text_statistics(text)
+@st.cache_resource
+def get_meeting_store():
+    """One meeting store connection shared by all sessions"""
+    from utils.meeting_store import MeetingStore
+
+    return MeetingStore()
+
+@st.cache_resource
+def get_duplicate_index():
+    """One near-duplicate index connection shared by all sessions"""
+    from utils.near_duplicates import DuplicateIndex
+
+    return DuplicateIndex()
+
+@st.cache_resource
+def get_admission_controller():
+    """One admission queue for every session in this server process"""
+    return AdmissionController()
+
+@st.cache_resource
+def get_checkpoint_store():
+    """One checkpoint store shared by all sessions"""
+    from utils.checkpoints import CheckpointStore
+
+    return CheckpointStore()
+
+@st.cache_resource
+def get_analytics():
+    """One analytics connection shared by all sessions"""
+    from utils.analytics import MeetingAnalytics
+
+    return MeetingAnalytics()
+
+@st.cache_resource
+def get_search_index():
+    """One search index connection shared by all sessions"""
+    from utils.search_index import MeetingSearchIndex
+
+    return MeetingSearchIndex()
+
+def search_meetings_page():
+    """Search transcripts, action items and decisions of past meetings"""
+    
+    st.markdown("""
+    <div class="summary-card">
+        <h2 style="color: #2c3e50; margin-bottom: 10px;">🔍 Search Past Meetings</h2>
+        <p style="color: #7f8c8d;">Find when something was discussed, decided or assigned</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    from utils.search_index import DOCUMENT_KINDS
+
+    search_index = get_search_index()
+    
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        query = st.text_input("Search", placeholder="e.g. when did we decide on the pricing?")
+    with col2:
+        kind_labels = {
+            "transcript": "Transcript",
+            "action_item": "Action items",
+            "decision": "Decisions",
+            "key_point": "Key points",
+            "keyphrase": "Key phrases"
+        }
+        kinds = st.multiselect(
+            "Search in",
+            list(DOCUMENT_KINDS),
+            default=list(DOCUMENT_KINDS),
+            format_func=kind_labels.get
+        )
+    with col3:
+        mode = st.radio("Match", ["Keywords", "Similar"], help="Similar ranks by TF-IDF similarity")
+    
+    st.caption(f"{search_index.meeting_count()} meetings indexed")
     
-    stats_text = f"""MEETING TEXT STATISTICS
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    if not query:
+        return
+    
+    started = datetime.now()
+    if mode == "Similar":
+        hits = search_index.similar(query, limit=25, kinds=kinds)
+    else:
+        hits = search_index.search(query, limit=25, kinds=kinds)
+    elapsed_ms = (datetime.now() - started).total_seconds() * 1000
+    
+    st.caption(f"{len(hits)} results in {elapsed_ms:.0f} ms")
+    if not hits:
+        st.info("No matching meetings found.")
+        return
+    
+    for hit in hits:
+        timestamp = format_timestamp(hit["start"])
+        position = f" at {timestamp}" if timestamp else ""
+        st.markdown(
+            f"**{hit['title']}** · {hit['created_at'][:16].replace('T', ' ')}{position} "
+            f"· _{kind_labels[hit['kind']]}_"
+        )
+        st.markdown(f"> {hit['snippet']}")
+    
+    # Exports are rendered from the stored meeting; nothing is transcribed or summarized again
+    meetings = {hit["meeting_id"]: hit["title"] for hit in hits}
+    with st.expander("💾 Export a meeting from these results"):
+        meeting_id = st.selectbox("Meeting", list(meetings), format_func=meetings.get)
+        result = get_meeting_store().get(meeting_id)
+        if result is None:
+            st.info("This meeting is no longer in the meeting history.")
+        else:
+            display_export_panel(result, key="search_export")
 
-BASIC STATISTICS:
-• Total Words: {stats['total_words']}
-• Unique Words: {stats['unique_words']}
-• Sentences: {stats['sentences']}
-• Average Sentence Length: {stats['avg_sentence_length']:.1f} words
+def analytics_page():
+    """Trends across processed meetings, read from the incremental rollups"""
+    
+    st.markdown("""
+    <div class="summary-card">
+        <h2 style="color: #2c3e50; margin-bottom: 10px;">📈 Meeting Analytics</h2>
+        <p style="color: #7f8c8d;">Trends across all processed meetings</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    from utils.analytics import recent_range
 
-TOP 10 MOST FREQUENT WORDS:
-"""
+    analytics = get_analytics()
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        days = st.selectbox("Period", [7, 30, 90, 365], index=2, format_func=lambda d: f"Last {d} days")
+    with col2:
+        granularity = st.radio("Group by", ["week", "day"], horizontal=True)
+    with col3:
+        tag = st.selectbox("Tag", [""] + analytics.tags(), format_func=lambda t: t or "All meetings")
     
-    for word, count in stats['most_common_words']:
-        stats_text += f"• {word}: {count} occurrences\n"
+    start, end = recent_range(days)
+    summary = analytics.summary(start, end, tag=tag)
+    if not summary["meetings"]:
+        st.info("No meetings processed in this period yet.")
+        return
     
-    stats_text += "\n---\nGenerated by Intelligent Meeting Notes Generator"
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("Meetings", summary["meetings"])
+    metric_cols[1].metric("Audio Minutes", f"{summary['audio_minutes']:.0f}")
+    metric_cols[2].metric("Action Items", summary["action_items"])
+    metric_cols[3].metric("Decisions", summary["decisions"])
     
-    return stats_text
+    series = analytics.series(granularity, start, end, tag=tag, top_terms=5)
+    st.markdown(f"#### 📅 Meetings per {granularity}")
+    st.bar_chart({
+        "Meetings": {row["period"]: row["meetings"] for row in series},
+        "Action items": {row["period"]: row["action_items"] for row in series},
+        "Decisions": {row["period"]: row["decisions"] for row in series}
+    })
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### ⏱️ Meeting Length Distribution")
+        st.bar_chart(summary["duration_histogram"])
+    with col2:
+        st.markdown("#### 🏆 Top Terms")
+        st.dataframe({
+            "Term": [term for term, count in summary["top_terms"]],
+            "Count (approx.)": [count for term, count in summary["top_terms"]]
+        }, use_container_width=True)
+    
+    st.markdown(f"#### 🔤 Top Terms per {granularity}")
+    st.dataframe({
+        "Period": [row["period"] for row in series],
+        "Top terms": [", ".join(term for term, count in row["top_terms"]) for row in series]
+    }, use_container_width=True)
+    
+    per_tag = analytics.compare_tags(start, end)
+    if per_tag:
+        st.markdown("#### 🏷️ By Tag")
+        st.dataframe({
+            "Tag": list(per_tag),
+            "Meetings": [row["meetings"] for row in per_tag.values()],
+            "Action items": [row["action_items"] for row in per_tag.values()],
+            "Decisions": [row["decisions"] for row in per_tag.values()],
+            "Avg. minutes": [row["audio_minutes"] / row["meetings"] for row in per_tag.values()]
+        }, use_container_width=True)
 
 def about_project():
     """About project section with interactive flip cards"""
@@ -902,5 +1315,13 @@ if __name__ == "__main__":
         if uploaded_file is not None:
             # Process the file
             process_audio_file(uploaded_file, trans_model, summ_model)
+        elif "last_result" in st.session_state:
+            # Changing the export format reruns the script; keep the last meeting downloadable
+            st.markdown("---")
+            display_export_panel(st.session_state["last_result"])
+    elif app_mode == "Search Meetings":
+        search_meetings_page()
+    elif app_mode == "Meeting Analytics":
+        analytics_page()
     else:
         about_project()
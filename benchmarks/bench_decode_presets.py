@@ -0,0 +1,82 @@
+"""Whisper decoding presets: wall time, real-time factor and word error rate
+
+    python benchmarks/bench_decode_presets.py meeting.wav --reference meeting.txt \\
+        --model tiny --language en
+
+Transcribes the same recording once per preset (fast, balanced, accurate),
+with the model loaded once up front so only decoding is timed. With
+--reference, the word error rate against a plain-text transcript is
+reported too; --language auto measures the detection pass as well.
+Requires openai-whisper.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.decode_options import AUTO_LANGUAGE, DECODE_PRESETS, DecodeOptions
+
+SAMPLE_RATE = 16000
+
+
+def normalize_words(text):
+    return re.sub(r"[^a-z0-9' ]+", " ", text.lower()).split()
+
+
+def word_error_rate(reference, hypothesis):
+    """(substitutions + deletions + insertions) / reference words, by edit distance"""
+    reference, hypothesis = normalize_words(reference), normalize_words(hypothesis)
+    if not reference:
+        return float(bool(hypothesis))
+    previous = np.arange(len(hypothesis) + 1)
+    for i, word in enumerate(reference, 1):
+        current = np.empty_like(previous)
+        current[0] = i
+        substitution = previous[:-1] + (np.array(hypothesis) != word)
+        deletion = previous[1:] + 1
+        best = np.minimum(substitution, deletion)
+        # Insertions chain along the row, so they need a running pass
+        for j in range(1, len(previous)):
+            current[j] = min(best[j - 1], current[j - 1] + 1)
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", help="Recording to transcribe")
+    parser.add_argument("--reference", default=None, help="Plain-text reference transcript for WER")
+    parser.add_argument("--model", default="tiny", help="Whisper model size")
+    parser.add_argument("--language", default="en", help=f"Language code, or '{AUTO_LANGUAGE}' to detect")
+    parser.add_argument("--presets", nargs="+", default=list(DECODE_PRESETS), choices=list(DECODE_PRESETS))
+    args = parser.parse_args()
+
+    import whisper
+
+    audio = whisper.load_audio(args.audio)
+    duration = len(audio) / SAMPLE_RATE
+    reference = open(args.reference, encoding="utf-8").read() if args.reference else None
+
+    started = time.perf_counter()
+    model = whisper.load_model(args.model)
+    print(f"whisper-{args.model} loaded in {time.perf_counter() - started:.1f} s; "
+          f"{duration:.0f} s of audio, language={args.language}")
+
+    print(f"{'preset':<10} {'time (s)':>9} {'RTF':>6} {'segments':>9} {'WER':>7}")
+    for preset in args.presets:
+        options = DecodeOptions.from_preset(preset, language=args.language)
+        started = time.perf_counter()
+        result = model.transcribe(audio, **options.to_whisper_kwargs())
+        elapsed = time.perf_counter() - started
+        wer = f"{word_error_rate(reference, result['text']):.1%}" if reference else "-"
+        print(f"{preset:<10} {elapsed:>9.1f} {elapsed / duration:>6.2f} "
+              f"{len(result.get('segments', [])):>9} {wer:>7}")
+
+
+if __name__ == "__main__":
+    main()
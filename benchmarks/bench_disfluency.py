@@ -0,0 +1,104 @@
+"""Disfluency cleanup: DisfluencyCleaner vs the old regex passes
+
+    python benchmarks/bench_disfluency.py --megabytes 2 --summarize
+
+Generates a filler-heavy transcript ("um", "you know", "the the", ...) and
+reports MB/s and how much shorter the text gets for the trie-based
+DisfluencyCleaner and for the regex version it replaced (a filler
+alternation, a backreference repeat collapse and a whitespace pass).
+With --summarize, also times SummaryGenerator on a slice of the raw and
+the cleaned text, to show what the shorter input saves sumy.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.disfluency import DisfluencyCleaner
+from utils.summarization import SummaryGenerator
+
+WORDS = """we need to look at the numbers for next quarter and budget is fine but hiring plan I think
+customers want better onboarding release date moves May will ship it our team has been working on
+new dashboard design support backlog migration database API rate limits pricing page mobile app
+should finish review before Friday because staging environment unstable testing owner proposal
+draft documentation scope feature flag sprint platform sales marketing engineering metrics growth
+churn revenue forecast meeting agenda update status blocked waiting approval legal contract vendor
+security audit performance latency cost cloud infrastructure deploy rollback incident""".split()
+FILLERS = ("um", "uh", "um,", "uh,", "you know,", "I mean,", "like,", "so", "okay,", "hmm")
+
+
+def regex_clean(text):
+    """The regex cleanup SummaryGenerator.clean_meeting_text used before DisfluencyCleaner"""
+    fillers = ['so', 'okay', 'well', 'like', 'you know', 'i mean', 'actually', 'basically']
+    pattern = r'\b(' + '|'.join(fillers) + r')\b[, ]*'
+    text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    text = re.sub(r'(\b\w+\b)( \1)+', r'\1', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def disfluent_transcript(size, seed=0):
+    """Roughly ``size`` characters of sentences with fillers, stutters and restarts"""
+    rng = random.Random(seed)
+    sentences = []
+    length = 0
+    while length < size:
+        words = []
+        for word in rng.choices(WORDS, k=rng.randint(6, 18)):
+            roll = rng.random()
+            if roll < 0.05:
+                words.append(rng.choice(FILLERS))
+            elif roll < 0.08:
+                words.append(word)
+            words.append(word)
+        if rng.random() < 0.1:
+            words = words[:3] + words
+        if rng.random() < 0.25:
+            words.insert(0, rng.choice(("So", "Okay,", "Um,", "Well,", "Yeah,")))
+        words[0] = words[0].capitalize()
+        sentence = " ".join(words) + rng.choice(".?.")
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(sentences)
+
+
+def throughput(func, text, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        cleaned = func(text)
+        best = min(best, time.perf_counter() - started)
+    megabytes = len(text.encode("utf-8")) / (1024 * 1024)
+    return megabytes / best, cleaned
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, default=2.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--summarize", action="store_true", help="also time the summarizer on raw vs cleaned text")
+    parser.add_argument("--summary-words", type=int, default=20000)
+    args = parser.parse_args()
+
+    text = disfluent_transcript(int(args.megabytes * 1024 * 1024))
+    words = len(text.split())
+    print(f"{len(text) / (1024 * 1024):.1f} MB of text, {words} words")
+    for name, func in (("regex", regex_clean), ("trie", DisfluencyCleaner().clean)):
+        rate, cleaned = throughput(func, text, args.repeats)
+        removed = 1 - len(cleaned.split()) / words
+        print(f"{name:>8}: {rate:7.1f} MB/s  {removed:6.1%} of words removed")
+
+    if args.summarize:
+        sample = " ".join(text.split()[:args.summary_words])
+        for name, clean in (("raw", False), ("cleaned", True)):
+            generator = SummaryGenerator("lsa", clean_disfluencies=clean)
+            started = time.perf_counter()
+            generator.generate_summary(sample)
+            print(f"{name:>8}: summary of {args.summary_words} words in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
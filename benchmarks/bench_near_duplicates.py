@@ -0,0 +1,101 @@
+"""Benchmark near-duplicate detection on a synthetic meeting corpus
+
+    python benchmarks/bench_near_duplicates.py --meetings 20000
+
+Indexes synthetic meetings (Zipf-distributed vocabulary, recurring
+action items) in a temporary directory. Queries are edited copies of
+stored meetings with a given fraction of words replaced. The benchmark
+reports indexing cost, lookup latency, and how often the original meeting
+is found.
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.near_duplicates import DuplicateIndex
+
+RECURRING_ITEMS = [
+    "We need to update the release checklist.",
+    "I'll follow up with the design team.",
+    "Let's review the open pull requests.",
+    "We should fix the flaky integration tests.",
+]
+
+
+def synthetic_meeting(rng, vocabulary, weights, number, words=900):
+    text = " ".join(rng.choices(vocabulary, cum_weights=weights, k=words)) + "."
+    items = [{"text": rng.choice(RECURRING_ITEMS)}]
+    items.append({"text": "We need to " + " ".join(rng.choices(vocabulary, cum_weights=weights, k=6)) + "."})
+    return {
+        "source": f"meeting_{number}.wav",
+        "created_at": f"2026-01-{number % 28 + 1:02d}T09:00:00",
+        "transcript": text,
+        "summary": {"items": {"action_items": items}},
+    }
+
+
+def edited(text, fraction, rng, vocabulary):
+    words = text.split()
+    for i in rng.sample(range(len(words)), int(len(words) * fraction)):
+        words[i] = rng.choice(vocabulary)
+    return " ".join(words)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--meetings", type=int, default=2000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--edit", type=float, nargs="+", default=[0.02, 0.05, 0.1],
+                        help="Fractions of words replaced in the query copies")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = [f"w{i}" for i in range(args.vocabulary)]
+    weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocabulary))))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = DuplicateIndex(os.path.join(tmp, "near_duplicates.db"))
+        meetings = []
+        started = time.perf_counter()
+        for number in range(args.meetings):
+            meeting = synthetic_meeting(rng, vocabulary, weights, number)
+            meeting["meeting_id"] = index.add_meeting(meeting)
+            meetings.append(meeting)
+        build_time = time.perf_counter() - started
+        size_mb = os.path.getsize(index.db_path) / (1024 * 1024)
+        print(f"Indexed {args.meetings} meetings in {build_time:.1f}s "
+              f"({build_time / args.meetings * 1000:.1f} ms/meeting, {size_mb:.0f} MB)")
+
+        for fraction in args.edit:
+            latencies, found, false_hits = [], 0, 0
+            for meeting in rng.sample(meetings, min(args.queries, len(meetings))):
+                query = edited(meeting["transcript"], fraction, rng, vocabulary)
+                started = time.perf_counter()
+                matches = index.similar_meetings(query)
+                latencies.append(time.perf_counter() - started)
+                found += any(match["meeting_id"] == meeting["meeting_id"] for match in matches)
+                false_hits += sum(match["meeting_id"] != meeting["meeting_id"] for match in matches)
+            print(f"{fraction:.0%} words edited: found {found}/{len(latencies)}, "
+                  f"{false_hits} other matches, p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+                  f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms")
+
+        started = time.perf_counter()
+        recurring = index.recurring_action_items([{"text": RECURRING_ITEMS[0]}], limit=5)
+        print(f"recurring action item lookup: {(time.perf_counter() - started) * 1000:.1f} ms, "
+              f"{len(recurring[0]['matches']) if recurring else 0} earlier occurrences shown")
+
+
+if __name__ == "__main__":
+    main()
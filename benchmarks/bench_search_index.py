@@ -0,0 +1,91 @@
+"""Benchmark meeting search latency on a synthetic corpus
+
+    python benchmarks/bench_search_index.py --meetings 20000
+
+Builds an index of synthetic meetings (Zipf-distributed vocabulary, 60
+segments each) in a temporary directory and reports p50/p95 latency of
+keyword and similarity queries.
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.search_index import MeetingSearchIndex
+
+QUERIES = [
+    "pricing decision", "database migration", "hiring plan", "customer onboarding",
+    "release date", "budget review", "latency regression", "roadmap priorities",
+]
+
+
+def synthetic_vocabulary(size, seed):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = {w for q in QUERIES for w in q.split()}
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 9))))
+    return sorted(words)
+
+
+def synthetic_meeting(rng, vocabulary, weights, number):
+    segments = []
+    for i in range(60):
+        words = rng.choices(vocabulary, cum_weights=weights, k=14)
+        segments.append({"start": i * 5.0, "speaker": None, "text": " ".join(words) + "."})
+    decision = " ".join(rng.choices(vocabulary, cum_weights=weights, k=8))
+    return {
+        "source": f"meeting_{number}.wav",
+        "created_at": "2026-01-01T09:00:00",
+        "audio_info": {"duration": 300.0},
+        "segments": segments,
+        "summary": {"items": {"decisions": [{"text": f"We decided {decision}.", "start": 30.0}]}},
+    }
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--meetings", type=int, default=2000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = synthetic_vocabulary(args.vocabulary, seed=1)
+    rng.shuffle(vocabulary)
+    weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocabulary))))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = MeetingSearchIndex(os.path.join(tmp, "search.db"))
+        started = time.perf_counter()
+        for number in range(args.meetings):
+            index.add_meeting(synthetic_meeting(rng, vocabulary, weights, number))
+        build_time = time.perf_counter() - started
+        size_mb = os.path.getsize(index.db_path) / (1024 * 1024)
+        print(f"Indexed {args.meetings} meetings in {build_time:.1f}s "
+              f"({build_time / args.meetings * 1000:.1f} ms/meeting, {size_mb:.0f} MB)")
+
+        for name, search in (("keyword", index.search), ("similar", index.similar)):
+            latencies = []
+            for _ in range(args.repeats):
+                for query in QUERIES:
+                    started = time.perf_counter()
+                    search(query, limit=25)
+                    latencies.append((time.perf_counter() - started) * 1000)
+            print(f"{name:>8}: p50 {percentile(latencies, 0.5):.1f} ms  "
+                  f"p95 {percentile(latencies, 0.95):.1f} ms  max {max(latencies):.1f} ms")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
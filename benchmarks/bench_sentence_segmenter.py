@@ -0,0 +1,92 @@
+"""Sentence segmentation throughput: SentenceSegmenter vs NLTK Punkt
+
+    python benchmarks/bench_sentence_segmenter.py --megabytes 5
+
+Generates Whisper-like text (long, lightly punctuated segments) and reports
+MB/s for the rule-based segmenter with and without segment hints, and for
+Punkt. Punkt uses the bundled English model when available, otherwise an
+untrained PunktSentenceTokenizer (same algorithm, default parameters).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.nltk_resources import get_nltk_resources
+from utils.sentence_segmenter import SentenceSegmenter
+
+WORDS = ("we", "need", "to", "look", "at", "the", "numbers", "for", "next", "quarter", "and",
+         "budget", "is", "fine", "but", "hiring", "plan", "so", "I", "think", "customers",
+         "want", "better", "onboarding", "Dr.", "Smith", "said", "it", "was", "about", "3.5",
+         "percent", "okay", "release", "date", "moves", "to", "May")
+
+
+def whisper_like_text(size, seed=0):
+    """(text, segment start offsets) of roughly ``size`` characters"""
+    rng = random.Random(seed)
+    parts = []
+    hints = []
+    length = 0
+    while length < size:
+        words = rng.choices(WORDS, k=rng.randint(6, 24))
+        words[0] = words[0].capitalize()
+        text = " ".join(words)
+        # About a third of Whisper segments come back without end punctuation
+        ending = rng.random()
+        if ending < 0.5:
+            text += "."
+        elif ending < 0.6:
+            text += "?"
+        elif ending < 0.7:
+            text += ","
+        if parts:
+            length += 1
+        hints.append(length)
+        parts.append(text)
+        length += len(text)
+    return " ".join(parts), hints[1:]
+
+
+def throughput(func, text, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        sentences = func(text)
+        best = min(best, time.perf_counter() - started)
+    megabytes = len(text.encode("utf-8")) / (1024 * 1024)
+    return megabytes / best, len(sentences)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, default=2.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    text, hints = whisper_like_text(int(args.megabytes * 1024 * 1024))
+    segmenter = SentenceSegmenter()
+
+    punkt = get_nltk_resources().punkt
+    punkt_name = "punkt (bundled)"
+    if punkt is None:
+        from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+        punkt = PunktSentenceTokenizer()
+        punkt_name = "punkt (untrained)"
+
+    candidates = [
+        ("segmenter", segmenter.split),
+        ("segmenter + hints", lambda t: segmenter.split(t, hints)),
+        (punkt_name, punkt.tokenize),
+    ]
+    print(f"{len(text) / (1024 * 1024):.1f} MB of text, {len(hints) + 1} segments")
+    for name, func in candidates:
+        rate, count = throughput(func, text, args.repeats)
+        print(f"{name:>20}: {rate:7.1f} MB/s  {count} sentences")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Silence trimming: audio removed, preprocessing cost and timestamp accuracy
+
+    python benchmarks/bench_silence_trim.py --minutes 30 --silence 0.4
+
+Builds a synthetic recording of tone bursts ("speech") separated by random
+pauses, trims it and checks that every burst onset is kept and maps back to its
+original position. Whisper's cost scales with the audio it is given, so
+the kept fraction is the expected transcription time relative to the
+untrimmed file. With --whisper MODEL the real transcription of both
+versions is timed too (requires openai-whisper).
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.silence_trimmer import SilenceTrimmer, normalize_loudness
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_recording(minutes, silence_fraction, seed=0):
+    """(audio, burst start times) with roughly ``silence_fraction`` of long pauses"""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    parts, starts = [], []
+    position = 0
+    while position < total:
+        burst = rng.uniform(2.0, 8.0)
+        pause = burst * silence_fraction / (1 - silence_fraction) * rng.uniform(0.5, 1.5)
+        t = np.arange(int(burst * SAMPLE_RATE)) / SAMPLE_RATE
+        voice = 0.3 * np.sin(2 * np.pi * rng.uniform(120, 300) * t) * (1 + 0.5 * np.sin(2 * np.pi * 4 * t))
+        starts.append(position / SAMPLE_RATE)
+        parts.append(voice)
+        position += len(voice)
+        gap = rng.normal(0, 0.001, int(pause * SAMPLE_RATE))
+        parts.append(gap)
+        position += len(gap)
+    audio = np.concatenate(parts).astype(np.float32)[:total]
+    return audio, [s for s in starts if s < total / SAMPLE_RATE]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, default=30)
+    parser.add_argument("--silence", type=float, default=0.4, help="Fraction of the recording that is pause")
+    parser.add_argument("--whisper", default=None, help="Also time Whisper with this model size, e.g. tiny")
+    args = parser.parse_args()
+
+    audio, burst_starts = synthetic_recording(args.minutes, args.silence)
+    trimmer = SilenceTrimmer()
+
+    started = time.perf_counter()
+    normalized = normalize_loudness(audio)
+    normalize_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    trimmed, time_map = trimmer.trim(normalized)
+    trim_time = time.perf_counter() - started
+
+    original_seconds = len(audio) / SAMPLE_RATE
+    kept = time_map.kept_seconds / original_seconds
+    print(f"{original_seconds / 60:.1f} min recording, {args.silence:.0%} pauses")
+    print(f"normalize: {normalize_time * 1000:.0f} ms   trim: {trim_time * 1000:.0f} ms")
+    print(f"kept {time_map.kept_seconds / 60:.1f} min ({kept:.0%}) -> expected ASR time x{kept:.2f}")
+
+    # Every burst onset must survive trimming and map back to its original time
+    starts = np.array(burst_starts)
+    chunks = np.searchsorted(time_map.original_starts, starts, side="right") - 1
+    offsets = starts - time_map.original_starts[chunks]
+    kept_onsets = (chunks >= 0) & (offsets < time_map.lengths[chunks])
+    errors = np.abs(time_map.to_original(time_map.trimmed_starts[chunks] + offsets) - starts)
+    print(f"burst onsets kept: {kept_onsets.sum()}/{len(starts)}   "
+          f"timestamp remap error: max {errors.max() * 1000:.2f} ms")
+
+    if args.whisper:
+        import whisper
+
+        model = whisper.load_model(args.whisper)
+        for name, clip in (("original", audio), ("trimmed", trimmed)):
+            started = time.perf_counter()
+            model.transcribe(clip, fp16=False)
+            print(f"whisper-{args.whisper} {name}: {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
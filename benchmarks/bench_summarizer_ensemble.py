@@ -0,0 +1,60 @@
+"""Summarizer ensemble wall time: methods one after another vs in a process pool
+
+    python benchmarks/bench_summarizer_ensemble.py --words 3000 --methods lsa textrank lexrank luhn
+
+Parses one synthetic transcript, then ranks it with every method in this
+process (workers=0) and in a pool with one worker per method, printing
+each method's time and the ensemble's wall time. The in-process run is
+warmed with one call first (imports); the pooled time includes starting
+its workers, as every pooled call does. With --timeout, methods slower
+than that are dropped from the pooled run. The pool only wins on long
+transcripts with at least as many free cores as methods.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.admission import cpu_cores
+from utils.corpus import synthetic_transcript
+from utils.summarization import _sumy_parser
+from utils.summarizer_registry import FUSIONS, EnsembleSummarizer, summarizer_names
+
+
+def timed_run(ensemble, document, sentences_count):
+    started = time.perf_counter()
+    chosen = ensemble.select(document, sentences_count)
+    return time.perf_counter() - started, chosen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=3000)
+    parser.add_argument("--methods", nargs="+", default=["lsa", "textrank", "lexrank", "luhn"],
+                        choices=summarizer_names())
+    parser.add_argument("--fusion", default="rrf", choices=list(FUSIONS))
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--sentences", type=int, default=5)
+    args = parser.parse_args()
+
+    document = _sumy_parser(synthetic_transcript(args.words)).document
+    print(f"{args.words} words, {len(document.sentences)} sentences, {cpu_cores()} core(s)")
+
+    sequential = EnsembleSummarizer(args.methods, fusion=args.fusion, workers=0)
+    sequential.select(document, args.sentences)
+    seconds, chosen = timed_run(sequential, document, args.sentences)
+    for name, run in sequential.last_run.items():
+        print(f"{name:>10}: {run['seconds']:7.2f}s")
+    print(f"{'in process':>10}: {seconds:7.2f}s wall")
+
+    pooled = EnsembleSummarizer(args.methods, fusion=args.fusion, timeout=args.timeout, workers=None)
+    seconds, pooled_chosen = timed_run(pooled, document, args.sentences)
+    skipped = [name for name, run in pooled.last_run.items() if run["status"] != "ok"]
+    print(f"{'pool':>10}: {seconds:7.2f}s wall" + (f" (left out: {', '.join(skipped)})" if skipped else ""))
+    print(f"same sentences: {pooled_chosen == chosen}")
+
+
+if __name__ == "__main__":
+    main()
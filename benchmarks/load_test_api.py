@@ -0,0 +1,74 @@
+"""Local load test for api_server.py
+
+Start the service first (python api_server.py), then:
+
+    python benchmarks/load_test_api.py sample.wav --jobs 20 --concurrency 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import aiohttp
+
+
+async def submit_and_wait(session, base_url, audio_path, model, poll_interval):
+    started = time.perf_counter()
+    with open(audio_path, 'rb') as audio_file:
+        form = aiohttp.FormData()
+        form.add_field('file', audio_file, filename=os.path.basename(audio_path))
+        async with session.post(f"{base_url}/jobs", data=form,
+                                params={"transcription_model": model}) as response:
+            if response.status == 503:
+                return {"status": "rejected", "latency": time.perf_counter() - started}
+            response.raise_for_status()
+            job = await response.json()
+
+    while True:
+        await asyncio.sleep(poll_interval)
+        async with session.get(f"{base_url}/jobs/{job['job_id']}") as response:
+            job = await response.json()
+        if job["status"] in ("done", "failed"):
+            return {"status": job["status"], "latency": time.perf_counter() - started}
+
+
+async def run_load_test(args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with aiohttp.ClientSession() as session:
+        async def one_job():
+            async with semaphore:
+                return await submit_and_wait(session, args.url, args.audio_path,
+                                             args.model, args.poll_interval)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one_job() for _ in range(args.jobs)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(r["latency"] for r in results if r["status"] == "done")
+    counts = {status: sum(1 for r in results if r["status"] == status)
+              for status in ("done", "failed", "rejected")}
+
+    print(f"Jobs: {args.jobs}  concurrency: {args.concurrency}  wall time: {elapsed:.1f}s")
+    print(f"Done: {counts['done']}  failed: {counts['failed']}  rejected (503): {counts['rejected']}")
+    if latencies:
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"Latency p50: {statistics.median(latencies):.1f}s  p95: {p95:.1f}s  "
+              f"max: {latencies[-1]:.1f}s")
+        print(f"Throughput: {counts['done'] / elapsed * 60:.2f} meetings/min")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the meeting notes HTTP service")
+    parser.add_argument("audio_path")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--model", default="openai/whisper-tiny")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    asyncio.run(run_load_test(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
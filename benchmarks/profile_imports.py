@@ -0,0 +1,73 @@
+"""Import-time profile of the app and the utils package
+
+    python benchmarks/profile_imports.py
+    python benchmarks/profile_imports.py utils.summarization --top 25
+
+Each module is imported in a fresh interpreter with ``python -X importtime``
+so nothing is cached between runs. The report shows the wall time of the
+import and the slowest top-level dependencies by cumulative time.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Imported by the interpreter before our code runs
+STARTUP_MODULES = {"site", "encodings", "_frozen_importlib_external", "zipimport", "codecs"}
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "utils",
+    "utils.pipeline",
+    "utils.summarization",
+    "utils.visualization",
+    "utils.transcription",
+    "api_server",
+    "app",
+]
+
+
+def profile_import(module):
+    """Return (seconds, [(cumulative_us, self_us, package)], error) for one cold import"""
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started
+
+    rows = []
+    error = None
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        self_us, cumulative_us, name = int(fields[0]), int(fields[1]), fields[2].strip()
+        # One row per package (its first import), skipping interpreter startup
+        if "." not in name and name not in STARTUP_MODULES and name != module.split(".")[0]:
+            rows.append((cumulative_us, self_us, name))
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "import failed"
+    return elapsed, rows, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=8, help="Slowest dependencies to list per module")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        elapsed, rows, error = profile_import(module)
+        status = f"FAILED ({error})" if error else "ok"
+        print(f"{module:<22} {elapsed * 1000:8.0f} ms  {status}")
+        for cumulative_us, _, name in sorted(rows, reverse=True)[:args.top]:
+            print(f"    {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
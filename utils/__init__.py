@@ -0,0 +1,32 @@
+# Utils package initialization
+#
+# Submodules are imported on first attribute access (PEP 562), so
+# ``import utils`` or ``from utils.segments import ...`` never pulls in
+# Whisper, torch, librosa, sumy or matplotlib.
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'AudioProcessor': '.audio_processor',
+    'TranscriptGenerator': '.transcription',
+    'SummaryGenerator': '.summarization',
+    'TextVisualizer': '.visualization',
+}
+
+__all__ = [
+    'AudioProcessor',
+    'TranscriptGenerator', 
+    'SummaryGenerator',
+    'TextVisualizer'
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -0,0 +1,237 @@
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+from .model_selection import ModelSelector, whisper_size
+
+# Resident memory of one job in MB: the Whisper model on CPU in FP32 plus
+# torch's working buffers (rough figures; override per deployment)
+DEFAULT_MODEL_MEMORY_MB = {"tiny": 700, "base": 1000, "small": 2000}
+# 16 kHz float32 audio is kept a few times over (decoded, trimmed, mel frames)
+AUDIO_MEMORY_MB_PER_SECOND = 0.25
+
+
+def total_memory_mb():
+    """Physical memory of the machine, or 8 GB when it cannot be read"""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return 8192.0
+
+
+def cpu_cores():
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+
+
+def set_torch_threads(threads):
+    """Limit intra-op threads for this process; before torch loads it is done through the environment"""
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads)
+
+
+class Ticket:
+    """One job's place in the admission queue
+
+    ``wait`` blocks until the job may run; call ``release`` (or use the
+    ticket as a context manager) when it is finished so the next one can
+    start. ``position`` and ``eta`` describe where it stands while queued.
+    """
+
+    def __init__(self, controller, ticket_id, session_id, model, duration, memory_mb, threads,
+                 estimated_seconds):
+        self.controller = controller
+        self.id = ticket_id
+        self.session_id = session_id
+        self.model = model
+        self.duration = duration
+        self.memory_mb = memory_mb
+        self.threads = threads
+        self.estimated_seconds = estimated_seconds
+        self.state = "queued"
+        self.submitted_at = time.time()
+        self.started_at = None
+
+    @property
+    def granted(self):
+        return self.state == "running"
+
+    @property
+    def position(self):
+        """1-based place in the admission order, 0 once running"""
+        return self.controller.position(self)
+
+    @property
+    def eta(self):
+        """Rough seconds until this job starts"""
+        return self.controller.eta(self)
+
+    def wait(self, timeout=None):
+        """True once admitted; False if ``timeout`` seconds pass first"""
+        return self.controller._wait(self, timeout)
+
+    def release(self):
+        self.controller._release(self)
+
+    def __enter__(self):
+        self.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+    def to_dict(self):
+        return {
+            "state": self.state,
+            "position": self.position,
+            "eta_seconds": round(self.eta, 1),
+            "memory_mb": round(self.memory_mb),
+            "threads": self.threads,
+        }
+
+
+class AdmissionController:
+    """Admits transcription jobs only while they fit a global CPU and memory budget
+
+    Each job costs the resident memory of every model it loads (e.g. the
+    selected model plus whisper-tiny for a two-pass preview) plus its audio
+    buffers, and ``threads_per_job`` CPU threads. Callers must unload the
+    models when the job finishes, or the budget no longer matches what is
+    resident. Waiting jobs sit in one FIFO per
+    session and are admitted round-robin across sessions, so one user with
+    ten uploads cannot starve another with one. The next job in that order
+    waits until it fits; smaller jobs behind it are not let past, which
+    keeps large models from starving. A job larger than the whole budget
+    runs once nothing else does.
+    """
+
+    def __init__(self, memory_budget_mb=None, cpu_budget=None, threads_per_job=None,
+                 model_memory_mb=None, model_selector=None):
+        self.memory_budget_mb = memory_budget_mb or total_memory_mb() * 0.75
+        self.cpu_budget = cpu_budget or cpu_cores()
+        # Default: room for two jobs side by side without oversubscribing cores
+        self.threads_per_job = threads_per_job or max(1, self.cpu_budget // 2)
+        self.model_memory_mb = dict(DEFAULT_MODEL_MEMORY_MB, **(model_memory_mb or {}))
+        self.model_selector = model_selector or ModelSelector()
+        self._condition = threading.Condition()
+        self._sessions = {}
+        # Session -> admission sequence number of its last job; lowest goes next
+        self._last_served = {}
+        self._served = itertools.count(1)
+        self._running = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def slots(self):
+        """How many jobs run side by side when CPU is the limit"""
+        return max(1, self.cpu_budget // self.threads_per_job)
+
+    def job_cost(self, model, duration=0.0, extra_models=()):
+        """(memory_mb, threads) a job is charged against the budget"""
+        memory = sum(self.model_memory_mb[whisper_size(name)] for name in (model,) + tuple(extra_models))
+        memory += AUDIO_MEMORY_MB_PER_SECOND * (duration or 0.0)
+        return memory, self.threads_per_job
+
+    def request(self, session_id, model, duration=0.0, extra_models=()):
+        """Queue a job and return its Ticket (already granted if there is room)
+
+        ``extra_models`` are other Whisper models the job loads, such as
+        whisper-tiny for a preview; their memory is charged too.
+        """
+        memory_mb, threads = self.job_cost(model, duration, extra_models)
+        estimated = self.model_selector.estimate(whisper_size(model), duration or 0.0, cpus=threads)
+        with self._condition:
+            ticket = Ticket(self, next(self._ids), session_id, model, duration, memory_mb, threads, estimated)
+            self._sessions.setdefault(session_id, deque()).append(ticket)
+            self._schedule()
+        return ticket
+
+    def _rotation(self):
+        """Waiting sessions, least recently served first (never served before anyone)"""
+        return sorted(self._sessions, key=lambda session_id: self._last_served.get(session_id, 0))
+
+    def _order(self):
+        """Queued tickets in the order they will be admitted (round-robin over sessions)"""
+        queues = [list(self._sessions[session_id]) for session_id in self._rotation()]
+        order = []
+        for round_ in itertools.zip_longest(*queues):
+            order.extend(ticket for ticket in round_ if ticket is not None)
+        return order
+
+    def _fits(self, ticket):
+        if not self._running:
+            return True
+        memory = sum(t.memory_mb for t in self._running.values()) + ticket.memory_mb
+        threads = sum(t.threads for t in self._running.values()) + ticket.threads
+        return memory <= self.memory_budget_mb and threads <= self.cpu_budget
+
+    def _schedule(self):
+        """Admit jobs in round-robin order while the next one fits (caller holds the lock)"""
+        admitted = False
+        while self._sessions:
+            session_id = self._rotation()[0]
+            queue = self._sessions[session_id]
+            ticket = queue[0]
+            if not self._fits(ticket):
+                break
+            queue.popleft()
+            if not queue:
+                del self._sessions[session_id]
+            # The session moves to the back of the rotation
+            self._last_served[session_id] = next(self._served)
+            ticket.state = "running"
+            ticket.started_at = time.time()
+            self._running[ticket.id] = ticket
+            admitted = True
+        if admitted:
+            self._condition.notify_all()
+
+    def _wait(self, ticket, timeout=None):
+        with self._condition:
+            return self._condition.wait_for(lambda: ticket.state != "queued", timeout)
+
+    def _release(self, ticket):
+        with self._condition:
+            if ticket.state == "queued":
+                queue = self._sessions.get(ticket.session_id)
+                if queue is not None and ticket in queue:
+                    queue.remove(ticket)
+                    if not queue:
+                        del self._sessions[ticket.session_id]
+            self._running.pop(ticket.id, None)
+            ticket.state = "done"
+            self._schedule()
+
+    def position(self, ticket):
+        with self._condition:
+            if ticket.state != "queued":
+                return 0
+            return self._order().index(ticket) + 1
+
+    def eta(self, ticket):
+        """Remaining work of running jobs and jobs ahead, spread over the concurrent slots"""
+        with self._condition:
+            if ticket.state != "queued":
+                return 0.0
+            now = time.time()
+            remaining = sum(max(t.estimated_seconds - (now - t.started_at), 0.0)
+                            for t in self._running.values())
+            order = self._order()
+            ahead = sum(t.estimated_seconds for t in order[:order.index(ticket)])
+            return (remaining + ahead) / self.slots
+
+    def status(self):
+        with self._condition:
+            return {
+                "running": len(self._running),
+                "queued": sum(len(queue) for queue in self._sessions.values()),
+                "memory_used_mb": round(sum(t.memory_mb for t in self._running.values())),
+                "memory_budget_mb": round(self.memory_budget_mb),
+                "threads_used": sum(t.threads for t in self._running.values()),
+                "cpu_budget": self.cpu_budget,
+            }
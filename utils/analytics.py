@@ -0,0 +1,315 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from .paths import get_data_path
+
+# Meeting length histogram bins, in minutes (last bin is open-ended)
+DURATION_BINS = (0, 15, 30, 45, 60, 90)
+GRANULARITIES = ("day", "week")
+ALL_MEETINGS = ""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    granularity TEXT NOT NULL,
+    period TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    meetings INTEGER NOT NULL DEFAULT 0,
+    audio_seconds REAL NOT NULL DEFAULT 0,
+    words INTEGER NOT NULL DEFAULT 0,
+    action_items INTEGER NOT NULL DEFAULT 0,
+    decisions INTEGER NOT NULL DEFAULT 0,
+    durations TEXT NOT NULL,
+    top_terms TEXT NOT NULL,
+    sketch BLOB NOT NULL,
+    PRIMARY KEY (granularity, tag, period)
+) WITHOUT ROWID;
+"""
+
+
+def _hash64(item):
+    return int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class CountMinSketch:
+    """Fixed-size approximate counter; merging two sketches is adding their tables
+
+    Estimates never undercount, and overcount by at most
+    ``e / width * total`` with probability ``1 - exp(-depth)``.
+    """
+
+    def __init__(self, width=1024, depth=4, table=None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.int64)
+
+    def _columns(self, items):
+        """(depth, len(items)) column indexes by double hashing one 64-bit hash"""
+        hashes = np.fromiter((_hash64(item) for item in items), dtype=np.uint64, count=len(items))
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((low + rows * high) % np.uint64(self.width)).astype(np.int64)
+
+    def add(self, counts):
+        """Add a {item: count} mapping"""
+        if not counts:
+            return
+        items = list(counts)
+        columns = self._columns(items)
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(items))
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], values)
+
+    def estimate(self, items):
+        if not items:
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(items)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def merge(self, other):
+        self.table += other.table
+        return self
+
+    def to_bytes(self):
+        return self.table.astype("<i8").tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, width=1024, depth=4):
+        table = np.frombuffer(data, dtype="<i8").reshape(depth, width).astype(np.int64)
+        return cls(width, depth, table)
+
+
+class TopTerms:
+    """Heavy-hitter candidates backed by a count-min sketch
+
+    Keeps the ``capacity`` items with the highest sketch estimates. Merging
+    two instances merges the sketches and re-ranks the union of candidates,
+    so week or month views are built from day rollups without raw text.
+    """
+
+    def __init__(self, capacity=100, sketch=None, candidates=None):
+        self.capacity = capacity
+        self.sketch = sketch or CountMinSketch()
+        self.candidates = dict(candidates or {})
+
+    def add(self, counts):
+        self.sketch.add(counts)
+        self._rerank(set(self.candidates) | set(counts))
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+        self._rerank(set(self.candidates) | set(other.candidates))
+        return self
+
+    def _rerank(self, items):
+        items = list(items)
+        estimates = self.sketch.estimate(items)
+        order = np.argsort(-estimates, kind="stable")[:self.capacity]
+        self.candidates = {items[i]: int(estimates[i]) for i in order}
+
+    def top(self, n=20):
+        return sorted(self.candidates.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+
+class Rollup:
+    """Totals for one (granularity, period, tag) bucket"""
+
+    def __init__(self, meetings=0, audio_seconds=0.0, words=0, action_items=0, decisions=0,
+                 durations=None, terms=None):
+        self.meetings = meetings
+        self.audio_seconds = audio_seconds
+        self.words = words
+        self.action_items = action_items
+        self.decisions = decisions
+        self.durations = list(durations or [0] * len(DURATION_BINS))
+        self.terms = terms or TopTerms()
+
+    def add_meeting(self, duration, words, action_items, decisions, term_counts):
+        self.meetings += 1
+        self.audio_seconds += duration
+        self.words += words
+        self.action_items += action_items
+        self.decisions += decisions
+        self.durations[duration_bin(duration)] += 1
+        self.terms.add(term_counts)
+
+    def merge(self, other):
+        self.meetings += other.meetings
+        self.audio_seconds += other.audio_seconds
+        self.words += other.words
+        self.action_items += other.action_items
+        self.decisions += other.decisions
+        self.durations = [a + b for a, b in zip(self.durations, other.durations)]
+        self.terms.merge(other.terms)
+        return self
+
+    def to_dict(self, top_terms=20):
+        return {
+            "meetings": self.meetings,
+            "audio_minutes": self.audio_seconds / 60,
+            "words": self.words,
+            "action_items": self.action_items,
+            "decisions": self.decisions,
+            "duration_histogram": dict(zip(duration_labels(), self.durations)),
+            "top_terms": self.terms.top(top_terms),
+        }
+
+
+def duration_bin(seconds):
+    minutes = (seconds or 0) / 60
+    index = 0
+    for i, lower in enumerate(DURATION_BINS):
+        if minutes >= lower:
+            index = i
+    return index
+
+
+def duration_labels():
+    labels = [f"{lower}-{upper} min" for lower, upper in zip(DURATION_BINS, DURATION_BINS[1:])]
+    return labels + [f"{DURATION_BINS[-1]}+ min"]
+
+
+def period_key(day, granularity):
+    """'2026-10-19' for days, ISO week '2026-W43' for weeks"""
+    if granularity == "day":
+        return day.isoformat()
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class MeetingAnalytics:
+    """Incremental cross-meeting rollups per day, ISO week and tag
+
+    Every processed meeting updates a handful of rows: its day and week
+    for all meetings and for each of its tags. A row holds plain totals, a
+    meeting-length histogram and a count-min sketch with top-term
+    candidates, all of which merge by addition. Dashboards over months
+    therefore read a few hundred small rows and never rescan transcripts.
+    """
+
+    def __init__(self, db_path=None, stop_words=None, top_terms=100):
+        self.db_path = db_path or get_data_path("analytics.db")
+        self.stop_words = stop_words
+        self.top_terms = top_terms
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _term_counts(self, result):
+        from .text_stats import TextStatistics
+
+        if self.stop_words is None:
+            from .visualization import TextVisualizer
+
+            self.stop_words = TextVisualizer().stop_words
+        statistics = TextStatistics([result.get("transcript") or ""], self.stop_words)
+        return {word: int(count) for word, count in zip(statistics.vocabulary, statistics.content_counts)
+                if count}
+
+    def record(self, result, tags=None):
+        """Add a pipeline result dict (see utils.pipeline.build_result) to every rollup it belongs to"""
+        tags = tags if tags is not None else result.get("tags") or []
+        created_at = datetime.fromisoformat(result.get("created_at") or datetime.now().isoformat())
+        items = (result.get("summary") or {}).get("items", {})
+        meeting = dict(
+            duration=(result.get("audio_info") or {}).get("duration") or 0.0,
+            words=(result.get("statistics") or {}).get("total_words", 0),
+            action_items=len(items.get("action_items", [])),
+            decisions=len(items.get("decisions", [])),
+            term_counts=self._term_counts(result),
+        )
+
+        with self._lock, self.connection:
+            for granularity in GRANULARITIES:
+                period = period_key(created_at.date(), granularity)
+                for tag in [ALL_MEETINGS] + list(dict.fromkeys(tags)):
+                    rollup = self._load(granularity, period, tag) or Rollup(terms=TopTerms(self.top_terms))
+                    rollup.add_meeting(**meeting)
+                    self._save(granularity, period, tag, rollup)
+
+    def _load(self, granularity, period, tag):
+        row = self.connection.execute(
+            "SELECT * FROM rollups WHERE granularity = ? AND tag = ? AND period = ?",
+            (granularity, tag, period)
+        ).fetchone()
+        return self._rollup(row) if row else None
+
+    def _rollup(self, row):
+        terms = TopTerms(self.top_terms, CountMinSketch.from_bytes(row["sketch"]),
+                         dict(json.loads(row["top_terms"])))
+        return Rollup(row["meetings"], row["audio_seconds"], row["words"], row["action_items"],
+                      row["decisions"], json.loads(row["durations"]), terms)
+
+    def _save(self, granularity, period, tag, rollup):
+        self.connection.execute("""
+            INSERT OR REPLACE INTO rollups (granularity, period, tag, meetings, audio_seconds, words,
+                                            action_items, decisions, durations, top_terms, sketch)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            granularity, period, tag, rollup.meetings, rollup.audio_seconds, rollup.words,
+            rollup.action_items, rollup.decisions, json.dumps(rollup.durations),
+            json.dumps(list(rollup.terms.candidates.items())), rollup.terms.sketch.to_bytes(),
+        ))
+
+    def series(self, granularity="week", start=None, end=None, tag=ALL_MEETINGS, top_terms=10):
+        """[{'period', 'meetings', ...}] per bucket with start <= day < end, oldest first"""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        conditions = ["granularity = ?", "tag = ?"]
+        params = [granularity, tag]
+        if start is not None:
+            conditions.append("period >= ?")
+            params.append(period_key(start, granularity))
+        if end is not None:
+            conditions.append("period < ?")
+            params.append(period_key(end, granularity))
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT * FROM rollups WHERE {' AND '.join(conditions)} ORDER BY period", params
+            ).fetchall()
+        return [dict(period=row["period"], **self._rollup(row).to_dict(top_terms)) for row in rows]
+
+    def summary(self, start=None, end=None, tag=ALL_MEETINGS, top_terms=20):
+        """One merged rollup for a date range, built from day buckets"""
+        total = Rollup(terms=TopTerms(self.top_terms))
+        conditions = ["granularity = 'day'", "tag = ?"]
+        params = [tag]
+        if start is not None:
+            conditions.append("period >= ?")
+            params.append(period_key(start, "day"))
+        if end is not None:
+            conditions.append("period < ?")
+            params.append(period_key(end, "day"))
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT * FROM rollups WHERE {' AND '.join(conditions)}", params
+            ).fetchall()
+        for row in rows:
+            total.merge(self._rollup(row))
+        return total.to_dict(top_terms)
+
+    def tags(self):
+        with self._lock:
+            return [row[0] for row in self.connection.execute(
+                "SELECT DISTINCT tag FROM rollups WHERE tag != '' ORDER BY tag")]
+
+    def compare_tags(self, start=None, end=None, top_terms=5):
+        """Merged rollup per tag over a date range, e.g. action items per team"""
+        return {tag: self.summary(start, end, tag=tag, top_terms=top_terms) for tag in self.tags()}
+
+
+def recent_range(days):
+    """(start, end) dates covering the last ``days`` days, today included"""
+    end = date.today() + timedelta(days=1)
+    return end - timedelta(days=days), end
@@ -1,10 +1,10 @@
 import os
 import subprocess
 import sys
-import librosa
-import soundfile as sf
 import tempfile
 import shutil
+from functools import lru_cache
+from .silence_trimmer import SilenceTrimmer, normalize_loudness
 
 # Add FFmpeg to system PATH for Python
 ffmpeg_paths = [
@@ -25,6 +25,17 @@ for path in ffmpeg_paths:
         os.environ["FFMPEG_PATH"] = ffmpeg_exe
         break
 
+@lru_cache(maxsize=None)
+def _check_ffmpeg():
+    """Probe FFmpeg once per process instead of once per AudioProcessor"""
+    try:
+        result = subprocess.run(['ffmpeg', '-version'], 
+                              capture_output=True, text=True, timeout=5)
+        return result.returncode == 0
+    except (subprocess.SubprocessError, FileNotFoundError):
+        print("⚠️ FFmpeg not available, using fallback methods")
+        return False
+
 class AudioProcessor:
     """Handles audio file processing with multiple fallback methods"""
     
@@ -34,17 +45,13 @@ class AudioProcessor:
     
     def check_ffmpeg(self):
         """Check if FFmpeg is available"""
-        try:
-            result = subprocess.run(['ffmpeg', '-version'], 
-                                  capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except (subprocess.SubprocessError, FileNotFoundError):
-            print("⚠️ FFmpeg not available, using fallback methods")
-            return False
+        return _check_ffmpeg()
     
     def get_audio_info(self, audio_path):
         """Get basic information about the audio file"""
         try:
+            import librosa
+
             # Load audio file with librosa (handles most formats without FFmpeg)
             audio, sample_rate = librosa.load(audio_path, sr=None, mono=False)
             
@@ -73,6 +80,9 @@ class AudioProcessor:
             
             # Method 1: Try librosa + soundfile (no FFmpeg needed)
             try:
+                import librosa
+                import soundfile as sf
+
                 print("🔄 Converting audio using librosa...")
                 y, sr = librosa.load(input_path, sr=16000, mono=True)
                 sf.write(output_path, y, sr)
@@ -126,6 +136,29 @@ class AudioProcessor:
         except Exception as e:
             raise Exception(f"Audio file validation failed: {str(e)}")
     
+    def load_for_transcription(self, input_path, trim_silence=True, normalize=False):
+        """Load 16 kHz mono audio ready for Whisper
+        
+        Returns (audio, time_map). With ``trim_silence`` long non-speech
+        stretches are cut out and ``time_map`` converts times in the returned
+        audio back to the original file; otherwise it is None.
+        """
+        try:
+            import librosa
+
+            audio, sample_rate = librosa.load(input_path, sr=16000, mono=True)
+            if normalize:
+                audio = normalize_loudness(audio, sample_rate=sample_rate)
+            time_map = None
+            if trim_silence:
+                original_seconds = len(audio) / sample_rate
+                audio, time_map = SilenceTrimmer(sample_rate=sample_rate).trim(audio)
+                removed = original_seconds - time_map.kept_seconds
+                print(f"✂️ Trimmed {removed:.1f}s of silence ({original_seconds:.1f}s -> {time_map.kept_seconds:.1f}s)")
+            return audio, time_map
+        except Exception as e:
+            raise Exception(f"Audio preprocessing failed: {str(e)}")
+    
     def preprocess_audio(self, input_path):
         """Preprocess audio for better transcription - SIMPLIFIED VERSION"""
         try:
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from .paths import get_data_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job_key TEXT PRIMARY KEY,
+    source TEXT,
+    settings TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoint_chunks (
+    job_key TEXT NOT NULL REFERENCES checkpoints(job_key) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    segments TEXT NOT NULL,
+    PRIMARY KEY (job_key, chunk_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS checkpoint_stages (
+    job_key TEXT NOT NULL REFERENCES checkpoints(job_key) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (job_key, stage)
+) WITHOUT ROWID;
+"""
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    """blake2b of a file's contents, read in 1 MB blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """Saved progress of one (audio file, settings) job
+
+    Chunks are committed one at a time as Whisper finishes them, and whole
+    stage results (transcript, summary, statistics) once they are done.
+    A retry of the same audio with the same settings picks up everything
+    that was committed before the failure.
+    """
+
+    def __init__(self, store, job_key):
+        self.store = store
+        self.job_key = job_key
+
+    def chunks(self):
+        """{chunk_index: [segment dicts]} for every finished chunk"""
+        return self.store._chunks(self.job_key)
+
+    def save_chunk(self, index, segments):
+        self.store._save_chunk(self.job_key, index, segments)
+
+    def stage(self, name, default=None):
+        return self.store._stage(self.job_key, name, default)
+
+    def save_stage(self, name, value):
+        self.store._save_stage(self.job_key, name, value)
+
+    def cached(self, name, func, *args):
+        """Stage value from the checkpoint, or func(*args) saved for next time"""
+        value = self.stage(name)
+        if value is None:
+            value = func(*args)
+            self.save_stage(name, value)
+        return value
+
+    def clear(self):
+        """Forget this job once its result has been stored"""
+        self.store._delete(self.job_key)
+
+
+class CheckpointStore:
+    """SQLite-backed checkpoints for long transcription jobs
+
+    Jobs are keyed by a hash of the audio bytes plus every setting that
+    changes the transcript (model, decode options, silence trimming), so a
+    re-upload of the same file under a new temporary name still resumes,
+    while a different model starts over. Each committed chunk is its own
+    row, which keeps a checkpoint write cheap no matter how long the
+    meeting is. Checkpoints untouched for ``max_age_hours`` are pruned
+    when the store is opened.
+    """
+
+    def __init__(self, db_path=None, max_age_hours=48):
+        self.db_path = db_path or get_data_path("checkpoints.db")
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+        if max_age_hours is not None:
+            self.prune(max_age_hours)
+
+    def close(self):
+        self.connection.close()
+
+    def open(self, audio_path, source=None, **settings):
+        """Checkpoint for this audio file and settings, created if missing"""
+        settings_json = json.dumps(settings, sort_keys=True, default=str)
+        job_key = hashlib.blake2b(f"{file_digest(audio_path)}:{settings_json}".encode("utf-8"),
+                                  digest_size=16).hexdigest()
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO checkpoints (job_key, source, settings, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(job_key) DO UPDATE SET updated_at = excluded.updated_at",
+                (job_key, source, settings_json, time.time())
+            )
+        return Checkpoint(self, job_key)
+
+    def _touch(self, job_key):
+        self.connection.execute("UPDATE checkpoints SET updated_at = ? WHERE job_key = ?",
+                                (time.time(), job_key))
+
+    def _chunks(self, job_key):
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT chunk_index, segments FROM checkpoint_chunks WHERE job_key = ? ORDER BY chunk_index",
+                (job_key,)
+            ).fetchall()
+        return {index: json.loads(segments) for index, segments in rows}
+
+    def _save_chunk(self, job_key, index, segments):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO checkpoint_chunks (job_key, chunk_index, segments) VALUES (?, ?, ?)",
+                (job_key, index, json.dumps(segments))
+            )
+            self._touch(job_key)
+
+    def _stage(self, job_key, name, default=None):
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT value FROM checkpoint_stages WHERE job_key = ? AND stage = ?", (job_key, name)
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _save_stage(self, job_key, name, value):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO checkpoint_stages (job_key, stage, value) VALUES (?, ?, ?)",
+                (job_key, name, json.dumps(value))
+            )
+            self._touch(job_key)
+
+    def _delete(self, job_key):
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM checkpoints WHERE job_key = ?", (job_key,))
+
+    def prune(self, max_age_hours=48):
+        """Drop checkpoints not updated in the last ``max_age_hours``; returns how many"""
+        with self._lock, self.connection:
+            cursor = self.connection.execute("DELETE FROM checkpoints WHERE updated_at < ?",
+                                             (time.time() - max_age_hours * 3600,))
+        return cursor.rowcount
@@ -0,0 +1,106 @@
+import json
+import os
+import time
+
+import pytest
+
+from .corpus import CORPUS_SIZES, synthetic_segments, synthetic_transcript
+
+# Interactive script (asks for an audio path); run it directly instead
+collect_ignore = ["test_audio.py"]
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+# Set to 1 to rewrite the golden files instead of comparing against them
+UPDATE_GOLDEN_ENV = "MEETING_NOTES_UPDATE_GOLDEN"
+# Multiply every timing threshold, e.g. MEETING_NOTES_PERF_SCALE=3 on a slow CI runner
+PERF_SCALE_ENV = "MEETING_NOTES_PERF_SCALE"
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    """Plain-text transcripts by size name"""
+    return {name: synthetic_transcript(words, seed=i) for i, (name, words) in enumerate(CORPUS_SIZES.items())}
+
+
+@pytest.fixture(scope="session")
+def diarized_corpus():
+    """Timestamped, diarized transcripts by size name"""
+    return {name: synthetic_segments(words, seed=i) for i, (name, words) in enumerate(CORPUS_SIZES.items())}
+
+
+class Golden:
+    """Expected outputs stored as JSON in utils/golden/<name>.json"""
+
+    def __init__(self, name, update):
+        self.path = os.path.join(GOLDEN_DIR, f"{name}.json")
+        self.update = update
+        self.expected = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.expected = json.load(f)
+        self.actual = {}
+
+    def check(self, key, value):
+        # Round-trip through JSON so tuples, floats and NaN compare like the stored file
+        value = json.loads(json.dumps(value))
+        self.actual[key] = value
+        if self.update:
+            return
+        assert key in self.expected, f"No golden output for {key}; rerun with {UPDATE_GOLDEN_ENV}=1"
+        assert value == self.expected[key], (
+            f"Output for {key} changed; rerun with {UPDATE_GOLDEN_ENV}=1 if that is intended"
+        )
+
+    def save(self):
+        if self.update and self.actual:
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            merged = dict(self.expected, **self.actual)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(merged, f, indent=2, sort_keys=True, ensure_ascii=False)
+                f.write("\n")
+
+
+@pytest.fixture(scope="module")
+def golden(request):
+    """Golden file named after the test module (test_summarization -> golden/summarization.json)"""
+    name = request.module.__name__.rsplit(".", 1)[-1].replace("test_", "", 1)
+    golden = Golden(name, os.environ.get(UPDATE_GOLDEN_ENV) == "1")
+    yield golden
+    golden.save()
+
+
+class Timer:
+    """Best-of-N timing with a throughput floor, in the spirit of pytest-benchmark
+
+    The fastest round is used, so one slow round from a busy machine does
+    not fail the test, but a real slowdown in every round does.
+    """
+
+    def __init__(self, scale):
+        self.scale = scale
+
+    def measure(self, func, *args, rounds=5, warmup=1):
+        for _ in range(warmup):
+            func(*args)
+        best = float("inf")
+        for _ in range(rounds):
+            started = time.perf_counter()
+            func(*args)
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    def assert_throughput(self, func, *args, units, min_per_second, rounds=5, warmup=1, label=""):
+        """Fail when ``units`` (e.g. words) processed per second drops below ``min_per_second``"""
+        seconds = self.measure(func, *args, rounds=rounds, warmup=warmup)
+        throughput = units / seconds
+        floor = min_per_second / self.scale
+        print(f"⏱️ {label or func.__name__}: {seconds * 1000:.1f} ms, {throughput:,.0f}/s (floor {floor:,.0f}/s)")
+        assert throughput >= floor, (
+            f"{label or func.__name__} regressed: {throughput:,.0f}/s is below the {floor:,.0f}/s floor"
+        )
+        return seconds
+
+
+@pytest.fixture(scope="session")
+def timer():
+    return Timer(float(os.environ.get(PERF_SCALE_ENV, "1")))
@@ -0,0 +1,84 @@
+"""Synthetic meeting transcripts shared by the tests and the benchmarks
+
+Deterministic for a given seed, so golden outputs stay stable. Kept out of
+conftest.py so benchmarks can import it without pytest.
+"""
+import random
+
+from .segments import SegmentStore
+
+# Approximate transcript sizes in words
+CORPUS_SIZES = {"short": 60, "medium": 1500, "long": 5000}
+
+TOPICS = ["the pricing page", "the mobile release", "the onboarding flow", "the data migration",
+          "the quarterly budget", "the support backlog", "the hiring plan", "the API rate limits"]
+PEOPLE = ["Priya", "Marcus", "Elena", "Tom", "Aisha", "Ken"]
+DISCUSSION = [
+    "{person} walked everyone through the current state of {topic} and the numbers from last week.",
+    "There were some concerns about {topic}, mostly around timelines and ownership.",
+    "{person} thinks {topic} is in reasonable shape but the edge cases still worry the team.",
+    "The feedback on {topic} has been mixed, with customers asking for clearer documentation.",
+    "Most of the discussion about {topic} focused on what could realistically ship this quarter.",
+    "{person} mentioned that {topic} depends on work another team has not started yet.",
+    "It is not clear yet whether {topic} needs a dedicated owner or can be shared.",
+    "Okay, so the main risk with {topic} is testing, because the staging environment is unstable.",
+]
+ACTIONS = [
+    "We need to update the documentation for {topic} before Friday.",
+    "I'll follow up with {person} about {topic} tomorrow.",
+    "Let's schedule a review of {topic} next week.",
+    "We should ask legal to look at {topic}.",
+    "Next steps are to draft a proposal for {topic}.",
+]
+DECISIONS = [
+    "We decided to postpone {topic} until the next sprint.",
+    "Everyone agreed to keep {topic} behind a feature flag.",
+    "The team finalized the scope of {topic}.",
+    "We will move {topic} to the platform team.",
+]
+
+
+def synthetic_transcript(words, seed=0):
+    """Deterministic meeting transcript of roughly ``words`` words
+
+    Mostly discussion sentences, with an action item about every six
+    sentences and a decision about every ten, like a real meeting.
+    """
+    rng = random.Random(seed)
+    sentences, count = [], 0
+    while count < words:
+        roll = rng.random()
+        template = rng.choice(ACTIONS if roll < 0.16 else DECISIONS if roll < 0.26 else DISCUSSION)
+        sentence = template.format(topic=rng.choice(TOPICS), person=rng.choice(PEOPLE))
+        sentences.append(sentence)
+        count += len(sentence.split())
+    return " ".join(sentences)
+
+
+def agenda_transcript(topics=5, seed=0):
+    """Transcript that discusses ``topics`` topics one after another
+
+    Returns (text, starts) where ``starts`` are the sentence indices at
+    which each topic begins, the ground truth for topic segmentation.
+    """
+    rng = random.Random(seed)
+    sentences, starts = [], []
+    for topic in rng.sample(TOPICS, topics):
+        starts.append(len(sentences))
+        for _ in range(rng.randint(12, 40)):
+            template = rng.choice(DISCUSSION * 3 + ACTIONS + DECISIONS)
+            sentences.append(template.format(topic=topic, person=rng.choice(PEOPLE)))
+    return " ".join(sentences), starts
+
+
+def synthetic_segments(words, seed=0, speakers=3):
+    """Transcript of ``synthetic_transcript`` as a diarized SegmentStore, one segment per sentence"""
+    rng = random.Random(seed)
+    rows, start = [], 0.0
+    for sentence in synthetic_transcript(words, seed).split(". "):
+        sentence = sentence if sentence.endswith((".", "!", "?")) else sentence + "."
+        duration = round(len(sentence.split()) / 2.5, 2)
+        rows.append({"start": round(start, 2), "end": round(start + duration, 2), "text": sentence,
+                     "speaker": rng.randrange(speakers), "confidence": None})
+        start += duration + 0.3
+    return SegmentStore.from_dicts(rows)
@@ -0,0 +1,82 @@
+import os
+
+AUTO_LANGUAGE = "auto"
+# Deployments that only ever see one language can pin it, e.g. MEETING_NOTES_LANGUAGE=en
+LANGUAGE_ENV = "MEETING_NOTES_LANGUAGE"
+
+# Whisper's own temperature schedule: retry at higher temperatures when a
+# window looks like a hallucination (high compression ratio, low log-prob)
+FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+
+def default_language():
+    """The deployment's pinned language, or AUTO_LANGUAGE to let Whisper detect it per file"""
+    return os.environ.get(LANGUAGE_ENV) or AUTO_LANGUAGE
+
+
+class DecodeOptions:
+    """Decoding settings passed to ``whisper.transcribe``
+
+    ``language`` skips the per-file language detection pass when set.
+    ``beam_size`` enables beam search at temperature 0 (None is greedy),
+    ``best_of`` is the number of samples per fallback temperature.
+    Without ``temperature_fallback`` each window is decoded exactly once.
+    ``condition_on_previous_text`` feeds the previous window as a prompt,
+    which helps consistency but can make one bad window repeat itself.
+    """
+
+    def __init__(self, language=None, beam_size=None, best_of=5, temperature_fallback=True,
+                 condition_on_previous_text=True, preset=None):
+        if beam_size is not None and beam_size < 1:
+            raise ValueError(f"beam_size must be at least 1, got {beam_size}")
+        if best_of is not None and best_of < 1:
+            raise ValueError(f"best_of must be at least 1, got {best_of}")
+        self.language = None if language in (None, "", AUTO_LANGUAGE) else language
+        self.beam_size = beam_size
+        self.best_of = best_of
+        self.temperature_fallback = temperature_fallback
+        self.condition_on_previous_text = condition_on_previous_text
+        self.preset = preset
+
+    @classmethod
+    def from_preset(cls, name="balanced", language=None):
+        if name not in DECODE_PRESETS:
+            raise ValueError(f"Unknown decode preset: {name!r}. Use one of {', '.join(DECODE_PRESETS)}")
+        return cls(language=language, preset=name, **DECODE_PRESETS[name])
+
+    def to_whisper_kwargs(self):
+        """Keyword arguments for ``model.transcribe``"""
+        kwargs = {
+            "fp16": False,  # FP32 for CPU compatibility
+            "temperature": FALLBACK_TEMPERATURES if self.temperature_fallback else 0.0,
+            "condition_on_previous_text": self.condition_on_previous_text,
+        }
+        if self.language:
+            kwargs["language"] = self.language
+        if self.beam_size:
+            kwargs["beam_size"] = self.beam_size
+        # best_of only applies to sampling, i.e. the fallback temperatures
+        if self.temperature_fallback and self.best_of:
+            kwargs["best_of"] = self.best_of
+        return kwargs
+
+    def to_dict(self):
+        return {
+            "preset": self.preset,
+            "language": self.language or AUTO_LANGUAGE,
+            "beam_size": self.beam_size,
+            "best_of": self.best_of,
+            "temperature_fallback": self.temperature_fallback,
+            "condition_on_previous_text": self.condition_on_previous_text,
+        }
+
+
+# "balanced" reproduces Whisper's defaults, which is what every call used before
+DECODE_PRESETS = {
+    "fast": dict(beam_size=None, best_of=None, temperature_fallback=False,
+                 condition_on_previous_text=False),
+    "balanced": dict(beam_size=None, best_of=5, temperature_fallback=True,
+                     condition_on_previous_text=True),
+    "accurate": dict(beam_size=5, best_of=5, temperature_fallback=True,
+                     condition_on_previous_text=True),
+}
@@ -0,0 +1,227 @@
+import numpy as np
+
+from .speech_detection import energy_speech_intervals
+
+
+class SpeakerDiarizer:
+    """Offline, CPU-only speaker diarization
+
+    1. Energy-based VAD splits the recording into short speech windows.
+    2. Each window gets a compact MFCC mean/std embedding. MFCCs are computed
+       once for the whole file and windows are summarized with cumulative
+       sums, so embedding cost is linear in the audio length.
+    3. Windows are clustered with an online leader algorithm against at most
+       ``max_speakers`` centroids (O(n * k)), followed by a centroid merge and
+       one reassignment pass. No n x n affinity matrix is ever built.
+    """
+
+    def __init__(self, sample_rate=16000, top_db=30, min_window=0.5, max_window=2.0,
+                 n_mfcc=20, hop_length=160, similarity_threshold=0.85, max_speakers=8):
+        self.sample_rate = sample_rate
+        self.top_db = top_db
+        self.min_window = min_window
+        self.max_window = max_window
+        self.n_mfcc = n_mfcc
+        self.hop_length = hop_length
+        self.similarity_threshold = similarity_threshold
+        self.max_speakers = max_speakers
+
+    def detect_speech_windows(self, audio):
+        """Return (start_sample, end_sample) speech windows no longer than max_window"""
+        intervals = self._speech_intervals(audio)
+        min_len = int(self.min_window * self.sample_rate)
+        max_len = int(self.max_window * self.sample_rate)
+
+        windows = []
+        for start, end in intervals:
+            for window_start in range(start, end, max_len):
+                window_end = min(window_start + max_len, end)
+                if window_end - window_start >= min_len:
+                    windows.append((window_start, window_end))
+        return windows
+
+    def _speech_intervals(self, audio, min_gap=0.1):
+        """Energy VAD over non-overlapping hop-sized frames"""
+        return energy_speech_intervals(audio, self.sample_rate, self.hop_length, self.top_db, min_gap)
+
+    def compute_embeddings(self, audio, windows):
+        """MFCC mean/std embedding per window, L2-normalized, shape (n_windows, 2 * n_mfcc)"""
+        if not windows:
+            return np.zeros((0, 2 * self.n_mfcc), dtype=np.float32)
+
+        mfcc = self._mfcc(audio)
+        # Cepstral mean normalization over the whole recording removes channel effects
+        mfcc -= mfcc.mean(axis=1, keepdims=True)
+
+        # Prefix sums give O(1) mean/variance for any frame range
+        zeros = np.zeros((self.n_mfcc, 1))
+        cumsum = np.concatenate([zeros, np.cumsum(mfcc, axis=1)], axis=1)
+        cumsum_sq = np.concatenate([zeros, np.cumsum(mfcc ** 2, axis=1)], axis=1)
+
+        bounds = np.array(windows) // self.hop_length
+        starts = bounds[:, 0]
+        ends = np.maximum(np.minimum(bounds[:, 1], mfcc.shape[1]), starts + 1)
+        counts = (ends - starts).astype(np.float64)
+
+        means = (cumsum[:, ends] - cumsum[:, starts]) / counts
+        variances = (cumsum_sq[:, ends] - cumsum_sq[:, starts]) / counts - means ** 2
+        stds = np.sqrt(np.maximum(variances, 0.0))
+
+        embeddings = np.concatenate([means, stds], axis=0).T
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.maximum(norms, 1e-9)
+        return embeddings.astype(np.float32)
+
+    def _mfcc(self, audio, block_seconds=60):
+        """MFCC frames for the whole recording, computed block by block
+
+        Computing the spectrogram of a multi-hour file in one call allocates
+        gigabytes; fixed-size blocks keep peak memory flat regardless of length.
+        """
+        import librosa
+
+        block = int(block_seconds * self.sample_rate) // self.hop_length * self.hop_length
+        blocks = []
+        for start in range(0, len(audio), block):
+            chunk = audio[start:start + block]
+            frames = len(chunk) // self.hop_length
+            if frames == 0:
+                break
+            features = librosa.feature.mfcc(y=chunk, sr=self.sample_rate, n_mfcc=self.n_mfcc,
+                                            hop_length=self.hop_length)
+            blocks.append(features[:, :frames])
+        if not blocks:
+            return np.zeros((self.n_mfcc, 1))
+        return np.concatenate(blocks, axis=1).astype(np.float64)
+
+    def cluster(self, embeddings):
+        """Assign a speaker id to every embedding without pairwise distances"""
+        n = len(embeddings)
+        if n == 0:
+            return np.zeros(0, dtype=np.int32)
+
+        centroids = np.zeros((self.max_speakers, embeddings.shape[1]), dtype=np.float64)
+        sizes = np.zeros(self.max_speakers, dtype=np.int64)
+        k = 0
+
+        # Pass 1: online leader clustering
+        for embedding in embeddings:
+            if k:
+                normed = centroids[:k] / np.linalg.norm(centroids[:k], axis=1, keepdims=True)
+                similarities = normed @ embedding
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.similarity_threshold or k == self.max_speakers:
+                    sizes[best] += 1
+                    centroids[best] += (embedding - centroids[best]) / sizes[best]
+                    continue
+            centroids[k] = embedding
+            sizes[k] = 1
+            k += 1
+
+        centroids = self._merge_centroids(centroids[:k], sizes[:k])
+
+        # Pass 2: reassign every window to its closest final centroid
+        normed = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+        labels = np.argmax(embeddings @ normed.T, axis=1).astype(np.int32)
+
+        # Renumber speakers in order of first appearance
+        _, first_seen = np.unique(labels, return_index=True)
+        order = labels[np.sort(first_seen)]
+        remap = np.zeros(len(centroids), dtype=np.int32)
+        remap[order] = np.arange(len(order), dtype=np.int32)
+        return remap[labels]
+
+    def _merge_centroids(self, centroids, sizes):
+        """Merge centroids that drifted together; works on k <= max_speakers rows only"""
+        centroids = [c for c in centroids]
+        sizes = [int(s) for s in sizes]
+        merged = True
+        while merged and len(centroids) > 1:
+            merged = False
+            matrix = np.array(centroids)
+            normed = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+            similarities = normed @ normed.T
+            np.fill_diagonal(similarities, -1.0)
+            i, j = np.unravel_index(np.argmax(similarities), similarities.shape)
+            if similarities[i, j] >= self.similarity_threshold:
+                total = sizes[i] + sizes[j]
+                centroids[i] = (centroids[i] * sizes[i] + centroids[j] * sizes[j]) / total
+                sizes[i] = total
+                del centroids[j]
+                del sizes[j]
+                merged = True
+        return np.array(centroids)
+
+    def diarize_audio(self, audio):
+        """Return speaker turns [{'start', 'end', 'speaker'}] for a mono 16 kHz array"""
+        windows = self.detect_speech_windows(audio)
+        embeddings = self.compute_embeddings(audio, windows)
+        labels = self.cluster(embeddings)
+
+        turns = []
+        for (start, end), label in zip(windows, labels):
+            start_time = start / self.sample_rate
+            end_time = end / self.sample_rate
+            speaker = int(label)
+            if turns and turns[-1]['speaker'] == speaker and start_time - turns[-1]['end'] < 1.0:
+                turns[-1]['end'] = end_time
+            else:
+                turns.append({'start': start_time, 'end': end_time, 'speaker': speaker})
+        return turns
+
+    def diarize(self, audio_path):
+        """Return speaker turns for an audio file"""
+        try:
+            import librosa
+
+            audio, _ = librosa.load(audio_path, sr=self.sample_rate, mono=True)
+            return self.diarize_audio(audio)
+        except Exception as e:
+            raise Exception(f"Speaker diarization failed: {str(e)}")
+
+
+def assign_speakers(segments, turns):
+    """Label a SegmentStore with the speaker that overlaps each segment most
+
+    Segments and turns are both sorted by start time, so a single sweep
+    suffices. The store is updated in place and returned.
+    """
+    turn_index = 0
+    for index in range(len(segments)):
+        segment_start = segments.starts[index]
+        segment_end = segments.ends[index]
+        while turn_index < len(turns) and turns[turn_index]['end'] <= segment_start:
+            turn_index += 1
+
+        overlaps = {}
+        i = turn_index
+        while i < len(turns) and turns[i]['start'] < segment_end:
+            overlap = min(segment_end, turns[i]['end']) - max(segment_start, turns[i]['start'])
+            if overlap > 0:
+                speaker = turns[i]['speaker']
+                overlaps[speaker] = overlaps.get(speaker, 0.0) + overlap
+            i += 1
+
+        if overlaps:
+            segments.set_speaker(index, max(overlaps, key=overlaps.get))
+        elif turn_index:
+            segments.set_speaker(index, turns[turn_index - 1]['speaker'])
+    return segments
+
+
+def speaker_name(speaker):
+    """Display name for a speaker id"""
+    return "Unknown speaker" if speaker is None else f"Speaker {speaker + 1}"
+
+
+def format_speaker_transcript(segments):
+    """Render a labeled SegmentStore as 'Speaker N: text' paragraphs"""
+    lines = []
+    current_speaker = object()
+    for segment in segments:
+        if segment.speaker != current_speaker:
+            current_speaker = segment.speaker
+            lines.append(f"{speaker_name(current_speaker)}: {segment.text}")
+        else:
+            lines[-1] += f" {segment.text}"
+    return "\n\n".join(lines)
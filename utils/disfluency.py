@@ -0,0 +1,172 @@
+import string
+from itertools import compress, repeat
+from operator import eq
+
+from .segments import SegmentStore, as_segment_store
+
+# Hesitations: removed wherever they occur
+FILLERS = ("um", "umm", "uh", "uhh", "uhm", "erm", "er", "ah", "hmm", "mm", "mhm")
+# Discourse markers: removed only where a clause starts ("So we agreed" -> "We agreed")
+OPENERS = ("so", "okay", "ok", "basically", "actually", "anyway")
+# Markers that are also ordinary words ("well done", "you know the answer"): removed at a
+# clause start only when a comma follows ("Well, we agreed")
+COMMA_OPENERS = ("well", "like", "right", "yeah", "yes", "alright", "now", "you know", "i mean")
+# Words that are grammatical when doubled ("I think that that is fine", "we had had
+# enough"): kept once repeated, only a third occurrence is a stutter
+GRAMMATICAL_DOUBLES = ("that", "had")
+
+# Every single-word filler and marker, for stop word lists
+FILLER_WORDS = frozenset(word for word in FILLERS + OPENERS + COMMA_OPENERS if " " not in word)
+
+_FILLER, _OPENER, _COMMA_OPENER = "filler", "opener", "comma_opener"
+_END = object()
+_EDGE_PUNCTUATION = string.punctuation.replace("'", "") + "…"
+_CLAUSE_END = ".!?,;:…"
+_SENTENCE_END = ".!?…"
+
+
+class DisfluencyCleaner:
+    """Removes fillers and stutters from transcript text in one pass over its words
+
+    Fillers and discourse markers live in a trie keyed by word, so every
+    position is matched against all phrases at once (longest match wins)
+    without regex backtracking. In the same pass, a word or phrase of up to
+    ``max_repeat`` words that repeats what was just kept ("the the",
+    "we need to we need to") is skipped, except the first repeat of a word
+    in ``doubles`` ("that that"). A repeat across punctuation ("what it is,
+    is") is not a stutter either. Work is linear in the number of words. Punctuation that ends a sentence is kept on the previous word,
+    and a sentence that started with a removed filler is re-capitalized.
+
+    Candidate positions (words that start a trie phrase or equal one of the
+    ``max_repeat`` words before them) are found up front with C-level
+    ``map``/``compress`` passes, and the Python loop only visits those;
+    the runs of ordinary words between them are copied as slices.
+    """
+
+    def __init__(self, fillers=FILLERS, openers=OPENERS, comma_openers=COMMA_OPENERS, max_repeat=3,
+                 doubles=GRAMMATICAL_DOUBLES):
+        self.max_repeat = max_repeat
+        self.doubles = frozenset(word.lower() for word in doubles)
+        self.trie = {}
+        self.longest = 1
+        for kind, phrases in ((_FILLER, fillers), (_OPENER, openers), (_COMMA_OPENER, comma_openers)):
+            for phrase in phrases:
+                node = self.trie
+                words = phrase.lower().split()
+                for word in words:
+                    node = node.setdefault(word, {})
+                node[_END] = kind
+                self.longest = max(self.longest, len(words))
+
+    def _match(self, keys, i):
+        """(length, kind) of the longest filler phrase starting at word i, or (0, None)"""
+        node = self.trie
+        best = (0, None)
+        for j in range(i, min(i + self.longest, len(keys))):
+            node = node.get(keys[j])
+            if node is None:
+                break
+            if _END in node:
+                best = (j - i + 1, node[_END])
+        return best
+
+    def _careful_until(self, lowered, kept_lowered, i):
+        """Where the fast path may resume after a removal that ended at word i
+
+        The precomputed candidates compare each word with the words before
+        it in the original text; right after a removal, the words before it
+        in the cleaned text differ, so the next ``max_repeat`` words are
+        checked one by one if any of them matches the kept tail.
+        """
+        tail = kept_lowered[-self.max_repeat:]
+        if set(tail).isdisjoint(lowered[i:i + self.max_repeat]):
+            return i
+        return i + self.max_repeat
+
+    def clean(self, text):
+        """Cleaned copy of one piece of transcript text"""
+        words = text.split()
+        if not words:
+            return ""
+        lowered = text.lower().split()
+        if len(lowered) != len(words):
+            lowered = [word.lower() for word in words]
+        count = len(words)
+        keys = list(map(str.strip, lowered, repeat(_EDGE_PUNCTUATION, count)))
+        trie, max_repeat = self.trie, self.max_repeat
+
+        # Only words that may start a filler or repeat one of the max_repeat words before them
+        # need a closer look; the runs in between are copied as they are
+        events = set(compress(range(count), map(trie.__contains__, keys)))
+        for distance in range(1, max_repeat + 1):
+            events.update(compress(range(distance, count), map(eq, lowered[distance:], lowered)))
+        events = sorted(events)
+        events.append(count)
+
+        # kept_lowered starts with max_repeat placeholders so its tail can always be sliced
+        kept, kept_lowered = [], [None] * max_repeat
+        clause_start, capitalize = True, False
+        i = event = careful_until = 0
+        while i < count:
+            if i >= careful_until:
+                while events[event] < i:
+                    event += 1
+                end = events[event]
+                if end > i:
+                    if capitalize:
+                        kept.append(words[i][0].upper() + words[i][1:])
+                        kept.extend(words[i + 1:end])
+                        capitalize = False
+                    else:
+                        kept.extend(words[i:end])
+                    kept_lowered.extend(lowered[i:end])
+                    clause_start = words[end - 1][-1] in _CLAUSE_END
+                    i = end
+                    continue
+
+            if keys[i] in trie:
+                length, kind = self._match(keys, i)
+                last = words[i + length - 1]
+                if kind == _FILLER or (kind is not None and clause_start
+                                       and (kind == _OPENER or last[-1] == ",")):
+                    if last[-1] in _SENTENCE_END and kept and kept[-1][-1] not in _CLAUSE_END:
+                        kept[-1] += last[-1]
+                    capitalize = capitalize or (clause_start and words[i][0].isupper())
+                    clause_start = clause_start or last[-1] in _CLAUSE_END
+                    i += length
+                    careful_until = self._careful_until(lowered, kept_lowered, i)
+                    continue
+
+            low = lowered[i]
+            if low in kept_lowered[-max_repeat:]:
+                smallest = 2 if low in self.doubles and kept_lowered[-2] != low else 1
+                size = next((size for size in range(smallest, min(max_repeat, count - i) + 1)
+                             if lowered[i:i + size] == kept_lowered[-size:]), 0)
+                if size:
+                    i += size
+                    careful_until = self._careful_until(lowered, kept_lowered, i)
+                    continue
+
+            word = words[i]
+            if capitalize:
+                word = word[0].upper() + word[1:]
+                capitalize = False
+            kept.append(word)
+            kept_lowered.append(low)
+            clause_start = word[-1] in _CLAUSE_END
+            i += 1
+        return " ".join(kept)
+
+    def clean_segments(self, segments):
+        """SegmentStore with every segment cleaned; times, speakers and confidences are kept
+
+        Segments that were nothing but filler are left out.
+        """
+        segments = as_segment_store(segments)
+        rows = []
+        for segment in segments:
+            row = segment.to_dict()
+            row["text"] = self.clean(row["text"])
+            if row["text"]:
+                rows.append(row)
+        return SegmentStore.from_dicts(rows)
@@ -0,0 +1,441 @@
+"""Distributed transcription: one recording split across worker nodes
+
+    python -m utils.distributed worker --queue /shared/meetings/work_queue.db --shared
+    python -m utils.distributed submit meeting.mp3 --queue /shared/meetings/work_queue.db --shared --wait
+    python -m utils.distributed status <job_id> --queue /shared/meetings/work_queue.db --shared
+
+The coordinator prepares the audio once (silence trim, loudness), cuts it
+at quiet points into ``chunk_seconds`` pieces and writes them next to the
+queue file, so every node reads only its own chunk. Workers on any
+machine lease "chunk" tasks, transcribe them and send heartbeats; a chunk
+whose worker stops sending them is stolen by the next idle worker.
+Completing the last chunk queues the "merge" task in the same
+transaction (the coordinator also queues it while waiting, for jobs
+whose chunks are all done without one). The merge puts the
+segments back on the original clock, optionally diarizes the chunk audio
+reassembled from shared storage, and runs the summary and statistics
+stages like MeetingPipeline.run.
+
+Chunks are transcribed independently, so Whisper does not get the end
+of the previous chunk as its prompt (the checkpointed single-node path
+does).
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from .decode_options import AUTO_LANGUAGE, DecodeOptions, default_language
+from .model_selection import AUTO_MODEL, ModelSelector
+from .pipeline import MeetingPipeline
+from .silence_trimmer import TimeMap
+from .summarizer_registry import summarizer_names
+from .transcription import SAMPLE_RATE, TranscriptGenerator
+from .work_queue import FollowUp, SQLiteWorkQueue, default_worker_id
+
+CHUNK_TASK = "chunk"
+MERGE_TASK = "merge"
+# Merges go ahead of new chunks so finished recordings are not held up by queued ones
+MERGE_PRIORITY = -1
+# Default for DistributedCoordinator.wait, so a stuck job does not block its caller forever
+WAIT_TIMEOUT = 4 * 3600
+
+
+def _chunk_path(job_dir, index):
+    return os.path.join(job_dir, f"chunk_{index:04d}.npy")
+
+
+def _read_job(job_dir):
+    with open(os.path.join(job_dir, "job.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _merge_follow_up(job_dir, job):
+    return FollowUp(MERGE_TASK, 0, {"job_dir": job_dir}, after=job["chunk_count"], priority=MERGE_PRIORITY)
+
+
+def _pipeline_settings(transcription_model, summarization_model, diarize, trim_silence, normalize_loudness,
+                       decode_options, chunk_seconds):
+    return {
+        "transcription_model": transcription_model,
+        "summarization_model": summarization_model,
+        "diarize": diarize,
+        "trim_silence": trim_silence,
+        "normalize_loudness": normalize_loudness,
+        "decode_options": decode_options.to_dict(),
+        "chunk_seconds": chunk_seconds,
+    }
+
+
+class DistributedCoordinator:
+    """Splits recordings into chunk tasks on a shared WorkQueue and collects the merged results
+
+    ``work_dir`` must be on storage every worker mounts; by default it is
+    a ``distributed`` folder next to the queue database.
+    """
+
+    def __init__(self, queue, work_dir=None):
+        self.queue = queue
+        self.work_dir = work_dir or os.path.join(os.path.dirname(os.path.abspath(queue.db_path)), "distributed")
+        os.makedirs(self.work_dir, exist_ok=True)
+
+    def submit(self, audio_path, transcription_model="openai/whisper-base", summarization_model="lsa",
+               diarize=False, trim_silence=True, normalize_loudness=False, decode_options=None,
+               chunk_seconds=300, tags=None, source=None, model_selector=None):
+        """Queue one recording; returns its job id
+
+        With transcription_model="auto" the model is chosen for the number
+        of workers currently alive, since they share the recording.
+        """
+        decode_options = decode_options or DecodeOptions()
+        audio_path = os.path.abspath(audio_path)
+        pipeline = MeetingPipeline(summarization_model=summarization_model)
+        audio_info = pipeline.get_audio_info(audio_path)
+
+        model_selection = None
+        if transcription_model == AUTO_MODEL:
+            workers = max(1, len(self.queue.workers()))
+            choice = (model_selector or ModelSelector()).choose(audio_info["duration"], workers=workers)
+            transcription_model = choice.model
+            model_selection = choice.to_dict()
+
+        generator = TranscriptGenerator(transcription_model, trim_silence=trim_silence,
+                                        normalize_loudness=normalize_loudness, decode_options=decode_options,
+                                        chunk_seconds=chunk_seconds)
+        audio, time_map, bounds = generator.prepare_audio(audio_path)
+
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = os.path.join(self.work_dir, job_id)
+        os.makedirs(job_dir)
+        settings = _pipeline_settings(transcription_model, summarization_model, diarize, trim_silence,
+                                      normalize_loudness, decode_options, chunk_seconds)
+        job = {
+            "job_id": job_id,
+            "audio_path": audio_path,
+            "source": source or os.path.basename(audio_path),
+            "audio_info": audio_info,
+            "time_map": time_map.to_dict() if time_map is not None else None,
+            "chunk_count": len(bounds) - 1,
+            "settings": settings,
+            "tags": list(tags or []),
+            "model_selection": model_selection,
+            "submitted_at": time.time(),
+        }
+        with open(os.path.join(job_dir, "job.json"), "w", encoding="utf-8") as f:
+            json.dump(job, f)
+
+        for index, (start, end) in enumerate(zip(bounds, bounds[1:])):
+            # 16-bit PCM, like a WAV file: half the size of float32 on the shared disk
+            chunk_path = _chunk_path(job_dir, index)
+            np.save(chunk_path, (np.clip(audio[start:end], -1.0, 1.0) * 32767).astype(np.int16))
+            self.queue.put(job_id, CHUNK_TASK, index, {
+                "job_dir": job_dir,
+                "chunk_path": chunk_path,
+                "offset": start / SAMPLE_RATE,
+                "settings": settings,
+            })
+        print(f"📤 Queued {job['source']} as job {job_id}: {job['chunk_count']} chunk(s) of "
+              f"~{chunk_seconds}s with {transcription_model}")
+        return job_id
+
+    def status(self, job_id):
+        """Task counts by kind and state, failures, and whether the merged result is ready"""
+        progress = self.queue.progress(job_id)
+        return {
+            "job_id": job_id,
+            "progress": progress,
+            "errors": self.queue.errors(job_id),
+            "done": progress.get(MERGE_TASK, {}).get("done", 0) == 1,
+        }
+
+    def result(self, job_id):
+        """The merged result dict, or None while the job is still running"""
+        return self.queue.results(job_id, MERGE_TASK).get("0")
+
+    def queue_merge_if_ready(self, job_id):
+        """Queue the merge of a job whose chunks are all done; True if it was missing"""
+        job_dir = os.path.join(self.work_dir, job_id)
+        if not os.path.exists(os.path.join(job_dir, "job.json")):
+            return False
+        follow_up = _merge_follow_up(job_dir, _read_job(job_dir))
+        if len(self.queue.results(job_id, CHUNK_TASK)) < follow_up.after:
+            return False
+        # put() is idempotent, so this is harmless when the merge is already queued
+        return self.queue.put(job_id, follow_up.kind, follow_up.key, follow_up.payload, follow_up.priority)
+
+    def wait(self, job_id, timeout=WAIT_TIMEOUT, poll_interval=2.0):
+        """Block until the merged result is ready; raises if a task failed for good or on timeout
+
+        Pass ``timeout=None`` to wait without a limit.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            result = self.result(job_id)
+            if result is not None:
+                return result
+            self.queue_merge_if_ready(job_id)
+            errors = self.queue.errors(job_id)
+            if errors:
+                kind, key, error = errors[0]
+                raise Exception(f"Distributed job {job_id} failed in {kind} {key}: {error}")
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Distributed job {job_id} did not finish within {timeout}s")
+            time.sleep(poll_interval)
+
+
+class DistributedWorker:
+    """Leases chunk and merge tasks from a WorkQueue until stopped
+
+    While a task runs, a background thread renews its lease every
+    ``heartbeat_interval`` seconds and refreshes the worker's entry in the
+    worker table. ``lease_seconds`` should cover several heartbeats: a
+    worker that misses them all is treated as dead and its task is stolen.
+    Optional meeting_store, search_index and analytics record merged
+    meetings, as in MeetingPipeline.
+    """
+
+    def __init__(self, queue, worker_id=None, lease_seconds=120, heartbeat_interval=20, poll_interval=2.0,
+                 num_threads=None, meeting_store=None, search_index=None, analytics=None):
+        if heartbeat_interval >= lease_seconds:
+            raise ValueError(f"heartbeat_interval ({heartbeat_interval}) must be shorter than "
+                             f"lease_seconds ({lease_seconds})")
+        self.queue = queue
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.num_threads = num_threads
+        self.meeting_store = meeting_store
+        self.search_index = search_index
+        self.analytics = analytics
+        self.completed = 0
+        self._pipelines = {}
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _get_pipeline(self, settings):
+        """One pipeline per settings, so each Whisper model is loaded once per worker"""
+        key = json.dumps(settings, sort_keys=True)
+        if key not in self._pipelines:
+            self._pipelines[key] = MeetingPipeline(
+                settings["transcription_model"], settings["summarization_model"],
+                diarize=settings["diarize"],
+                trim_silence=settings["trim_silence"],
+                normalize_loudness=settings["normalize_loudness"],
+                decode_options=DecodeOptions(**settings["decode_options"]),
+                num_threads=self.num_threads,
+                meeting_store=self.meeting_store,
+                search_index=self.search_index,
+                analytics=self.analytics,
+            )
+            self._pipelines[key].get_transcript_generator().chunk_seconds = settings["chunk_seconds"]
+        return self._pipelines[key]
+
+    def run(self, idle_exit=None):
+        """Process tasks until stop() is called, or after ``idle_exit`` seconds without work"""
+        self.queue.register_worker(self.worker_id, {"pid": os.getpid(), "threads": self.num_threads})
+        print(f"👷 Worker {self.worker_id} waiting for tasks")
+        idle_since = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                task = self.queue.claim(self.worker_id, lease_seconds=self.lease_seconds)
+                if task is None:
+                    if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                        break
+                    self.queue.register_worker(self.worker_id)
+                    self._stop.wait(self.poll_interval)
+                    continue
+                self.run_task(task)
+                idle_since = time.monotonic()
+        finally:
+            self.queue.unregister_worker(self.worker_id)
+        return self.completed
+
+    def _heartbeat(self, task, done, lost):
+        while not done.wait(self.heartbeat_interval):
+            if not self.queue.heartbeat(task, self.lease_seconds):
+                lost.set()
+                return
+            self.queue.register_worker(self.worker_id)
+
+    def run_task(self, task):
+        """Run one leased task with heartbeats; the result only counts if the lease was kept"""
+        done, lost = threading.Event(), threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(task, done, lost), daemon=True)
+        heartbeat.start()
+        try:
+            if task.kind == CHUNK_TASK:
+                result = self._transcribe_chunk(task)
+            elif task.kind == MERGE_TASK:
+                result = self._merge(task)
+            else:
+                raise ValueError(f"Unknown task kind: {task.kind}")
+        except Exception as e:
+            done.set()
+            print(f"❌ {task} failed on {self.worker_id}: {str(e)}")
+            self.queue.fail(task, str(e))
+            return False
+        finally:
+            done.set()
+            heartbeat.join()
+
+        follow_up = None
+        if task.kind == CHUNK_TASK:
+            follow_up = _merge_follow_up(task.payload["job_dir"], _read_job(task.payload["job_dir"]))
+        if lost.is_set() or not self.queue.complete(task, result, follow_up=follow_up):
+            print(f"⚠️ Lease on {task} was lost; another worker owns it now")
+            return False
+        self.completed += 1
+        if task.kind == MERGE_TASK:
+            shutil.rmtree(task.payload["job_dir"], ignore_errors=True)
+        return True
+
+    def _transcribe_chunk(self, task):
+        payload = task.payload
+        generator = self._get_pipeline(payload["settings"]).get_transcript_generator()
+        audio = np.load(payload["chunk_path"]).astype(np.float32) / 32767
+        started = time.perf_counter()
+        print(f"🎙️ {self.worker_id}: {task.job_id} chunk {task.key} ({len(audio) / SAMPLE_RATE:.0f}s)")
+        segments = generator.transcribe_array(audio, payload["offset"])
+        return {"segments": segments, "seconds": time.perf_counter() - started, "worker_id": self.worker_id}
+
+    def _merge(self, task):
+        """Chunk segments in order, on the original clock, through the remaining pipeline stages"""
+        job = _read_job(task.payload["job_dir"])
+        chunks = self.queue.results(task.job_id, CHUNK_TASK)
+        whisper_segments = []
+        for index in range(job["chunk_count"]):
+            whisper_segments.extend(chunks[str(index)]["segments"])
+        if job["time_map"] is not None:
+            TimeMap(**job["time_map"]).remap_segments(whisper_segments)
+
+        pipeline = self._get_pipeline(job["settings"])
+        generator = pipeline.get_transcript_generator()
+        segments = generator.build_segments(generator.postprocess(whisper_segments))
+        timings = {
+            "transcription": time.time() - job["submitted_at"],
+            "transcription_worker_seconds": sum(chunk["seconds"] for chunk in chunks.values()),
+        }
+        if job["settings"]["diarize"]:
+            pipeline._run_stage(timings, None, "diarization", self._diarize, task.payload["job_dir"], job,
+                                segments)
+        result = pipeline.finish(
+            job["audio_path"], job["audio_info"], segments,
+            model=job["settings"]["transcription_model"],
+            timings=timings,
+            tags=job["tags"],
+            source=job["source"],
+            model_selection=job["model_selection"],
+            postprocessing=generator.last_postprocessing,
+        )
+        result["distributed"] = {
+            "job_id": task.job_id,
+            "chunks": job["chunk_count"],
+            "workers": sorted({chunk["worker_id"] for chunk in chunks.values()}),
+        }
+        print(f"✅ Merged {job['source']} ({job['chunk_count']} chunks from "
+              f"{len(result['distributed']['workers'])} worker(s))")
+        return result
+
+    def _diarize(self, job_dir, job, segments):
+        """Label the merged segments with speakers, in place
+
+        ``job["audio_path"]`` is only a path on the submitting node, so the
+        prepared audio is reassembled from the chunks on shared storage;
+        speaker turns are then put back on the original clock like the
+        segments.
+        """
+        if not len(segments):
+            return segments
+        from .diarization import SpeakerDiarizer, assign_speakers
+
+        audio = np.concatenate([np.load(_chunk_path(job_dir, index))
+                                for index in range(job["chunk_count"])]).astype(np.float32) / 32767
+        turns = SpeakerDiarizer(sample_rate=SAMPLE_RATE).diarize_audio(audio)
+        if job["time_map"] is not None:
+            TimeMap(**job["time_map"]).remap_segments(turns)
+        assign_speakers(segments, turns)
+        return segments
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queue", default=None, help="Work queue database (default: meeting_data/work_queue.db)")
+    parser.add_argument("--shared", action="store_true",
+                        help="The queue is on a network file system shared by several machines")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker = commands.add_parser("worker", help="Process chunk and merge tasks")
+    worker.add_argument("--threads", type=int, default=None, help="Torch threads for this worker")
+    worker.add_argument("--lease", type=float, default=120, help="Seconds before a silent worker's task is stolen")
+    worker.add_argument("--heartbeat", type=float, default=20)
+    worker.add_argument("--idle-exit", type=float, default=None, help="Stop after this many idle seconds")
+    worker.add_argument("--record", action="store_true",
+                        help="Save merged meetings to the meeting store, search index and analytics")
+
+    submit = commands.add_parser("submit", help="Queue a recording")
+    submit.add_argument("audio_path")
+    submit.add_argument("--model", default="openai/whisper-base")
+    submit.add_argument("--summarization-model", default="lsa", choices=summarizer_names())
+    submit.add_argument("--preset", default="balanced")
+    submit.add_argument("--language", default=default_language(),
+                        help=f"Whisper language code, or '{AUTO_LANGUAGE}' to detect it (default: {default_language()})")
+    submit.add_argument("--chunk-seconds", type=float, default=300)
+    submit.add_argument("--diarize", action="store_true")
+    submit.add_argument("--tags", nargs="*", default=[])
+    submit.add_argument("--wait", action="store_true", help="Wait for the merged result")
+    submit.add_argument("--timeout", type=float, default=WAIT_TIMEOUT, help="Seconds to wait (with --wait)")
+    submit.add_argument("--output", default=None, help="Write the merged result JSON here (with --wait)")
+
+    status = commands.add_parser("status", help="Progress of a job and the live workers")
+    status.add_argument("job_id")
+
+    args = parser.parse_args(argv)
+    queue = SQLiteWorkQueue(args.queue, shared=args.shared)
+
+    if args.command == "worker":
+        stores = {}
+        if args.record:
+            from .analytics import MeetingAnalytics
+            from .meeting_store import MeetingStore
+            from .search_index import MeetingSearchIndex
+
+            stores = {"meeting_store": MeetingStore(), "search_index": MeetingSearchIndex(),
+                      "analytics": MeetingAnalytics()}
+        worker = DistributedWorker(queue, lease_seconds=args.lease, heartbeat_interval=args.heartbeat,
+                                   num_threads=args.threads, **stores)
+        try:
+            worker.run(idle_exit=args.idle_exit)
+        except KeyboardInterrupt:
+            pass
+        print(f"👋 Worker {worker.worker_id} finished {worker.completed} task(s)", file=sys.stderr)
+    elif args.command == "submit":
+        coordinator = DistributedCoordinator(queue)
+        job_id = coordinator.submit(
+            args.audio_path, transcription_model=args.model, summarization_model=args.summarization_model,
+            diarize=args.diarize, chunk_seconds=args.chunk_seconds, tags=args.tags,
+            decode_options=DecodeOptions.from_preset(args.preset, language=args.language),
+        )
+        print(job_id)
+        if args.wait:
+            result = coordinator.wait(job_id, timeout=args.timeout)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    json.dump(result, f, indent=2, ensure_ascii=False)
+            else:
+                print(result["summary"]["overall_summary"])
+    else:
+        coordinator = DistributedCoordinator(queue)
+        print(json.dumps(dict(coordinator.status(args.job_id), workers=queue.workers()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+import argparse
+import io
+import json
+import math
+import os
+import sys
+import zipfile
+from xml.sax.saxutils import escape
+
+from .segments import format_timestamp
+
+SUMMARY_HEADINGS = (
+    ("overall_summary", "Executive Summary"),
+    ("key_points", "Key Discussion Points"),
+    ("action_items", "Action Items"),
+    ("decisions", "Decisions Made"),
+)
+FOOTER = "Generated by Intelligent Meeting Notes Generator"
+
+
+def _timed(value):
+    return value is not None and not (isinstance(value, float) and math.isnan(value))
+
+
+def _speaker_label(speaker):
+    from .diarization import speaker_name
+
+    return speaker_name(speaker)
+
+
+def _section_items(result, section):
+    """Items of one summary section as stored in the result (nothing is re-split)"""
+    summary = result.get("summary") or {}
+    items = (summary.get("items") or {}).get(section)
+    if items is not None:
+        return items
+    text = summary.get(section) or ""
+    return [{"text": line.strip(), "start": None} for line in text.split("\n") if line.strip()]
+
+
+def _item_line(item):
+    timestamp = format_timestamp(item["start"]) if _timed(item.get("start")) else ""
+    return f"[{timestamp}] {item['text']}" if timestamp else item["text"]
+
+
+def _topic_heading(topic):
+    """'Title (00:01:00 - 00:05:00)', or just the title without timestamps"""
+    if _timed(topic.get("start")) and _timed(topic.get("end")):
+        return f"{topic['title']} ({format_timestamp(topic['start'])} - {format_timestamp(topic['end'])})"
+    return topic["title"]
+
+
+def _topics(result):
+    """Agenda topics of the summary; a single topic adds nothing over the main sections"""
+    topics = (result.get("summary") or {}).get("topics") or []
+    return topics if len(topics) > 1 else []
+
+
+def _title(result):
+    return os.path.splitext(result.get("source") or "Meeting")[0]
+
+
+def iter_json(result):
+    """The full result dict as indented JSON, encoded piece by piece"""
+    yield from json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(result)
+
+
+def iter_transcript_text(result):
+    """Plain transcript; 'Speaker N:' paragraphs when segments carry speakers"""
+    segments = result.get("segments") or []
+    if not any(segment.get("speaker") is not None for segment in segments):
+        yield result.get("transcript") or ""
+        return
+    for i, segment in enumerate(segments):
+        if i and segment.get("speaker") == segments[i - 1].get("speaker"):
+            yield f" {segment['text']}"
+        else:
+            yield f"{chr(10) * 2 if i else ''}{_speaker_label(segment.get('speaker'))}: {segment['text']}"
+
+
+def iter_summary_text(result, generated_on=None):
+    """The plain-text summary download"""
+    generated_on = generated_on or (result.get("created_at") or "").replace("T", " ")
+    yield f"MEETING SUMMARY\nGenerated on: {generated_on}\n\n"
+    yield "EXECUTIVE SUMMARY:\n"
+    yield " ".join(item["text"] for item in _section_items(result, "overall_summary")) + "\n\n"
+    if (result.get("summary") or {}).get("keyphrases"):
+        yield f"KEY PHRASES: {', '.join(result['summary']['keyphrases'])}\n\n"
+
+    yield "KEY DISCUSSION POINTS:\n"
+    points = _section_items(result, "key_points")
+    for i, item in enumerate(points, 1):
+        yield f"{i}. {_item_line(item)}\n"
+    if not points:
+        yield "No key points identified.\n"
+
+    yield "\nACTION ITEMS:\n"
+    actions = _section_items(result, "action_items")
+    for item in actions:
+        yield f"[ ] {_item_line(item)}\n"
+    if not actions:
+        yield "No specific action items identified.\n"
+
+    yield "\nDECISIONS MADE:\n"
+    decisions = _section_items(result, "decisions")
+    for item in decisions:
+        yield f"✓ {_item_line(item)}\n"
+    if not decisions:
+        yield "No specific decisions identified.\n"
+
+    topics = _topics(result)
+    if topics:
+        yield "\nAGENDA:\n"
+    for i, topic in enumerate(topics, 1):
+        yield f"\n{i}. {_topic_heading(topic)}\n"
+        for item in topic.get("summary", []):
+            yield f"   {item['text']}\n"
+        for item in topic.get("action_items", []):
+            yield f"   [ ] {_item_line(item)}\n"
+        for item in topic.get("decisions", []):
+            yield f"   ✓ {_item_line(item)}\n"
+
+    yield f"\n---\n{FOOTER}"
+
+
+def iter_statistics_text(result, generated_on=None):
+    """The plain-text statistics download, from the statistics computed with the result"""
+    stats = result.get("statistics") or {}
+    generated_on = generated_on or (result.get("created_at") or "").replace("T", " ")
+    yield f"MEETING TEXT STATISTICS\nGenerated on: {generated_on}\n\n"
+    yield "BASIC STATISTICS:\n"
+    yield f"• Total Words: {stats.get('total_words', 0)}\n"
+    yield f"• Unique Words: {stats.get('unique_words', 0)}\n"
+    yield f"• Sentences: {stats.get('sentences', 0)}\n"
+    yield f"• Average Sentence Length: {stats.get('avg_sentence_length', 0):.1f} words\n"
+    if stats.get("words_per_minute"):
+        yield f"• Speaking Rate: {stats['words_per_minute']:.0f} words per minute\n"
+
+    yield "\nTOP 10 MOST FREQUENT WORDS:\n"
+    for word, count in stats.get("most_common_words", []):
+        yield f"• {word}: {count} occurrences\n"
+    if stats.get("keyphrases"):
+        yield "\nKEY PHRASES:\n"
+        for phrase, score in stats["keyphrases"]:
+            yield f"• {phrase} (score {score:.1f})\n"
+    if stats.get("top_phrases"):
+        yield "\nTOP PHRASES:\n"
+        for phrase, count in stats["top_phrases"]:
+            yield f"• {phrase}: {count} occurrences\n"
+
+    yield f"\n---\n{FOOTER}"
+
+
+def iter_markdown(result):
+    """Meeting notes as Markdown: summary sections, statistics and the transcript"""
+    audio_info = result.get("audio_info") or {}
+    yield f"# {_title(result)}\n\n"
+    details = [f"**Date:** {(result.get('created_at') or '').replace('T', ' ')}"]
+    if audio_info.get("duration"):
+        details.append(f"**Duration:** {format_timestamp(audio_info['duration'])}")
+    if result.get("transcription_model"):
+        details.append(f"**Models:** {result['transcription_model']}, {result.get('summarization_model')}")
+    if result.get("tags"):
+        details.append(f"**Tags:** {', '.join(result['tags'])}")
+    if (result.get("summary") or {}).get("keyphrases"):
+        details.append(f"**Key phrases:** {', '.join(result['summary']['keyphrases'])}")
+    yield "  \n".join(details) + "\n\n"
+
+    for section, heading in SUMMARY_HEADINGS:
+        items = _section_items(result, section)
+        if not items:
+            continue
+        yield f"## {heading}\n\n"
+        marker = "- [ ] " if section == "action_items" else "- "
+        for item in items:
+            yield f"{marker}{_item_line(item)}\n"
+        yield "\n"
+
+    topics = _topics(result)
+    if topics:
+        yield "## Agenda\n\n"
+    for i, topic in enumerate(topics, 1):
+        yield f"### {i}. {_topic_heading(topic)}\n\n"
+        if topic.get("keywords"):
+            yield f"*{', '.join(topic['keywords'])}*\n\n"
+        if topic.get("summary"):
+            yield " ".join(item["text"] for item in topic["summary"]) + "\n\n"
+        for item in topic.get("action_items", []):
+            yield f"- [ ] {_item_line(item)}\n"
+        for item in topic.get("decisions", []):
+            yield f"- Decision: {_item_line(item)}\n"
+        if topic.get("action_items") or topic.get("decisions"):
+            yield "\n"
+
+    stats = result.get("statistics") or {}
+    if stats:
+        yield "## Statistics\n\n| Metric | Value |\n| --- | --- |\n"
+        yield f"| Words | {stats.get('total_words', 0)} |\n"
+        yield f"| Unique words | {stats.get('unique_words', 0)} |\n"
+        yield f"| Sentences | {stats.get('sentences', 0)} |\n"
+        if stats.get("words_per_minute"):
+            yield f"| Words per minute | {stats['words_per_minute']:.0f} |\n"
+        if stats.get("most_common_words"):
+            yield f"\n**Top words:** {', '.join(word for word, _ in stats['most_common_words'])}\n"
+        yield "\n"
+
+    yield "## Transcript\n\n"
+    segments = result.get("segments") or []
+    if not segments:
+        yield (result.get("transcript") or "") + "\n"
+    for segment in segments:
+        timestamp = format_timestamp(segment["start"]) if _timed(segment.get("start")) else ""
+        speaker = f"**{_speaker_label(segment['speaker'])}:** " if segment.get("speaker") is not None else ""
+        yield f"{f'`{timestamp}` ' if timestamp else ''}{speaker}{segment['text']}\n\n"
+
+
+def _subtitle_time(seconds, separator):
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{milliseconds:03d}"
+
+
+def _timed_segments(result):
+    for segment in result.get("segments") or []:
+        if _timed(segment.get("start")) and _timed(segment.get("end")):
+            yield segment
+
+
+def iter_srt(result):
+    """SubRip subtitles, one cue per timestamped segment"""
+    for number, segment in enumerate(_timed_segments(result), 1):
+        speaker = f"{_speaker_label(segment['speaker'])}: " if segment.get("speaker") is not None else ""
+        yield (f"{number}\n{_subtitle_time(segment['start'], ',')} --> {_subtitle_time(segment['end'], ',')}\n"
+               f"{speaker}{segment['text']}\n\n")
+
+
+def iter_vtt(result):
+    """WebVTT subtitles; speakers become voice tags"""
+    yield "WEBVTT\n\n"
+    for segment in _timed_segments(result):
+        voice = f"<v {_speaker_label(segment['speaker'])}>" if segment.get("speaker") is not None else ""
+        yield (f"{_subtitle_time(segment['start'], '.')} --> {_subtitle_time(segment['end'], '.')}\n"
+               f"{voice}{escape(segment['text'])}\n\n")
+
+
+DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+DOCX_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+DOCX_HEADER = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+               '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>')
+DOCX_FOOTER = '<w:sectPr/></w:body></w:document>'
+# Font sizes in half-points
+DOCX_SIZES = {"title": 36, "heading": 28, "body": 22}
+
+
+def _docx_paragraph(text, style="body", bold=False):
+    run_properties = f'<w:sz w:val="{DOCX_SIZES[style]}"/>'
+    if bold or style != "body":
+        run_properties = "<w:b/>" + run_properties
+    return (f'<w:p><w:r><w:rPr>{run_properties}</w:rPr>'
+            f'<w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>')
+
+
+def iter_docx_document(result):
+    """WordprocessingML body of the DOCX export, paragraph by paragraph"""
+    yield DOCX_HEADER
+    yield _docx_paragraph(_title(result), "title")
+    yield _docx_paragraph(f"Date: {(result.get('created_at') or '').replace('T', ' ')}")
+    for section, heading in SUMMARY_HEADINGS:
+        items = _section_items(result, section)
+        if not items:
+            continue
+        yield _docx_paragraph(heading, "heading")
+        for item in items:
+            yield _docx_paragraph(f"• {_item_line(item)}")
+    yield _docx_paragraph("Transcript", "heading")
+    segments = result.get("segments") or []
+    if not segments:
+        yield _docx_paragraph(result.get("transcript") or "")
+    for segment in segments:
+        timestamp = format_timestamp(segment["start"]) if _timed(segment.get("start")) else ""
+        speaker = f"{_speaker_label(segment['speaker'])}: " if segment.get("speaker") is not None else ""
+        yield _docx_paragraph(f"{f'[{timestamp}] ' if timestamp else ''}{speaker}{segment['text']}")
+    yield DOCX_FOOTER
+
+
+def write_docx(result, file):
+    """Write a minimal DOCX package (no python-docx needed); the body is streamed into the zip"""
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        package.writestr("_rels/.rels", DOCX_RELS)
+        with package.open("word/document.xml", "w") as document:
+            for chunk in iter_docx_document(result):
+                document.write(chunk.encode("utf-8"))
+
+
+class ExportFormat:
+    """One download format: how to name it and how to stream it"""
+
+    def __init__(self, name, label, extension, mime, iter_text=None, write_binary=None):
+        self.name = name
+        self.label = label
+        self.extension = extension
+        self.mime = mime
+        self.iter_text = iter_text
+        self.write_binary = write_binary
+
+    def write(self, result, file):
+        """Stream the export of one result to a binary file object"""
+        if self.write_binary is not None:
+            self.write_binary(result, file)
+            return
+        for chunk in self.iter_text(result):
+            file.write(chunk.encode("utf-8"))
+
+
+EXPORT_FORMATS = {
+    export.name: export for export in (
+        ExportFormat("md", "Markdown notes", ".md", "text/markdown", iter_markdown),
+        ExportFormat("json", "JSON (full result)", ".json", "application/json", iter_json),
+        ExportFormat("srt", "SRT subtitles", ".srt", "application/x-subrip", iter_srt),
+        ExportFormat("vtt", "WebVTT subtitles", ".vtt", "text/vtt", iter_vtt),
+        ExportFormat("docx", "Word document", ".docx",
+                     "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                     write_binary=write_docx),
+        ExportFormat("transcript", "Transcript (text)", "_transcript.txt", "text/plain", iter_transcript_text),
+        ExportFormat("summary", "Summary (text)", "_summary.txt", "text/plain", iter_summary_text),
+        ExportFormat("statistics", "Statistics (text)", "_statistics.txt", "text/plain", iter_statistics_text),
+    )
+}
+
+
+def get_export_format(name):
+    if name not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {name}. Use one of {', '.join(EXPORT_FORMATS)}")
+    return EXPORT_FORMATS[name]
+
+
+def export_filename(result, name):
+    """'<source>_<YYYYmmdd_HHMMSS><extension>'"""
+    stamp = (result.get("created_at") or "").replace("-", "").replace(":", "").replace("T", "_")[:15]
+    return f"{_title(result)}_{stamp}{get_export_format(name).extension}" if stamp else \
+        f"{_title(result)}{get_export_format(name).extension}"
+
+
+def export_bytes(result, name):
+    """Whole export of one result in memory (for download buttons)"""
+    buffer = io.BytesIO()
+    get_export_format(name).write(result, buffer)
+    return buffer.getvalue()
+
+
+def export_zip(results, file, formats=("md", "json", "srt")):
+    """Write every result in every format into one zip, streaming each entry
+
+    ``results`` can be any iterable (e.g. MeetingStore.iter_meetings), so
+    bulk exports never hold more than one meeting in memory. Results with
+    an "error" key (failed batch items) are listed in errors.txt.
+    """
+    exports = [get_export_format(name) for name in formats]
+    names = set()
+    count = 0
+    errors = []
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as archive:
+        for result in results:
+            if result.get("error"):
+                errors.append(f"{result.get('source')}: {result['error']}")
+                continue
+            for export in exports:
+                name = export_filename(result, export.name)
+                if name in names:
+                    name = f"{result.get('meeting_id') or count}_{name}"
+                names.add(name)
+                with archive.open(name, "w") as entry:
+                    export.write(result, entry)
+            count += 1
+        if errors:
+            archive.writestr("errors.txt", "\n".join(errors) + "\n")
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export stored meetings as a zip of notes and subtitles")
+    parser.add_argument("--db", default=None, help="Meeting store database (default: meeting_data/meetings.db)")
+    parser.add_argument("--formats", nargs="+", default=["md", "json", "srt"], choices=list(EXPORT_FORMATS))
+    parser.add_argument("--start", default=None, help="ISO date, inclusive")
+    parser.add_argument("--end", default=None, help="ISO date, exclusive")
+    parser.add_argument("--output", required=True, help="Zip file to write")
+    args = parser.parse_args(argv)
+
+    from .meeting_store import MeetingStore
+
+    store = MeetingStore(args.db)
+    try:
+        count = export_zip(store.iter_meetings(args.start, args.end), args.output, args.formats)
+    finally:
+        store.close()
+    print(f"Exported {count} meeting(s) to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +0,0 @@
-# Utils package initialization
-from .audio_processor import AudioProcessor
-from .transcription import TranscriptGenerator
-from .summarization import SummaryGenerator
-from .visualization import TextVisualizer  # NEW IMPORT
-
-__all__ = [
-    'AudioProcessor',
-    'TranscriptGenerator', 
-    'SummaryGenerator',
-    'TextVisualizer'  # NEW
-]
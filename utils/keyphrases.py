@@ -0,0 +1,187 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+from .disfluency import FILLER_WORDS as SPOKEN_FILLERS
+from .segments import transcript_text
+
+# Words plus every punctuation mark as its own token; punctuation ends a phrase
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|[^\sa-z0-9]")
+_HAS_LETTER = re.compile(r"[a-z]")
+
+# Spoken filler and discourse words that never start or continue a key phrase:
+# the disfluency cleaner's fillers plus conversational words it keeps
+FILLER_WORDS = SPOKEN_FILLERS | frozenset("""
+yep oh really just
+gonna wanna gotta kind sort thing things stuff going get got getting think thought
+know mean also maybe probably lot lots pretty quite still even already
+said say says saying want wanted need needs needed let lets let's one ones
+sure great good fine thanks thank please hello hi hey today tomorrow yesterday
+week weeks last next first bit yet whether could would might around mostly
+everyone someone anyone everybody somebody
+""".split())
+
+# Words every meeting uses, which never say what one was about
+MEETING_WORDS = frozenset({"no", "meeting", "discuss", "discussion", "team", "project"})
+
+_meeting_stop_words = None
+
+
+def meeting_stop_words():
+    """English stop words plus FILLER_WORDS and MEETING_WORDS, built once per process
+
+    Topic keywords and titles leave these out, like the word cloud does.
+    """
+    global _meeting_stop_words
+    if _meeting_stop_words is None:
+        from .nltk_resources import english_stopwords
+
+        _meeting_stop_words = english_stopwords() | FILLER_WORDS | MEETING_WORDS
+    return _meeting_stop_words
+
+
+class KeyphraseExtractor:
+    """RAKE-style key phrases scored from word co-occurrence in one pass over the tokens
+
+    The transcript is tokenized once; stop words, filler words and
+    punctuation split it into candidate phrases of up to ``max_words``
+    content words. Each word scores degree / frequency (how many words it
+    appears in phrases with, relative to how often it appears), which
+    favours words that belong to longer phrases over generic ones. A phrase
+    scores the sum of its word scores times ``log(1 + occurrences)``, so a
+    phrase said many times beats a one-off. Everything after tokenizing is
+    NumPy over integer ids: phrases are packed into one int64 code each and
+    counted with one sort.
+
+    Results are cached per transcript hash (``cache_size`` transcripts),
+    so the summary, statistics, word cloud and search index of one meeting
+    share a single extraction.
+    """
+
+    def __init__(self, stop_words=None, max_words=3, min_word_length=3, min_count=2, max_phrases=500,
+                 cache_size=32):
+        if max_words < 1:
+            raise ValueError("max_words must be at least 1")
+        if stop_words is None:
+            from .nltk_resources import english_stopwords
+
+            stop_words = english_stopwords() | FILLER_WORDS
+        self.stop_words = stop_words
+        self.max_words = max_words
+        self.min_word_length = min_word_length
+        self.min_count = min_count
+        self.max_phrases = max_phrases
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def transcript_hash(text):
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def extract(self, transcript, n=10):
+        """Top ``n`` key phrases of a transcript (text or SegmentStore) as [(phrase, score)]"""
+        text = transcript_text(transcript)
+        key = self.transcript_hash(text)
+        with self._lock:
+            ranked = self._cache.get(key)
+            if ranked is not None:
+                self._cache.move_to_end(key)
+        if ranked is None:
+            ranked = self._rank(text)
+            with self._lock:
+                self._cache[key] = ranked
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return ranked[:n]
+
+    def frequencies(self, transcript, n=100):
+        """{phrase: score} of the top ``n`` phrases, the input a word cloud expects"""
+        return dict(self.extract(transcript, n))
+
+    def _is_content(self, word):
+        return len(word) >= self.min_word_length and word not in self.stop_words and bool(_HAS_LETTER.search(word))
+
+    def _rank(self, text):
+        """The ``max_phrases`` best phrases that occur at least ``min_count`` times"""
+        tokens = _TOKEN.findall(text.lower())
+        if not tokens:
+            return []
+        vocabulary = defaultdict()
+        vocabulary.default_factory = vocabulary.__len__
+        ids = np.fromiter(map(vocabulary.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        words = list(vocabulary)
+        content = np.fromiter(map(self._is_content, words), dtype=bool, count=len(words))[ids]
+        if not content.any():
+            return []
+
+        # Runs of consecutive content tokens are the candidate phrases
+        starts = np.flatnonzero(content & ~np.concatenate(([False], content[:-1])))
+        ends = np.flatnonzero(content & ~np.concatenate((content[1:], [False]))) + 1
+        lengths = ends - starts
+        keep = lengths <= self.max_words
+        starts, lengths = starts[keep], lengths[keep]
+        if not len(starts):
+            return []
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(starts, lengths) + within
+        phrase_of_token = np.repeat(np.arange(len(starts)), lengths)
+        token_ids = ids[positions]
+
+        # Word score: degree (total length of the phrases it is in) over frequency
+        frequency = np.bincount(token_ids, minlength=len(words))
+        degree = np.bincount(token_ids, weights=lengths[phrase_of_token], minlength=len(words))
+        word_scores = np.divide(degree, frequency, out=np.zeros(len(words)), where=frequency > 0)
+        phrase_scores = np.bincount(phrase_of_token, weights=word_scores[token_ids], minlength=len(starts))
+
+        # Pack each phrase's ids (shifted by one so 0 pads short phrases) into one code
+        base = len(words) + 1
+        if base ** self.max_words >= 2 ** 63:
+            raise ValueError(f"Vocabulary too large to pack {self.max_words}-word phrases")
+        codes = np.zeros(len(starts), dtype=np.int64)
+        for offset in range(self.max_words):
+            present = lengths > offset
+            digit = np.where(present, ids[np.minimum(starts + offset, len(ids) - 1)] + 1, 0)
+            codes = codes * base + digit
+        # Equal codes are equal phrases with equal scores, so the first of each run is enough
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        first = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+        unique = codes[first]
+        counts = np.diff(np.append(first, len(codes)))
+        scores = phrase_scores[order][first] * np.log1p(counts)
+
+        frequent = counts >= min(self.min_count, counts.max())
+        unique, counts, scores = unique[frequent], counts[frequent], scores[frequent]
+        order = np.lexsort((unique, -counts, -scores))[:self.max_phrases]
+        return [(self._decode(int(unique[i]), base, words), round(float(scores[i]), 3)) for i in order]
+
+    def _decode(self, code, base, words):
+        parts = []
+        for _ in range(self.max_words):
+            code, digit = divmod(code, base)
+            if digit:
+                parts.append(words[digit - 1])
+        return " ".join(reversed(parts))
+
+
+_default_extractor = None
+_default_lock = threading.Lock()
+
+
+def default_extractor():
+    """Process-wide extractor, so every caller shares one cache"""
+    global _default_extractor
+    if _default_extractor is None:
+        with _default_lock:
+            if _default_extractor is None:
+                _default_extractor = KeyphraseExtractor()
+    return _default_extractor
+
+
+def extract_keyphrases(transcript, n=10):
+    """Top ``n`` (phrase, score) pairs from the shared extractor"""
+    return default_extractor().extract(transcript, n)
@@ -0,0 +1,441 @@
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+import threading
+
+from .paths import get_data_path
+from .segments import SegmentStore
+
+SUMMARY_SECTIONS = ("overall_summary", "action_items", "decisions", "key_points")
+TOPIC_SECTIONS = ("summary", "key_points", "action_items", "decisions")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    duration REAL,
+    sample_rate INTEGER,
+    channels INTEGER,
+    samples INTEGER,
+    transcription_model TEXT,
+    summarization_model TEXT,
+    timings TEXT,
+    tags TEXT,
+    model_selection TEXT,
+    decode_options TEXT,
+    postprocessing TEXT,
+    keyphrase_scores TEXT
+);
+CREATE INDEX IF NOT EXISTS meetings_created_at ON meetings(created_at);
+CREATE TABLE IF NOT EXISTS segments (
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    start REAL,
+    end REAL,
+    speaker INTEGER,
+    confidence REAL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (meeting_id, idx)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS summary_items (
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    start REAL,
+    end REAL,
+    speaker INTEGER,
+    PRIMARY KEY (meeting_id, section, ordinal)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS topics (
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    keywords TEXT,
+    start REAL,
+    end REAL,
+    text_start INTEGER,
+    text_end INTEGER,
+    items TEXT,
+    PRIMARY KEY (meeting_id, idx)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS keyphrases (
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    phrase TEXT NOT NULL,
+    PRIMARY KEY (meeting_id, rank)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS statistics (
+    meeting_id INTEGER PRIMARY KEY REFERENCES meetings(id) ON DELETE CASCADE,
+    total_words INTEGER,
+    unique_words INTEGER,
+    sentences INTEGER,
+    avg_sentence_length REAL,
+    words_per_minute REAL,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS top_words (
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (meeting_id, rank)
+) WITHOUT ROWID;
+"""
+
+STATISTICS_COLUMNS = ("total_words", "unique_words", "sentences", "avg_sentence_length", "words_per_minute")
+
+# JSON columns added to meetings after the first release, with the value used for older rows
+JSON_COLUMNS = {
+    "tags": [],
+    "model_selection": None,
+    "decode_options": None,
+    "postprocessing": None,
+    "keyphrase_scores": [],
+}
+
+# Empty-section messages produced by SummaryGenerator, restored on load
+EMPTY_SECTION_TEXT = {
+    "overall_summary": "",
+    "action_items": "No specific action items identified.",
+    "decisions": "No specific decisions identified.",
+    "key_points": "",
+}
+
+
+class MeetingStore:
+    """Persistent store of processed meetings in normalized SQLite tables
+
+    One row per meeting (audio metadata, models, timings) plus child tables
+    for segments, summary items, topics, key phrases, statistics and top words. Segments and items
+    are WITHOUT ROWID tables clustered by meeting, so a meeting loads with a
+    single range scan and appends stay cheap. ``created_at`` is an ISO
+    timestamp with an index, which makes date-range queries and bulk exports
+    index range scans. Tags, model selection, decode options, post-processing
+    and the summary's keyphrase scores are JSON columns of the meeting row,
+    and statistics without a column of their own (top phrases, keywords...)
+    go to the JSON ``extra`` column. "related" meetings are not stored, since
+    they change as meetings are added.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_data_path("meetings.db")
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+        self._add_missing_columns()
+
+    def _add_missing_columns(self):
+        """Upgrade tables created before the JSON columns existed"""
+        with self.connection:
+            for table, added in (("meetings", JSON_COLUMNS), ("statistics", ("extra",))):
+                columns = {row["name"] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+                for column in added:
+                    if column not in columns:
+                        self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+
+    def close(self):
+        self.connection.close()
+
+    def save(self, result):
+        """Store a pipeline result dict (see utils.pipeline.build_result); returns the meeting id"""
+        audio_info = result.get("audio_info") or {}
+        statistics = result.get("statistics") or {}
+        summary = result.get("summary") or {}
+        items = summary.get("items", {})
+
+        with self._lock, self.connection:
+            cursor = self.connection.execute("""
+                INSERT INTO meetings (source, created_at, duration, sample_rate, channels, samples,
+                                      transcription_model, summarization_model, timings, tags,
+                                      model_selection, decode_options, postprocessing, keyphrase_scores)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                result.get("source") or "Untitled meeting",
+                result.get("created_at"),
+                audio_info.get("duration"),
+                audio_info.get("sample_rate"),
+                audio_info.get("channels"),
+                audio_info.get("samples"),
+                result.get("transcription_model"),
+                result.get("summarization_model"),
+                json.dumps(result.get("timings") or {}),
+                json.dumps(list(result.get("tags") or [])),
+                json.dumps(result.get("model_selection")),
+                json.dumps(result.get("decode_options")),
+                json.dumps(result.get("postprocessing")),
+                json.dumps(summary.get("keyphrase_scores") or []),
+            ))
+            meeting_id = cursor.lastrowid
+
+            self.connection.executemany(
+                "INSERT INTO segments (meeting_id, idx, start, end, speaker, confidence, text) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((meeting_id, i, segment.get("start"), segment.get("end"), segment.get("speaker"),
+                  segment.get("confidence"), segment["text"])
+                 for i, segment in enumerate(result.get("segments", [])))
+            )
+
+            rows = []
+            for section in SUMMARY_SECTIONS:
+                for ordinal, item in enumerate(items.get(section, [])):
+                    rows.append((meeting_id, section, ordinal, item["text"], item.get("start"),
+                                 item.get("end"), item.get("speaker")))
+            if not items.get("overall_summary") and summary.get("overall_summary"):
+                rows.append((meeting_id, "overall_summary", 0, summary["overall_summary"],
+                             None, None, None))
+            self.connection.executemany(
+                "INSERT INTO summary_items (meeting_id, section, ordinal, text, start, end, speaker) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+            self.connection.executemany(
+                "INSERT INTO topics (meeting_id, idx, title, keywords, start, end, text_start, text_end, items) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((meeting_id, idx, topic["title"], json.dumps(topic.get("keywords", [])), topic.get("start"),
+                  topic.get("end"), topic.get("text_start"), topic.get("text_end"),
+                  json.dumps({section: topic.get(section, []) for section in TOPIC_SECTIONS}))
+                 for idx, topic in enumerate(summary.get("topics", [])))
+            )
+
+            self.connection.executemany(
+                "INSERT INTO keyphrases (meeting_id, rank, phrase) VALUES (?, ?, ?)",
+                ((meeting_id, rank, phrase) for rank, phrase in enumerate(summary.get("keyphrases", [])))
+            )
+
+            if statistics:
+                self.connection.execute(
+                    "INSERT INTO statistics (meeting_id, total_words, unique_words, sentences, "
+                    "avg_sentence_length, words_per_minute, extra) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (meeting_id, *(statistics.get(column) for column in STATISTICS_COLUMNS),
+                     json.dumps({key: value for key, value in statistics.items()
+                                 if key not in STATISTICS_COLUMNS and key != "most_common_words"}))
+                )
+                self.connection.executemany(
+                    "INSERT INTO top_words (meeting_id, rank, word, count) VALUES (?, ?, ?, ?)",
+                    ((meeting_id, rank, word, count)
+                     for rank, (word, count) in enumerate(statistics.get("most_common_words", [])))
+                )
+
+        return meeting_id
+
+    def delete(self, meeting_id):
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+
+    def _date_filter(self, start=None, end=None, column="created_at"):
+        """SQL condition for created_at in [start, end); dates or ISO strings"""
+        conditions, params = [], []
+        if start is not None:
+            conditions.append(f"{column} >= ?")
+            params.append(start.isoformat() if hasattr(start, "isoformat") else start)
+        if end is not None:
+            conditions.append(f"{column} < ?")
+            params.append(end.isoformat() if hasattr(end, "isoformat") else end)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def list_meetings(self, start=None, end=None, limit=None, offset=0):
+        """Meeting metadata (no segments) created in [start, end), newest first"""
+        where, params = self._date_filter(start, end, column="m.created_at")
+        sql = f"""
+            SELECT m.*, s.total_words, s.unique_words, s.sentences, s.words_per_minute
+            FROM meetings m LEFT JOIN statistics s ON s.meeting_id = m.id
+            {where}
+            ORDER BY m.created_at DESC
+        """
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        with self._lock:
+            return [self._meeting_row(row) for row in self.connection.execute(sql, params)]
+
+    @staticmethod
+    def _meeting_row(row):
+        meeting = dict(row)
+        meeting["timings"] = json.loads(meeting["timings"] or "{}")
+        for column, default in JSON_COLUMNS.items():
+            meeting[column] = json.loads(meeting[column]) if meeting[column] else default
+        return meeting
+
+    def count(self, start=None, end=None):
+        where, params = self._date_filter(start, end)
+        with self._lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM meetings {where}", params).fetchone()[0]
+
+    def load_segments(self, meeting_id):
+        """Segments of one meeting as a SegmentStore"""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT start, end, speaker, confidence, text FROM segments "
+                "WHERE meeting_id = ? ORDER BY idx", (meeting_id,)
+            ).fetchall()
+        return SegmentStore.from_dicts([dict(row) for row in rows])
+
+    def get(self, meeting_id):
+        """Rebuild the full result dict of a stored meeting, or None"""
+        with self._lock:
+            row = self.connection.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+            if row is None:
+                return None
+            return self._load_result(row)
+
+    def _load_result(self, row):
+        meeting_id = row["id"]
+        segments = [dict(r) for r in self.connection.execute(
+            "SELECT start, end, speaker, confidence, text FROM segments WHERE meeting_id = ? ORDER BY idx",
+            (meeting_id,)
+        )]
+
+        items = {section: [] for section in SUMMARY_SECTIONS}
+        for item in self.connection.execute(
+                "SELECT section, text, start, end, speaker FROM summary_items "
+                "WHERE meeting_id = ? ORDER BY section, ordinal", (meeting_id,)):
+            items[item["section"]].append({
+                "text": item["text"], "start": item["start"], "end": item["end"], "speaker": item["speaker"]
+            })
+        summary = {"overall_summary": " ".join(item["text"] for item in items["overall_summary"])}
+        for section in ("action_items", "decisions", "key_points"):
+            summary[section] = "\n".join(item["text"] for item in items[section]) or EMPTY_SECTION_TEXT[section]
+        summary["items"] = items
+        summary["topics"] = [
+            dict(title=topic["title"], keywords=json.loads(topic["keywords"] or "[]"), start=topic["start"],
+                 end=topic["end"], text_start=topic["text_start"], text_end=topic["text_end"],
+                 **json.loads(topic["items"] or "{}"))
+            for topic in self.connection.execute(
+                "SELECT * FROM topics WHERE meeting_id = ? ORDER BY idx", (meeting_id,)
+            )
+        ]
+        summary["keyphrases"] = [row["phrase"] for row in self.connection.execute(
+            "SELECT phrase FROM keyphrases WHERE meeting_id = ? ORDER BY rank", (meeting_id,)
+        )]
+        meeting = self._meeting_row(row)
+        summary["keyphrase_scores"] = meeting["keyphrase_scores"]
+
+        statistics = self.connection.execute(
+            f"SELECT {', '.join(STATISTICS_COLUMNS)}, extra FROM statistics WHERE meeting_id = ?", (meeting_id,)
+        ).fetchone()
+        statistics = dict(statistics or {})
+        extra = json.loads(statistics.pop("extra", None) or "{}")
+        statistics = dict({key: value for key, value in statistics.items() if value is not None}, **extra)
+        statistics["most_common_words"] = [
+            (word["word"], word["count"]) for word in self.connection.execute(
+                "SELECT word, count FROM top_words WHERE meeting_id = ? ORDER BY rank", (meeting_id,)
+            )
+        ]
+
+        store = SegmentStore.from_dicts(segments)
+        return {
+            "meeting_id": meeting_id,
+            "source": row["source"],
+            "created_at": row["created_at"],
+            "transcription_model": row["transcription_model"],
+            "summarization_model": row["summarization_model"],
+            "audio_info": {
+                "duration": row["duration"],
+                "sample_rate": row["sample_rate"],
+                "channels": row["channels"],
+                "samples": row["samples"],
+            },
+            "transcript": store.text,
+            "segments": store.to_dicts(),
+            "summary": summary,
+            "statistics": statistics,
+            "timings": meeting["timings"],
+            "tags": meeting["tags"],
+            "model_selection": meeting["model_selection"],
+            "decode_options": meeting["decode_options"],
+            "postprocessing": meeting["postprocessing"],
+        }
+
+    def iter_meetings(self, start=None, end=None, batch_size=100):
+        """Yield full result dicts in [start, end), oldest first, a batch of rows at a time"""
+        where, params = self._date_filter(start, end)
+        last_created, last_id = "", 0
+        while True:
+            keyset = "(created_at, id) > (?, ?)"
+            condition = f"{where} AND {keyset}" if where else f"WHERE {keyset}"
+            with self._lock:
+                rows = self.connection.execute(
+                    f"SELECT * FROM meetings {condition} ORDER BY created_at, id LIMIT ?",
+                    params + [last_created, last_id, batch_size]
+                ).fetchall()
+                results = [self._load_result(row) for row in rows]
+            if not rows:
+                return
+            yield from results
+            last_created, last_id = rows[-1]["created_at"], rows[-1]["id"]
+
+    def export_jsonl(self, file, start=None, end=None):
+        """Stream every meeting in the range to a text file object as JSON lines; returns the count"""
+        count = 0
+        for result in self.iter_meetings(start, end):
+            file.write(json.dumps(result, ensure_ascii=False))
+            file.write("\n")
+            count += 1
+        return count
+
+    def export_csv(self, file, start=None, end=None):
+        """Write one CSV row of metadata and statistics per meeting; returns the count"""
+        meetings = self.list_meetings(start, end)
+        columns = ["id", "source", "created_at", "duration", "transcription_model",
+                   "summarization_model", "total_words", "unique_words", "sentences",
+                   "words_per_minute"]
+        writer = csv.DictWriter(file, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for meeting in reversed(meetings):
+            writer.writerow(meeting)
+        return len(meetings)
+
+    def period_totals(self, start=None, end=None, period="day"):
+        """Meetings, audio minutes, words and action items per day/week/month, from stored rows only"""
+        formats = {"day": "%Y-%m-%d", "week": "%Y-W%W", "month": "%Y-%m"}
+        if period not in formats:
+            raise ValueError(f"Unknown period: {period}")
+        where, params = self._date_filter(start, end, column="m.created_at")
+        sql = f"""
+            SELECT strftime('{formats[period]}', m.created_at) AS period,
+                   COUNT(*) AS meetings,
+                   COALESCE(SUM(m.duration), 0) / 60.0 AS audio_minutes,
+                   COALESCE(SUM(s.total_words), 0) AS words,
+                   COALESCE(SUM((SELECT COUNT(*) FROM summary_items i
+                                 WHERE i.meeting_id = m.id AND i.section = 'action_items')), 0) AS action_items
+            FROM meetings m LEFT JOIN statistics s ON s.meeting_id = m.id
+            {where}
+            GROUP BY period ORDER BY period
+        """
+        with self._lock:
+            return [dict(row) for row in self.connection.execute(sql, params)]
+
+
+def main():
+    """Bulk export: python -m utils.meeting_store --format jsonl --start 2026-01-01 > meetings.jsonl"""
+    parser = argparse.ArgumentParser(description="Export stored meetings")
+    parser.add_argument("--db", default=None, help="Path to meetings.db (default: data directory)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--start", default=None, help="Include meetings created on or after this ISO date")
+    parser.add_argument("--end", default=None, help="Include meetings created before this ISO date")
+    parser.add_argument("--output", default=None, help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    store = MeetingStore(args.db)
+    output = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        export = store.export_jsonl if args.format == "jsonl" else store.export_csv
+        count = export(output, start=args.start, end=args.end)
+    finally:
+        if args.output:
+            output.close()
+        store.close()
+    print(f"✅ Exported {count} meetings", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
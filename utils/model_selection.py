@@ -0,0 +1,97 @@
+import os
+
+AUTO_MODEL = "auto"
+
+# Whisper sizes accepted by TranscriptGenerator, smallest first
+WHISPER_SIZES = ("tiny", "base", "small")
+MODEL_NAMES = {size: f"openai/whisper-{size}" for size in WHISPER_SIZES}
+
+# Seconds of compute per second of audio on one CPU core with FP32 (rough
+# figures for openai-whisper on a laptop-class CPU; override per deployment)
+DEFAULT_REALTIME_FACTORS = {"tiny": 0.35, "base": 0.8, "small": 2.6}
+
+
+def whisper_size(model_name):
+    """'openai/whisper-base' or 'base' -> 'base'; raises ValueError for anything else"""
+    size = model_name.rsplit("whisper-", 1)[-1] if model_name else model_name
+    if size not in WHISPER_SIZES:
+        raise ValueError(f"Unknown Whisper model: {model_name!r}. "
+                         f"Use one of {', '.join(MODEL_NAMES.values())} or '{AUTO_MODEL}'")
+    return size
+
+
+def available_cpus():
+    """CPU cores not busy with other work, from the 1-minute load average where available"""
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        busy = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        busy = 0.0
+    return max(1.0, cores - busy)
+
+
+class ModelChoice:
+    """Outcome of automatic model selection, with the reasoning behind it"""
+
+    def __init__(self, model, estimated_seconds, reason, estimates):
+        self.model = model
+        self.estimated_seconds = estimated_seconds
+        self.reason = reason
+        self.estimates = estimates
+
+    @property
+    def size(self):
+        return whisper_size(self.model)
+
+    def to_dict(self):
+        return {
+            "model": self.model,
+            "estimated_seconds": round(self.estimated_seconds, 1),
+            "reason": self.reason,
+            "estimates": {size: round(seconds, 1) for size, seconds in self.estimates.items()},
+        }
+
+
+class ModelSelector:
+    """Picks the largest Whisper model expected to finish within a latency SLO
+
+    Expected latency = time waiting for the jobs ahead in the queue plus this
+    job's own transcription, both estimated from the audio duration, the
+    model's real-time factor and the CPU cores a job can use. Jobs ahead are
+    assumed to be as long as this one. When even tiny misses the SLO, tiny is
+    used anyway since it is the fastest option.
+    """
+
+    def __init__(self, latency_slo=120.0, realtime_factors=None, max_threads=8):
+        self.latency_slo = latency_slo
+        self.realtime_factors = dict(DEFAULT_REALTIME_FACTORS, **(realtime_factors or {}))
+        self.max_threads = max_threads
+
+    def estimate(self, size, duration, queue_depth=0, cpus=None, workers=1):
+        """Expected seconds from submission to transcript for one model size"""
+        cpus = available_cpus() if cpus is None else cpus
+        # Torch parallelism flattens out well before the core count on CPU
+        threads = max(1.0, min(cpus / max(workers, 1), self.max_threads))
+        own = duration * self.realtime_factors[size] / threads ** 0.75
+        waiting = queue_depth * own / max(workers, 1)
+        return waiting + own
+
+    def choose(self, duration, queue_depth=0, cpus=None, workers=1):
+        cpus = available_cpus() if cpus is None else cpus
+        estimates = {size: self.estimate(size, duration, queue_depth, cpus, workers)
+                     for size in WHISPER_SIZES}
+        fitting = [size for size in WHISPER_SIZES if estimates[size] <= self.latency_slo]
+        size = fitting[-1] if fitting else WHISPER_SIZES[0]
+
+        context = (f"{duration:.0f}s audio, {queue_depth} job(s) ahead, "
+                   f"{cpus:.1f} CPU(s) free, SLO {self.latency_slo:.0f}s")
+        if not fitting:
+            reason = f"no model meets the SLO ({context}); using the fastest"
+        elif size == WHISPER_SIZES[-1]:
+            reason = f"largest model fits ({context})"
+        else:
+            larger = WHISPER_SIZES[WHISPER_SIZES.index(size) + 1]
+            reason = f"{larger} would take ~{estimates[larger]:.0f}s ({context})"
+        choice = ModelChoice(MODEL_NAMES[size], estimates[size], reason, estimates)
+        print(f"🤖 Auto model selection: {choice.model} (~{choice.estimated_seconds:.0f}s) - {reason}")
+        return choice
@@ -0,0 +1,286 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import zlib
+
+import numpy as np
+
+from .paths import get_data_path
+from .segments import SegmentStore, as_segment_store
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+# Mersenne prime for the universal hash family (a * x + b) mod p
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+# Shingles hashed per block when computing a signature, bounding the (perms x block) matrix
+SIGNATURE_BLOCK = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting_id INTEGER PRIMARY KEY,
+    source TEXT,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    text TEXT,
+    signature BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS signatures_meeting ON signatures(meeting_id);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    kind TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    signature_id INTEGER NOT NULL REFERENCES signatures(id) ON DELETE CASCADE,
+    PRIMARY KEY (kind, band, bucket, signature_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS lsh_buckets_signature ON lsh_buckets(signature_id);
+-- result_cache was keyed by the summarization model alone; summary_cache replaces it
+DROP TABLE IF EXISTS result_cache;
+CREATE TABLE IF NOT EXISTS summary_cache (
+    digest TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+    summary TEXT NOT NULL,
+    statistics TEXT NOT NULL,
+    PRIMARY KEY (digest, settings)
+) WITHOUT ROWID;
+"""
+
+
+def shingles(text, size):
+    """Set of ``size``-word shingles of normalized text; short texts give one shingle"""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def settings_key(settings):
+    """Canonical JSON of a settings dict, so equal settings give equal cache keys"""
+    return json.dumps(settings, sort_keys=True, default=str)
+
+
+def transcript_digest(segments):
+    """Hash of the transcript text and speaker labels; equal digests give equal summaries"""
+    segments = as_segment_store(segments)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(segments.text.encode("utf-8"))
+    digest.update(segments.speakers.tobytes())
+    return digest.hexdigest()
+
+
+class MinHasher:
+    """MinHash signatures: ``num_perm`` minimum hash values per shingle set
+
+    The fraction of equal positions in two signatures estimates the Jaccard
+    similarity of the shingle sets. Shingles are hashed with CRC32 (stable
+    across processes, unlike ``hash``) and permuted with a seeded universal
+    hash family, all in NumPy.
+    """
+
+    def __init__(self, num_perm=128, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set):
+        signature = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingle_set), dtype=np.uint64,
+                             count=len(shingle_set))
+        # a, b and hashes are below 2**32, so a * h + b cannot overflow uint64
+        for start in range(0, len(hashes), SIGNATURE_BLOCK):
+            block = hashes[start:start + SIGNATURE_BLOCK]
+            permuted = (self.a[:, None] * block[None, :] + self.b[:, None]) % MERSENNE_PRIME
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+        return signature
+
+    @staticmethod
+    def similarity(first, second):
+        return float(np.mean(first == second))
+
+
+class DuplicateIndex:
+    """MinHash/LSH index of meetings and action items across stored meetings
+
+    Each transcript (3-word shingles) and each action item (2-word
+    shingles) gets a 128-value MinHash signature, split into 32 bands of 4
+    rows. A band's hash is a bucket key in an indexed SQLite table, so a
+    lookup is 32 index seeks no matter how many meetings are stored, and
+    only items sharing a bucket are compared (at most ``max_candidates``,
+    so an action item repeated in thousands of meetings stays cheap). With
+    32x4 bands, pairs above ~0.6 Jaccard are found with >98% probability;
+    candidates are then filtered by their estimated similarity.
+
+    Summaries and statistics are also cached by transcript digest, so a
+    meeting whose transcript is unchanged reuses them instead of running
+    the summarizer again.
+    """
+
+    TRANSCRIPT_SHINGLE = 3
+    ITEM_SHINGLE = 2
+
+    def __init__(self, db_path=None, num_perm=128, bands=32, meeting_threshold=0.4, item_threshold=0.6,
+                 max_candidates=500):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.db_path = db_path or get_data_path("near_duplicates.db")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.meeting_threshold = meeting_threshold
+        self.item_threshold = item_threshold
+        self.max_candidates = max_candidates
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _buckets(self, signature):
+        """One signed 64-bit key per band"""
+        return [
+            int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "little", signed=True)
+            for band in signature.reshape(self.bands, self.rows)
+        ]
+
+    def _signature(self, text, kind):
+        size = self.TRANSCRIPT_SHINGLE if kind == "transcript" else self.ITEM_SHINGLE
+        return self.hasher.signature(shingles(text, size))
+
+    def add_meeting(self, result, meeting_id=None, summary_settings=None):
+        """Index a pipeline result dict (see utils.pipeline.build_result); returns the meeting id
+
+        With ``summary_settings`` (see MeetingPipeline.summary_settings) the
+        summary and statistics are cached for cached_results under them.
+        """
+        if result.get("segments"):
+            segments = SegmentStore.from_dicts(result["segments"])
+        else:
+            segments = as_segment_store(result.get("transcript") or "")
+        items = ((result.get("summary") or {}).get("items") or {}).get("action_items", [])
+        entries = [("transcript", None, self._signature(segments.text, "transcript"))]
+        entries += [("action_item", item["text"], self._signature(item["text"], "action_item"))
+                    for item in items]
+
+        with self._lock, self.connection:
+            if meeting_id is not None:
+                self.connection.execute("DELETE FROM meetings WHERE meeting_id = ?", (meeting_id,))
+            cursor = self.connection.execute(
+                "INSERT INTO meetings (meeting_id, source, created_at) VALUES (?, ?, ?)",
+                (meeting_id, result.get("source"), result.get("created_at"))
+            )
+            meeting_id = cursor.lastrowid
+            for kind, text, signature in entries:
+                cursor = self.connection.execute(
+                    "INSERT INTO signatures (meeting_id, kind, text, signature) VALUES (?, ?, ?, ?)",
+                    (meeting_id, kind, text, signature.tobytes())
+                )
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO lsh_buckets (kind, band, bucket, signature_id) VALUES (?, ?, ?, ?)",
+                    ((kind, band, bucket, cursor.lastrowid) for band, bucket in enumerate(self._buckets(signature)))
+                )
+            if result.get("summary") and summary_settings is not None:
+                statistics = {key: value for key, value in (result.get("statistics") or {}).items()
+                              if key not in ("duration_minutes", "words_per_minute")}
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO summary_cache (digest, settings, meeting_id, summary, statistics) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (transcript_digest(segments), settings_key(summary_settings), meeting_id,
+                     json.dumps(result["summary"]), json.dumps(statistics))
+                )
+        return meeting_id
+
+    def delete_meeting(self, meeting_id):
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM meetings WHERE meeting_id = ?", (meeting_id,))
+
+    def _query(self, text, kind, threshold, limit, exclude=None):
+        signature = self._signature(text, kind)
+        with self._lock:
+            candidates = set()
+            for band, bucket in enumerate(self._buckets(signature)):
+                if len(candidates) >= self.max_candidates:
+                    break
+                # Newest signatures first (ids grow with insertion)
+                candidates.update(row[0] for row in self.connection.execute(
+                    "SELECT signature_id FROM lsh_buckets WHERE kind = ? AND band = ? AND bucket = ? "
+                    "ORDER BY signature_id DESC LIMIT ?",
+                    (kind, band, bucket, self.max_candidates - len(candidates))
+                ))
+            if not candidates:
+                return []
+            rows = self.connection.execute(
+                f"SELECT s.meeting_id, s.text, s.signature, m.source, m.created_at "
+                f"FROM signatures s JOIN meetings m ON m.meeting_id = s.meeting_id "
+                f"WHERE s.id IN ({','.join('?' * len(candidates))})", list(candidates)
+            ).fetchall()
+
+        matches = []
+        for row in rows:
+            if exclude is not None and row["meeting_id"] == exclude:
+                continue
+            similarity = MinHasher.similarity(signature, np.frombuffer(row["signature"], dtype=np.uint64))
+            if similarity >= threshold:
+                matches.append({
+                    "meeting_id": row["meeting_id"],
+                    "source": row["source"],
+                    "created_at": row["created_at"],
+                    "text": row["text"],
+                    "similarity": round(similarity, 3),
+                })
+        # Most similar first; among equals the most recent meeting
+        matches.sort(key=lambda match: match["created_at"] or "", reverse=True)
+        matches.sort(key=lambda match: -match["similarity"])
+        return matches[:limit]
+
+    def similar_meetings(self, transcript, limit=5, threshold=None, exclude=None):
+        """Stored meetings whose transcripts are near-duplicates of this one, most similar first"""
+        matches = self._query(as_segment_store(transcript).text, "transcript",
+                              self.meeting_threshold if threshold is None else threshold, limit, exclude)
+        for match in matches:
+            del match["text"]
+        return matches
+
+    def recurring_action_items(self, items, limit=3, threshold=None, exclude=None):
+        """[{"text", "matches": [...]}] for the action items seen in earlier meetings"""
+        recurring = []
+        for item in items:
+            text = item["text"] if isinstance(item, dict) else item
+            matches = self._query(text, "action_item", self.item_threshold if threshold is None else threshold,
+                                  limit, exclude)
+            if matches:
+                recurring.append({"text": text, "matches": matches})
+        return recurring
+
+    def related(self, segments, summary=None, exclude=None):
+        """Similar meetings and recurring action items for a new meeting"""
+        items = ((summary or {}).get("items") or {}).get("action_items", [])
+        return {
+            "similar_meetings": self.similar_meetings(segments, exclude=exclude),
+            "recurring_action_items": self.recurring_action_items(items, exclude=exclude),
+        }
+
+    def cached_results(self, segments, summary_settings):
+        """(summary, statistics) computed earlier for the same transcript and settings, or None"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT summary, statistics FROM summary_cache WHERE digest = ? AND settings = ?",
+                (transcript_digest(segments), settings_key(summary_settings))
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row["summary"]), json.loads(row["statistics"])
+
+    def meeting_count(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
@@ -0,0 +1,180 @@
+import argparse
+import os
+import re
+import threading
+
+# Bundled NLTK data: set MEETING_NOTES_NLTK_DATA, or ship a ``nltk_data``
+# directory next to app.py (see ``python -m utils.nltk_resources --help``).
+NLTK_DATA_ENV = "MEETING_NOTES_NLTK_DATA"
+DEFAULT_NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "nltk_data")
+
+# Download names written by the bundling step. NLTK < 3.8.2 reads the
+# pickled "punkt" models, newer releases read "punkt_tab"; both are bundled.
+BUNDLED_PACKAGES = ("punkt", "punkt_tab", "stopwords")
+
+# NLTK's English stopword list, used when the corpus is not bundled
+ENGLISH_STOPWORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours
+yourself yourselves he him his himself she she's her hers herself it it's its
+itself they them their theirs themselves what which who whom this that that'll
+these those am is are was were be been being have has had having do does did
+doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down
+in out on off over under again further then once here there when where why how
+all any both each few more most other some such no nor not only own same so
+than too very s t can will just don don't should should've now d ll m o re ve
+y ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn
+hasn't haven haven't isn isn't ma mightn mightn't mustn mustn't needn needn't
+shan shan't shouldn shouldn't wasn wasn't weren weren't won won't wouldn
+wouldn't
+""".split())
+
+# Sentence split used when no Punkt model is available
+_FALLBACK_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+class NLTKResources:
+    """Process-wide, offline access to the NLTK data the pipeline needs
+
+    Resources are looked up only in the bundled data directory and NLTK's
+    standard locations, never downloaded at runtime. The lookup happens once
+    per process; the stopword set and the Punkt tokenizer are then loaded
+    once and shared by every SummaryGenerator and TextVisualizer. Missing
+    resources degrade to the built-in stopword list and a regex sentence
+    splitter with a single warning, so air-gapped workers start
+    deterministically.
+    """
+
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir or os.environ.get(NLTK_DATA_ENV) or DEFAULT_NLTK_DATA_DIR
+        self._lock = threading.Lock()
+        self._verified = False
+        self.available = {}
+        self._stopwords = None
+        self._punkt = None
+        self._word_tokenizer = None
+
+    def verify(self):
+        """Locate every resource once; returns {name: found}"""
+        if self._verified:
+            return self.available
+        with self._lock:
+            if self._verified:
+                return self.available
+            import nltk
+
+            if os.path.isdir(self.data_dir) and self.data_dir not in nltk.data.path:
+                nltk.data.path.insert(0, self.data_dir)
+
+            punkt_path = ("tokenizers/punkt_tab/english/" if hasattr(nltk.tokenize, "PunktTokenizer")
+                          else "tokenizers/punkt/english.pickle")
+            for name, path in (("punkt", punkt_path), ("stopwords", "corpora/stopwords/english")):
+                try:
+                    nltk.data.find(path)
+                    self.available[name] = True
+                except LookupError:
+                    self.available[name] = False
+
+            missing = [name for name, found in self.available.items() if not found]
+            if missing:
+                print(f"⚠️ NLTK data not bundled ({', '.join(missing)}); using built-in fallbacks. "
+                      f"Run 'python -m utils.nltk_resources' to bundle it into {self.data_dir}")
+            self._verified = True
+        return self.available
+
+    @property
+    def stopwords(self):
+        """Shared frozenset of English stopwords"""
+        if self._stopwords is None:
+            words = ENGLISH_STOPWORDS
+            if self.verify()["stopwords"]:
+                from nltk.corpus import stopwords
+
+                words = frozenset(stopwords.words('english'))
+            self._stopwords = words
+        return self._stopwords
+
+    @property
+    def punkt(self):
+        """Shared Punkt sentence tokenizer, or None when the model is not bundled"""
+        if self._punkt is None and self.verify()["punkt"]:
+            import nltk
+
+            if hasattr(nltk.tokenize, "PunktTokenizer"):
+                self._punkt = nltk.tokenize.PunktTokenizer("english")
+            else:
+                self._punkt = nltk.data.load("tokenizers/punkt/english.pickle")
+        return self._punkt
+
+    def preload(self):
+        """Verify and load everything up front, e.g. when a worker process starts"""
+        self.verify()
+        self.stopwords
+        self.punkt
+        return self
+
+    def sent_tokenize(self, text):
+        punkt = self.punkt
+        if punkt is None:
+            return [sentence for sentence in _FALLBACK_SENTENCE_END.split(text.strip()) if sentence]
+        return punkt.tokenize(text)
+
+    def word_tokenize(self, text):
+        """Same tokens as nltk.word_tokenize, using the shared Punkt model"""
+        if self._word_tokenizer is None:
+            from nltk.tokenize import NLTKWordTokenizer
+
+            self._word_tokenizer = NLTKWordTokenizer()
+        tokenize = self._word_tokenizer.tokenize
+        return [token for sentence in self.sent_tokenize(text) for token in tokenize(sentence)]
+
+
+_resources = None
+_resources_lock = threading.Lock()
+
+
+def get_nltk_resources():
+    """The process-wide NLTKResources instance"""
+    global _resources
+    if _resources is None:
+        with _resources_lock:
+            if _resources is None:
+                _resources = NLTKResources()
+    return _resources
+
+
+def ensure_nltk_resources():
+    """Make bundled NLTK data visible to NLTK and sumy; checked once per process"""
+    return get_nltk_resources().verify()
+
+
+def word_tokenize(text):
+    return get_nltk_resources().word_tokenize(text)
+
+
+def sent_tokenize(text):
+    return get_nltk_resources().sent_tokenize(text)
+
+
+def english_stopwords():
+    """Shared, read-only set of English stopwords"""
+    return get_nltk_resources().stopwords
+
+
+def main():
+    """Build-time step: download the NLTK data into the bundled directory"""
+    parser = argparse.ArgumentParser(description="Bundle NLTK data for offline workers")
+    parser.add_argument("--dir", default=os.environ.get(NLTK_DATA_ENV) or DEFAULT_NLTK_DATA_DIR)
+    args = parser.parse_args()
+
+    import nltk
+
+    os.makedirs(args.dir, exist_ok=True)
+    for package in BUNDLED_PACKAGES:
+        if not nltk.download(package, download_dir=args.dir, quiet=True, raise_on_error=False):
+            print(f"❌ Could not download {package}")
+    print(f"✅ NLTK data bundled in {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
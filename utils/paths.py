@@ -0,0 +1,17 @@
+import os
+
+# Root folder for everything the app persists between runs (indexes, stores, caches)
+DATA_DIR_ENV = "MEETING_NOTES_DATA_DIR"
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "meeting_data")
+
+
+def get_data_dir(*parts):
+    """Return (and create) a directory under the app's data folder"""
+    path = os.path.join(os.environ.get(DATA_DIR_ENV, DEFAULT_DATA_DIR), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_data_path(filename):
+    """Path of a file directly under the data folder"""
+    return os.path.join(get_data_dir(), filename)
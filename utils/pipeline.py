@@ -0,0 +1,351 @@
+import gc
+import os
+import time
+from datetime import datetime
+
+from .audio_processor import AudioProcessor
+from .model_selection import AUTO_MODEL, MODEL_NAMES, ModelSelector
+from .decode_options import DecodeOptions
+from .exports import export_zip
+from .postprocessing import TranscriptPostProcessor
+from .profiling import RunProfiler
+from .segments import SegmentStore
+from .transcription import TranscriptGenerator
+from .summarization import SummaryGenerator
+from .visualization import TextVisualizer
+
+
+class MeetingPipeline:
+    """Runs the meeting-notes pipeline without any Streamlit dependency
+
+    The stages mirror the steps of ``process_audio_file`` in app.py so the
+    UI, the HTTP service and batch jobs all produce the same result dict.
+    Every stage is a plain blocking call, which lets async callers push each
+    one onto an executor on its own.
+    """
+
+    STAGES = ("audio_info", "transcription", "summary", "statistics")
+
+    def __init__(self, transcription_model="openai/whisper-tiny", summarization_model="lsa",
+                 diarize=False, search_index=None, meeting_store=None, analytics=None,
+                 trim_silence=True, normalize_loudness=False, model_selector=None, two_pass=False,
+                 decode_options=None, checkpoints=None, num_threads=None, duplicate_index=None,
+                 postprocessor=None, clean_disfluencies=True, summary_methods=None, summary_fusion="rrf",
+                 summary_workers=0):
+        self.transcription_model = transcription_model
+        self.summarization_model = summarization_model
+        self.diarize = diarize
+        self.trim_silence = trim_silence
+        self.normalize_loudness = normalize_loudness
+        self.decode_options = decode_options or DecodeOptions()
+        # transcription_model="auto" picks a size per file to meet the selector's latency SLO
+        self.model_selector = model_selector or ModelSelector()
+        # Two-pass: a whisper-tiny preview first, then the selected model
+        self.two_pass = two_pass
+        # Optional MeetingStore, MeetingSearchIndex and MeetingAnalytics updated after every successful run
+        self.meeting_store = meeting_store
+        self.search_index = search_index
+        self.analytics = analytics
+        # Optional CheckpointStore: long transcriptions resume from the last finished chunk
+        self.checkpoints = checkpoints
+        self.num_threads = num_threads
+        # Optional DuplicateIndex: flags repeats of earlier meetings and reuses their results
+        self.duplicate_index = duplicate_index
+        # Confidence-based cleanup of Whisper's segments; pass refine=True to re-check unclear passages
+        self.postprocessor = postprocessor or TranscriptPostProcessor()
+        # Strip fillers and stutters from the text the summarizer sees (the transcript stays verbatim)
+        self.clean_disfluencies = clean_disfluencies
+        # Summarizers run in parallel next to summarization_model (default DEFAULT_ENSEMBLE) and how
+        # their rankings are fused ("rrf" or "borda")
+        self.summary_methods = summary_methods
+        self.summary_fusion = summary_fusion
+        # Opt-in process pool for the summarizer ensemble (0: in process; see EnsembleSummarizer)
+        self.summary_workers = summary_workers
+        self.audio_processor = AudioProcessor()
+        self._transcript_generators = {}
+
+    def get_transcript_generator(self, model=None):
+        """Lazily create one transcriber per model so each Whisper model is loaded once per pipeline"""
+        model = model or self.transcription_model
+        if model == AUTO_MODEL:
+            raise ValueError("Resolve 'auto' with select_model() before transcribing")
+        if model not in self._transcript_generators:
+            self._transcript_generators[model] = TranscriptGenerator(
+                model_name=model,
+                trim_silence=self.trim_silence,
+                normalize_loudness=self.normalize_loudness,
+                decode_options=self.decode_options,
+                num_threads=self.num_threads,
+                postprocessor=self.postprocessor,
+            )
+        return self._transcript_generators[model]
+
+    def unload_models(self):
+        """Drop every loaded Whisper model; the next transcription loads it again
+
+        Long-lived workers call this when an admitted job is done, so only
+        jobs holding an admission ticket keep a model resident.
+        """
+        self._transcript_generators.clear()
+        gc.collect()
+
+    @property
+    def transcript_generator(self):
+        return self.get_transcript_generator()
+
+    def select_model(self, duration, queue_depth=0, workers=1):
+        """ModelChoice for transcription_model="auto", or None when a model was fixed"""
+        if self.transcription_model != AUTO_MODEL:
+            return None
+        return self.model_selector.choose(duration, queue_depth=queue_depth, workers=workers)
+
+    def open_checkpoint(self, audio_path, model=None, source=None):
+        """Checkpoint for this file and the settings that shape its result, or None without a store"""
+        if self.checkpoints is None:
+            return None
+        generator = self.get_transcript_generator(model)
+        return self.checkpoints.open(
+            audio_path, source=source,
+            model=model or self.transcription_model,
+            diarize=self.diarize,
+            trim_silence=self.trim_silence,
+            normalize_loudness=self.normalize_loudness,
+            decode_options=self.decode_options.to_dict(),
+            postprocessing=self.postprocessor.to_dict(),
+            chunk_seconds=generator.chunk_seconds,
+            **self.summary_settings(),
+        )
+
+    def summary_settings(self):
+        """Settings that shape the summary and statistics (checkpoint and result-cache keys)"""
+        return {
+            "summarization_model": self.summarization_model,
+            "clean_disfluencies": self.clean_disfluencies,
+            "summary_ensemble": self.summary_generator().ensemble.to_dict(),
+        }
+
+    def get_audio_info(self, audio_path):
+        """Stage 1: read basic information about the audio file"""
+        return self.audio_processor.get_audio_info(audio_path)
+
+    def transcribe(self, audio_path, model=None, diarize=None, checkpoint=None):
+        """Stage 2: speech-to-text
+
+        Returns a SegmentStore; segments are speaker-labeled when
+        diarization is enabled. ``model`` overrides the configured model;
+        with "auto" and no override the model is chosen from the duration.
+        With a ``checkpoint`` finished chunks and a finished transcript are
+        reused.
+        """
+        if checkpoint is not None:
+            saved = checkpoint.stage("transcription")
+            if saved is not None:
+                return SegmentStore.from_dicts(saved)
+        if model is None and self.transcription_model == AUTO_MODEL:
+            import librosa
+
+            model = self.select_model(librosa.get_duration(path=audio_path)).model
+        segments = self.get_transcript_generator(model).transcribe_with_segments(audio_path, checkpoint)
+        if self.diarize if diarize is None else diarize:
+            self.diarize_segments(audio_path, segments)
+        if checkpoint is not None:
+            checkpoint.save_stage("transcription", segments.to_dicts())
+        return segments
+
+    def diarize_segments(self, audio_path, segments):
+        """Label the segments of a whole recording with speakers, in place"""
+        if len(segments):
+            from .diarization import SpeakerDiarizer, assign_speakers
+
+            assign_speakers(segments, SpeakerDiarizer().diarize(audio_path))
+        return segments
+
+    def summary_generator(self):
+        return SummaryGenerator(model_name=self.summarization_model, clean_disfluencies=self.clean_disfluencies,
+                                methods=self.summary_methods, fusion=self.summary_fusion,
+                                workers=self.summary_workers)
+
+    def summarize(self, segments, checkpoint=None):
+        """Stage 3: summary, action items, decisions and key points"""
+        if checkpoint is not None:
+            return checkpoint.cached("summary", self.summarize, segments)
+        summary_generator = self.summary_generator()
+        return summary_generator.generate_summary(segments)
+
+    def compute_statistics(self, segments, checkpoint=None, keyphrases=None):
+        """Stage 4: text statistics (charts are rendered by the UI only)
+
+        ``keyphrases`` are the summary's "keyphrase_scores", so the key
+        phrases come from the summary stage's extraction.
+        """
+        if checkpoint is not None:
+            return checkpoint.cached("statistics", self.compute_statistics, segments, None, keyphrases)
+        visualizer = TextVisualizer()
+        return visualizer.generate_text_statistics(segments, keyphrases=keyphrases)
+
+    def reuse_results(self, segments):
+        """(summary, statistics) of an earlier meeting with the same transcript and summary settings, or None
+
+        Summary items are re-anchored to this recording's timestamps and the
+        duration-based statistics are recomputed.
+        """
+        if self.duplicate_index is None:
+            return None
+        cached = self.duplicate_index.cached_results(segments, self.summary_settings())
+        if cached is None:
+            return None
+        summary, statistics = cached
+        summary = self.summary_generator().relocate_items(summary, segments)
+        if segments.has_timestamps and segments.duration > 0:
+            statistics["duration_minutes"] = segments.duration / 60
+            statistics["words_per_minute"] = statistics.get("total_words", 0) / statistics["duration_minutes"]
+        print("♻️ Transcript matches an earlier meeting; reusing its summary and statistics")
+        return summary, statistics
+
+    def find_related(self, segments, summary=None):
+        """Near-duplicate earlier meetings and recurring action items, or None without an index"""
+        if self.duplicate_index is None:
+            return None
+        return self.duplicate_index.related(segments, summary)
+
+    def transcribe_preview(self, audio_path):
+        """Fast first pass with whisper-tiny, without diarization
+
+        The preview uses the pipeline's decode options, so pick the "fast"
+        preset if the draft should appear as early as possible.
+        """
+        return self.transcribe(audio_path, model=MODEL_NAMES["tiny"], diarize=False)
+
+    def run(self, audio_path, progress_callback=None, tags=None, preview_callback=None):
+        """Run every stage on one file and return the combined result dict
+
+        With ``two_pass``, ``preview_callback`` receives the whisper-tiny
+        transcript before the selected model runs.
+        """
+        timings = {}
+
+        def run_stage(name, func, *args):
+            return self._run_stage(timings, progress_callback, name, func, *args)
+
+        audio_info = run_stage("audio_info", self.get_audio_info, audio_path)
+        choice = self.select_model(audio_info["duration"])
+        model = choice.model if choice else self.transcription_model
+        if self.two_pass and model != MODEL_NAMES["tiny"]:
+            preview = run_stage("preview", self.transcribe_preview, audio_path)
+            if preview_callback:
+                preview_callback(preview)
+        checkpoint = self.open_checkpoint(audio_path, model)
+        segments = run_stage("transcription", self.transcribe, audio_path, model, None, checkpoint)
+        return self.finish(audio_path, audio_info, segments, model=model, timings=timings, tags=tags,
+                           model_selection=choice.to_dict() if choice else None, checkpoint=checkpoint,
+                           progress_callback=progress_callback,
+                           postprocessing=self.get_transcript_generator(model).last_postprocessing)
+
+    @staticmethod
+    def _run_stage(timings, progress_callback, name, func, *args):
+        if progress_callback:
+            progress_callback(name)
+        started = time.perf_counter()
+        value = func(*args)
+        timings[name] = time.perf_counter() - started
+        return value
+
+    def finish(self, audio_path, audio_info, segments, model=None, timings=None, tags=None, source=None,
+               model_selection=None, checkpoint=None, progress_callback=None, postprocessing=None):
+        """Stages after transcription: summary, statistics and related meetings
+
+        Builds the result dict, records it and clears the checkpoint. Used
+        by run() and by distributed jobs once their chunks are merged.
+        """
+        timings = {} if timings is None else timings
+        reused = self.reuse_results(segments)
+        if reused is not None:
+            summary, statistics = reused
+        else:
+            summary = self._run_stage(timings, progress_callback, "summary", self.summarize, segments, checkpoint)
+            statistics = self._run_stage(timings, progress_callback, "statistics", self.compute_statistics,
+                                         segments, checkpoint, summary.get("keyphrase_scores"))
+
+        result = build_result(
+            audio_path, audio_info, segments, summary, statistics,
+            transcription_model=model or self.transcription_model,
+            summarization_model=self.summarization_model,
+            timings=timings,
+            source=source,
+            tags=tags,
+            model_selection=model_selection,
+            decode_options=self.decode_options.to_dict(),
+            related=self.find_related(segments, summary),
+            postprocessing=postprocessing,
+        )
+        self.record(result)
+        if checkpoint is not None:
+            checkpoint.clear()
+        return result
+
+    def record(self, result):
+        """Persist a finished result to the configured store, index and analytics
+
+        The store assigns the meeting id and the search and duplicate
+        indexes reuse it, so their hits can be resolved to stored meetings.
+        """
+        if self.meeting_store is not None:
+            result["meeting_id"] = self.meeting_store.save(result)
+        if self.search_index is not None:
+            result["meeting_id"] = self.search_index.add_meeting(result, meeting_id=result.get("meeting_id"))
+        if self.duplicate_index is not None:
+            result["meeting_id"] = self.duplicate_index.add_meeting(result, meeting_id=result.get("meeting_id"),
+                                                                    summary_settings=self.summary_settings())
+        if self.analytics is not None:
+            self.analytics.record(result)
+        return result
+
+    def run_batch(self, audio_paths, progress_callback=None, tags=None, export_path=None,
+                  export_formats=("md", "json", "srt"), profile=None):
+        """Process several files one after another, collecting per-file errors
+
+        With ``export_path`` the results are also written to one zip file
+        (see utils.exports.export_zip). With ``profile`` (default: the
+        MEETING_NOTES_PROFILE environment variable) each file is profiled
+        and its result gets a "profile" folder (see utils.profiling).
+        """
+        results = []
+        for audio_path in audio_paths:
+            profiler = RunProfiler(audio_path, enabled=profile)
+            try:
+                with profiler:
+                    result = self.run(audio_path, progress_callback=progress_callback, tags=tags)
+            except Exception as e:
+                result = {
+                    "source": os.path.basename(audio_path),
+                    "error": str(e),
+                }
+            if profiler.path:
+                result["profile"] = profiler.path
+            results.append(result)
+        if export_path is not None:
+            export_zip(results, export_path, export_formats)
+        return results
+
+
+def build_result(audio_path, audio_info, segments, summary, statistics,
+                 transcription_model=None, summarization_model=None, timings=None, source=None,
+                 tags=None, model_selection=None, decode_options=None, related=None, postprocessing=None):
+    """Assemble the JSON-serializable result dict shared by the API and batch processing"""
+    return {
+        "source": source or os.path.basename(audio_path),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "transcription_model": transcription_model,
+        "summarization_model": summarization_model,
+        "audio_info": audio_info,
+        "transcript": segments.text,
+        "segments": segments.to_dicts(),
+        "summary": summary,
+        "statistics": statistics,
+        "timings": timings or {},
+        "tags": list(tags or []),
+        "model_selection": model_selection,
+        "decode_options": decode_options,
+        "related": related,
+        "postprocessing": postprocessing,
+    }
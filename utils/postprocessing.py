@@ -0,0 +1,215 @@
+import math
+import re
+import zlib
+
+from .model_selection import WHISPER_SIZES, whisper_size
+
+# Whisper's own defaults for detecting a failed window
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+COMPRESSION_RATIO_THRESHOLD = 2.4
+# Segments below this average token log-probability are re-checked and marked in the UI
+LOW_CONFIDENCE_LOGPROB = -0.8
+# The same threshold as a SegmentStore confidence (exp(avg_logprob))
+LOW_CONFIDENCE = math.exp(LOW_CONFIDENCE_LOGPROB)
+
+# Text Whisper tends to produce on silence or music, learned from subtitled video
+KNOWN_HALLUCINATIONS = frozenset({
+    "thank you", "thank you for watching", "thanks for watching", "please subscribe",
+    "subscribe to my channel", "like and subscribe", "subtitles by the amara org community",
+    "you", "bye", "music",
+})
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def compression_ratio(text):
+    """Text length over its zlib-compressed length, computed like Whisper does; loops compress well"""
+    data = text.encode("utf-8")
+    return len(data) / len(zlib.compress(data)) if data else 0.0
+
+
+def normalized_text(text):
+    return " ".join(_NON_WORD.sub("", text.lower()).split())
+
+
+def larger_model(model_name):
+    """Next larger Whisper size ('tiny' -> 'base'), or None for the largest"""
+    index = WHISPER_SIZES.index(whisper_size(model_name))
+    return WHISPER_SIZES[index + 1] if index + 1 < len(WHISPER_SIZES) else None
+
+
+def low_confidence_segments(segments, threshold=LOW_CONFIDENCE):
+    """Indices of the SegmentStore rows whose confidence is below ``threshold``"""
+    return [i for i, confidence in enumerate(segments.confidences)
+            if not math.isnan(confidence) and confidence < threshold]
+
+
+class TranscriptPostProcessor:
+    """Cleans Whisper segments using the decoder's own confidence signals
+
+    Three checks run on each segment's ``avg_logprob``, ``no_speech_prob``
+    and ``compression_ratio``:
+
+    - Hallucinations are dropped: text on a window Whisper itself thinks
+      is silence (no_speech_prob above ``no_speech_threshold``) that is
+      also unlikely, repetitive or a known silence phrase, and any segment
+      whose text compresses better than ``compression_ratio_threshold``
+      (a decoding loop).
+    - Repeats are dropped: more than ``max_repeats`` identical segments in
+      a row, and any repeat that is itself low-confidence.
+    - With ``refine``, spans of segments below ``low_confidence_logprob``
+      are re-transcribed with ``refine_model`` (default: the next larger
+      Whisper size). Only the worst spans, up to ``max_refine_fraction``
+      of the recording, are re-run, and the new text is kept only when its
+      log-probability improves by ``min_gain``.
+
+    Segments that stay below ``low_confidence_logprob`` are marked in the
+    UI (see low_confidence_segments).
+    """
+
+    def __init__(self, logprob_threshold=LOGPROB_THRESHOLD, no_speech_threshold=NO_SPEECH_THRESHOLD,
+                 compression_ratio_threshold=COMPRESSION_RATIO_THRESHOLD,
+                 low_confidence_logprob=LOW_CONFIDENCE_LOGPROB, max_repeats=2, refine=False, refine_model=None,
+                 max_refine_fraction=0.25, padding=0.3, min_gain=0.1):
+        if not 0 <= max_refine_fraction <= 1:
+            raise ValueError(f"max_refine_fraction must be between 0 and 1, got {max_refine_fraction}")
+        self.logprob_threshold = logprob_threshold
+        self.no_speech_threshold = no_speech_threshold
+        self.compression_ratio_threshold = compression_ratio_threshold
+        self.low_confidence_logprob = low_confidence_logprob
+        self.max_repeats = max_repeats
+        self.refine = refine
+        self.refine_model = refine_model
+        self.max_refine_fraction = max_refine_fraction
+        self.padding = padding
+        self.min_gain = min_gain
+
+    def to_dict(self):
+        """Settings that change the transcript (used in checkpoint keys)"""
+        return {
+            "logprob_threshold": self.logprob_threshold,
+            "no_speech_threshold": self.no_speech_threshold,
+            "compression_ratio_threshold": self.compression_ratio_threshold,
+            "low_confidence_logprob": self.low_confidence_logprob,
+            "max_repeats": self.max_repeats,
+            "refine": self.refine,
+            "refine_model": self.refine_model,
+            "max_refine_fraction": self.max_refine_fraction,
+            "padding": self.padding,
+            "min_gain": self.min_gain,
+        }
+
+    def _low_confidence(self, segment):
+        logprob = segment.get("avg_logprob")
+        return logprob is not None and logprob < self.low_confidence_logprob
+
+    def hallucination_reason(self, segment):
+        """Why a segment looks hallucinated, or None"""
+        text = normalized_text(segment["text"])
+        if not text:
+            return "empty"
+        ratio = segment.get("compression_ratio")
+        if ratio is None:
+            ratio = compression_ratio(segment["text"].strip())
+        if ratio > self.compression_ratio_threshold:
+            return f"repetitive text (compression ratio {ratio:.1f})"
+        no_speech = segment.get("no_speech_prob")
+        if no_speech is not None and no_speech > self.no_speech_threshold:
+            logprob = segment.get("avg_logprob")
+            if logprob is not None and logprob < self.logprob_threshold:
+                return f"no speech ({no_speech:.2f}) and low log-probability ({logprob:.2f})"
+            if text in KNOWN_HALLUCINATIONS:
+                return f"no speech ({no_speech:.2f}) and a known silence phrase"
+        return None
+
+    def filter(self, whisper_segments):
+        """(kept, dropped) segments; each dropped segment gets a "reason" """
+        kept, dropped = [], []
+        previous, repeats = None, 0
+        for segment in whisper_segments:
+            reason = self.hallucination_reason(segment)
+            text = normalized_text(segment["text"])
+            if reason is None and text == previous:
+                repeats += 1
+                if repeats >= self.max_repeats:
+                    reason = f"repeated {repeats + 1} times in a row"
+                elif self._low_confidence(segment):
+                    reason = "low-confidence repeat of the previous segment"
+            elif reason is None:
+                previous, repeats = text, 0
+            if reason is None:
+                kept.append(segment)
+            else:
+                dropped.append(dict(segment, reason=reason))
+        return kept, dropped
+
+    def refine_spans(self, segments):
+        """(first, last) index ranges of adjacent low-confidence segments worth re-transcribing
+
+        Worst spans (lowest duration-weighted log-probability) are chosen
+        first until ``max_refine_fraction`` of the transcript's time range
+        is used; the result is in transcript order.
+        """
+        spans = []
+        for i, segment in enumerate(segments):
+            if not self._low_confidence(segment):
+                continue
+            if spans and spans[-1][1] == i - 1 and segment["start"] - segments[i - 1]["end"] <= 2 * self.padding:
+                spans[-1][1] = i
+            else:
+                spans.append([i, i])
+
+        if not spans:
+            return []
+        budget = (segments[-1]["end"] - segments[0]["start"]) * self.max_refine_fraction
+        chosen = []
+        for first, last in sorted(spans, key=lambda span: _mean_logprob(segments[span[0]:span[1] + 1])):
+            seconds = segments[last]["end"] - segments[first]["start"]
+            if seconds <= budget:
+                chosen.append((first, last))
+                budget -= seconds
+        return sorted(chosen)
+
+    def refine_segments(self, segments, audio, transcribe, sample_rate=16000):
+        """Re-transcribe the low-confidence spans with ``transcribe(audio_piece, offset)``
+
+        ``audio`` is on the same clock as the segment times. Returns
+        (segments, refined) where ``refined`` lists the replaced spans.
+        """
+        segments = list(segments)
+        refined = []
+        for first, last in reversed(self.refine_spans(segments)):
+            old = segments[first:last + 1]
+            start, end = old[0]["start"], old[-1]["end"]
+            piece_start = max(start - self.padding, 0.0)
+            piece = audio[int(piece_start * sample_rate):int((end + self.padding) * sample_rate)]
+            new, _ = self.filter(transcribe(piece, piece_start))
+            if not new or _mean_logprob(new) < _mean_logprob(old) + self.min_gain:
+                continue
+            # Padding may pull in neighbouring words' timing; keep the span where it was
+            for segment in new:
+                segment["start"] = min(max(segment["start"], start), end)
+                segment["end"] = min(max(segment["end"], segment["start"]), end)
+            segments[first:last + 1] = new
+            refined.append({
+                "start": start,
+                "end": end,
+                "before": " ".join(segment["text"].strip() for segment in old),
+                "after": " ".join(segment["text"].strip() for segment in new),
+                "logprob_before": round(_mean_logprob(old), 3),
+                "logprob_after": round(_mean_logprob(new), 3),
+            })
+        refined.reverse()
+        return segments, refined
+
+
+def _mean_logprob(segments):
+    """Duration-weighted average log-probability; segments without one count as confident"""
+    total = weight = 0.0
+    for segment in segments:
+        duration = max(segment["end"] - segment["start"], 0.01)
+        logprob = segment.get("avg_logprob")
+        total += duration * (0.0 if logprob is None else logprob)
+        weight += duration
+    return total / weight if weight else 0.0
@@ -0,0 +1,211 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+from .paths import get_data_dir
+
+# Set to 1 to profile every processed meeting (app uploads and batch runs)
+PROFILE_ENV = "MEETING_NOTES_PROFILE"
+
+
+def profiling_enabled(flag=None):
+    """An explicit flag wins; otherwise the MEETING_NOTES_PROFILE environment variable decides"""
+    if flag is not None:
+        return bool(flag)
+    return os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+
+
+class StackSampler:
+    """Samples the Python stack of one thread at a fixed interval
+
+    Counts are kept per call stack, which is what a flame graph draws. A
+    sample costs one ``sys._current_frames`` lookup in a background
+    thread, so the profiled code runs at close to full speed (unlike
+    cProfile, which pays on every call). Time spent inside C extensions
+    (Whisper's torch kernels, NumPy) shows up on the Python line that
+    called them.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005, max_depth=128, on_sample=None):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.on_sample = on_sample
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stack(self, frame):
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(stack))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._stack(frame)] += 1
+                self.samples += 1
+            if self.on_sample is not None:
+                self.on_sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_folded(self, path):
+        """Collapsed stacks ('a;b;c <samples>'), readable by flamegraph.pl and speedscope"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RunProfiler:
+    """Profile one processing run and save the reports in their own folder
+
+    Used as a context manager around a whole meeting (upload or batch
+    item). When enabled it runs cProfile, a stack sampler and tracemalloc
+    together, and on exit writes to ``meeting_data/profiles/<time>_<name>/``:
+
+    - ``profile.prof``: pstats file (``python -m pstats``, snakeviz)
+    - ``flamegraph.folded``: sampled stacks for flamegraph.pl/speedscope
+    - ``report.txt``: wall time, slowest functions and top memory allocators
+
+    Memory allocators are reported from a tracemalloc snapshot taken near
+    the peak (re-taken at most every ``snapshot_interval`` seconds when
+    traced memory grows by 10%), since most buffers are freed by the end.
+
+    When disabled it does nothing, so callers can always wrap their work.
+    """
+
+    def __init__(self, name, enabled=None, output_dir=None, top=25, trace_frames=10, snapshot_interval=1.0):
+        self.name = name
+        self.enabled = profiling_enabled(enabled)
+        self.output_dir = output_dir
+        self.top = top
+        self.trace_frames = trace_frames
+        self.snapshot_interval = snapshot_interval
+        self.path = None
+        self.summary = None
+        self._profile = None
+        self._sampler = None
+        self._started_tracing = False
+        self._peak_snapshot = None
+        self._peak_snapshot_size = 0
+        self._peak_snapshot_at = 0.0
+
+    def _make_output_dir(self):
+        stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", os.path.splitext(os.path.basename(self.name))[0]) or "meeting"
+        folder = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{stem}"
+        if self.output_dir:
+            path = os.path.join(self.output_dir, folder)
+            os.makedirs(path, exist_ok=True)
+            return path
+        return get_data_dir("profiles", folder)
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        # Another run in this process may already be tracing; share it rather than reset it
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._sampler = StackSampler(on_sample=self._check_peak)
+        self._sampler.start()
+        self._profile = cProfile.Profile()
+        self._started = time.perf_counter()
+        try:
+            self._profile.enable()
+        except ValueError:
+            # Only one cProfile can be active per thread (nested or concurrent runs)
+            self._profile = None
+        return self
+
+    def _check_peak(self):
+        """Keep a snapshot close to the memory peak (called from the sampler thread)"""
+        current, _ = tracemalloc.get_traced_memory()
+        now = time.perf_counter()
+        if current > self._peak_snapshot_size * 1.1 and now - self._peak_snapshot_at >= self.snapshot_interval:
+            self._peak_snapshot = tracemalloc.take_snapshot()
+            self._peak_snapshot_size = current
+            self._peak_snapshot_at = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.enabled:
+            return False
+        if self._profile is not None:
+            self._profile.disable()
+        elapsed = time.perf_counter() - self._started
+        self._sampler.stop()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._peak_snapshot is not None and self._peak_snapshot_size >= current:
+            snapshot = self._peak_snapshot
+        else:
+            snapshot = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        try:
+            self.path = self._make_output_dir()
+            self._write_reports(elapsed, snapshot, peak, failed=exc_type is not None)
+            print(f"🔬 Profile saved to {self.path}")
+        except Exception as e:
+            # A broken report must not hide the result (or the error) of the run itself
+            print(f"⚠️ Could not save profile: {str(e)}")
+        return False
+
+    def _write_reports(self, elapsed, snapshot, peak, failed=False):
+        functions = ""
+        if self._profile is not None:
+            self._profile.dump_stats(os.path.join(self.path, "profile.prof"))
+            stream = io.StringIO()
+            pstats.Stats(self._profile, stream=stream).sort_stats("cumulative").print_stats(self.top)
+            functions = stream.getvalue()
+        self._sampler.write_folded(os.path.join(self.path, "flamegraph.folded"))
+
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        allocators = snapshot.statistics("lineno")[:self.top]
+
+        self.summary = {
+            "name": self.name,
+            "seconds": round(elapsed, 3),
+            "samples": self._sampler.samples,
+            "peak_traced_mb": round(peak / (1024 * 1024), 1),
+            "failed": failed,
+            "path": self.path,
+        }
+        with open(os.path.join(self.path, "report.txt"), "w", encoding="utf-8") as f:
+            f.write(f"PROFILE: {self.name}{' (run failed)' if failed else ''}\n")
+            f.write(f"Recorded: {datetime.now().isoformat(timespec='seconds')}\n")
+            f.write(f"Wall time: {elapsed:.2f} s, {self._sampler.samples} stack samples\n")
+            f.write(f"Peak traced memory: {self.summary['peak_traced_mb']} MB "
+                    f"(Python and NumPy allocations; torch tensors are not traced)\n\n")
+            f.write(f"TOP {self.top} MEMORY ALLOCATORS (near the peak):\n")
+            for stat in allocators:
+                frame = stat.traceback[0]
+                f.write(f"{stat.size / (1024 * 1024):10.2f} MB {stat.count:9d} blocks  "
+                        f"{frame.filename}:{frame.lineno}\n")
+            if functions:
+                f.write(f"\nTOP {self.top} FUNCTIONS BY CUMULATIVE TIME:\n")
+                f.write(functions)
@@ -0,0 +1,333 @@
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+
+from .paths import get_data_path
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9']+")
+
+# Searchable document kinds, in the order they are shown in the UI
+DOCUMENT_KINDS = ("transcript", "action_item", "decision", "key_point", "keyphrase")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    start REAL,
+    speaker INTEGER,
+    text TEXT NOT NULL,
+    norm REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS documents_meeting ON documents(meeting_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    text, content='documents', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE,
+    df INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER NOT NULL,
+    document_id INTEGER NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (term_id, document_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_impact ON postings(term_id, weight DESC);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters (name, value) VALUES ('vector_documents', 0);
+"""
+
+
+def tokenize(text):
+    """Lowercase word tokens used by the TF-IDF vectors"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class MeetingSearchIndex:
+    """Local search index over processed meetings
+
+    Full-text search uses an SQLite FTS5 table (BM25 ranking, porter
+    stemming) over transcript segments, action items, decisions, key
+    points and the meeting's key phrases. The optional vector index stores sparse TF-IDF postings in the
+    same database so similarity queries only touch the postings of the query
+    terms. Documents use log-tf cosine-normalized weights and queries apply
+    the idf (SMART lnc.ltc), so adding a meeting never rewrites old rows.
+    """
+
+    def __init__(self, db_path=None, vector_index=True):
+        self.db_path = db_path or get_data_path("search_index.db")
+        self.vector_index = vector_index
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def add_meeting(self, result, meeting_id=None):
+        """Index a pipeline result dict (see utils.pipeline.build_result)
+
+        Returns the meeting id. Passing an existing ``meeting_id`` replaces
+        that meeting's documents.
+        """
+        documents = list(self._documents_from_result(result))
+        audio_info = result.get("audio_info") or {}
+
+        with self._lock, self.connection:
+            if meeting_id is not None:
+                self._delete_documents(meeting_id)
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO meetings (id, title, created_at, duration) VALUES (?, ?, ?, ?)",
+                    (meeting_id, result.get("source") or "Untitled meeting",
+                     result.get("created_at"), audio_info.get("duration"))
+                )
+            else:
+                cursor = self.connection.execute(
+                    "INSERT INTO meetings (title, created_at, duration) VALUES (?, ?, ?)",
+                    (result.get("source") or "Untitled meeting",
+                     result.get("created_at"), audio_info.get("duration"))
+                )
+                meeting_id = cursor.lastrowid
+
+            vectors = []
+            for kind, start, speaker, text in documents:
+                vector = self._document_vector(text) if self.vector_index else {}
+                norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+                cursor = self.connection.execute(
+                    "INSERT INTO documents (meeting_id, kind, start, speaker, text, norm) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (meeting_id, kind, start, speaker, text, norm)
+                )
+                self.connection.execute(
+                    "INSERT INTO documents_fts (rowid, text) VALUES (?, ?)", (cursor.lastrowid, text)
+                )
+                if vector:
+                    vectors.append((cursor.lastrowid, vector, norm))
+
+            if vectors:
+                self._add_postings(vectors)
+                self._bump_vector_documents(len(vectors))
+
+        return meeting_id
+
+    def _documents_from_result(self, result, passage_chars=400):
+        # Consecutive segments of the same speaker are grouped into passages:
+        # far fewer rows to rank, and snippets with enough context to read
+        passage = None
+        for segment in result.get("segments", []):
+            text = segment["text"].strip()
+            if not text:
+                continue
+            if (passage and passage[2] == segment.get("speaker")
+                    and len(passage[3]) + len(text) < passage_chars):
+                passage[3] += " " + text
+                continue
+            if passage:
+                yield tuple(passage)
+            passage = ["transcript", segment.get("start"), segment.get("speaker"), text]
+        if passage:
+            yield tuple(passage)
+
+        summary = result.get("summary") or {}
+        items = summary.get("items", {})
+        for section, kind in (("action_items", "action_item"), ("decisions", "decision"),
+                              ("key_points", "key_point")):
+            for item in items.get(section, []):
+                yield kind, item.get("start"), item.get("speaker"), item["text"]
+
+        # One document per meeting, so a query on a key phrase ranks the meeting it defines
+        if summary.get("keyphrases"):
+            yield "keyphrase", None, None, ", ".join(summary["keyphrases"])
+
+    @staticmethod
+    def _document_vector(text):
+        """Log-tf weights of a document's terms"""
+        return {term: 1.0 + math.log(count) for term, count in Counter(tokenize(text)).items()}
+
+    def _add_postings(self, vectors):
+        """Write postings for a meeting's documents with one df update per distinct term"""
+        document_frequency = Counter()
+        for _, vector, _ in vectors:
+            document_frequency.update(vector.keys())
+
+        self.connection.executemany(
+            "INSERT INTO terms (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df",
+            document_frequency.items()
+        )
+        term_ids = self._term_ids(document_frequency)
+        self.connection.executemany(
+            "INSERT INTO postings (term_id, document_id, weight) VALUES (?, ?, ?)",
+            ((term_ids[term], document_id, weight / norm)
+             for document_id, vector, norm in vectors
+             for term, weight in vector.items())
+        )
+
+    def _bump_vector_documents(self, delta):
+        # Kept as a counter: COUNT(*) over millions of documents would dominate query time
+        self.connection.execute(
+            "UPDATE counters SET value = value + ? WHERE name = 'vector_documents'", (delta,)
+        )
+
+    def _term_ids(self, terms):
+        terms = list(terms)
+        term_ids = {}
+        # Stay below SQLite's bound-parameter limit
+        for i in range(0, len(terms), 500):
+            batch = terms[i:i + 500]
+            rows = self.connection.execute(
+                f"SELECT term, id, df FROM terms WHERE term IN ({','.join('?' * len(batch))})", batch
+            )
+            term_ids.update((row["term"], row["id"]) for row in rows)
+        return term_ids
+
+    def _delete_documents(self, meeting_id):
+        rows = self.connection.execute(
+            "SELECT id, text FROM documents WHERE meeting_id = ?", (meeting_id,)
+        ).fetchall()
+        for row in rows:
+            self.connection.execute(
+                "INSERT INTO documents_fts (documents_fts, rowid, text) VALUES ('delete', ?, ?)",
+                (row["id"], row["text"])
+            )
+            posted = self.connection.execute(
+                "SELECT term_id FROM postings WHERE document_id = ?", (row["id"],)
+            ).fetchall()
+            self.connection.executemany(
+                "UPDATE terms SET df = df - 1 WHERE id = ?", ((p["term_id"],) for p in posted)
+            )
+            self.connection.execute("DELETE FROM postings WHERE document_id = ?", (row["id"],))
+            if posted:
+                self._bump_vector_documents(-1)
+        self.connection.execute("DELETE FROM documents WHERE meeting_id = ?", (meeting_id,))
+
+    def delete_meeting(self, meeting_id):
+        with self._lock, self.connection:
+            self._delete_documents(meeting_id)
+            self.connection.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+
+    @staticmethod
+    def _fts_query(query):
+        """Quote each word so user input cannot break FTS5 query syntax"""
+        words = re.findall(r"\w+", query)
+        return " ".join(f'"{word}"' for word in words)
+
+    def search(self, query, limit=20, kinds=None):
+        """Full-text search; returns hits ranked by BM25 with highlighted snippets"""
+        fts_query = self._fts_query(query)
+        if not fts_query:
+            return []
+
+        sql = """
+            SELECT d.id AS document_id, d.meeting_id, m.title, m.created_at, d.kind, d.start,
+                   d.speaker, snippet(documents_fts, 0, '**', '**', '…', 24) AS snippet,
+                   rank AS score
+            FROM documents_fts
+            JOIN documents d ON d.id = documents_fts.rowid
+            JOIN meetings m ON m.id = d.meeting_id
+            WHERE documents_fts MATCH ?
+        """
+        params = [fts_query]
+        if kinds:
+            sql += f" AND d.kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def similar(self, query, limit=20, kinds=None, max_df_ratio=0.25, max_postings_per_term=5000):
+        """TF-IDF cosine similarity search over the postings of the query terms
+
+        Terms occurring in more than ``max_df_ratio`` of all documents are
+        dropped when the query has more selective terms: they barely change
+        the ranking but own the longest posting lists. Each remaining term
+        contributes at most ``max_postings_per_term`` postings, read in
+        descending weight order from the impact index.
+        """
+        if not self.vector_index:
+            raise ValueError("Vector index is disabled for this search index")
+
+        query_counts = Counter(tokenize(query))
+        if not query_counts:
+            return []
+
+        with self._lock:
+            total = self.connection.execute(
+                "SELECT value FROM counters WHERE name = 'vector_documents'"
+            ).fetchone()[0]
+            if not total:
+                return []
+            rows = self._term_rows(query_counts)
+
+            idfs = {row["id"]: math.log(total / max(row["df"], 1)) for row in rows}
+            min_idf = math.log(1.0 / max_df_ratio)
+            if any(idf >= min_idf for idf in idfs.values()):
+                idfs = {term_id: idf for term_id, idf in idfs.items() if idf >= min_idf}
+
+            query_weights = {}
+            for row in rows:
+                idf = idfs.get(row["id"], 0.0)
+                if idf > 0:
+                    query_weights[row["id"]] = (1.0 + math.log(query_counts[row["term"]])) * idf
+            if not query_weights:
+                return []
+            query_norm = math.sqrt(sum(w * w for w in query_weights.values()))
+
+            # Impact-ordered scan: only the highest-weighted postings of each
+            # term are read, so cost is bounded by terms x max_postings_per_term
+            scores = Counter()
+            for term_id, query_weight in query_weights.items():
+                weight_factor = query_weight / query_norm
+                for document_id, weight in self.connection.execute(
+                        "SELECT document_id, weight FROM postings WHERE term_id = ? "
+                        "ORDER BY weight DESC LIMIT ?", (term_id, max_postings_per_term)):
+                    scores[document_id] += weight * weight_factor
+
+            hits = []
+            candidates = scores.most_common()
+            for start in range(0, len(candidates), 200):
+                batch = candidates[start:start + 200]
+                rows = {row["document_id"]: row for row in self.connection.execute(f"""
+                    SELECT d.id AS document_id, d.meeting_id, m.title, m.created_at, d.kind,
+                           d.start, d.speaker, d.text AS snippet
+                    FROM documents d JOIN meetings m ON m.id = d.meeting_id
+                    WHERE d.id IN ({','.join('?' * len(batch))})
+                """, [document_id for document_id, _ in batch])}
+                for document_id, score in batch:
+                    row = rows[document_id]
+                    if kinds and row["kind"] not in kinds:
+                        continue
+                    hit = dict(row)
+                    hit["score"] = score
+                    hits.append(hit)
+                    if len(hits) >= limit:
+                        return hits
+            return hits
+
+    def _term_rows(self, terms):
+        terms = list(terms)
+        return self.connection.execute(
+            f"SELECT id, term, df FROM terms WHERE term IN ({','.join('?' * len(terms))})", terms
+        ).fetchall()
+
+    def meeting_count(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
@@ -0,0 +1,250 @@
+import math
+from array import array
+from bisect import bisect_right
+
+from .sentence_segmenter import sentence_spans
+
+
+class Segment:
+    """Lightweight view of one row of a SegmentStore"""
+
+    __slots__ = ('index', 'start', 'end', 'text', 'speaker', 'confidence', 'sentence_index')
+
+    def __init__(self, index, start, end, text, speaker, confidence, sentence_index):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.text = text
+        self.speaker = speaker
+        self.confidence = confidence
+        self.sentence_index = sentence_index
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SegmentStore:
+    """Columnar, array-backed store of timestamped transcript segments
+
+    The full transcript is kept once as ``text``; every segment only stores
+    its character offsets into it, plus start/end seconds, speaker id,
+    confidence and the index of the sentence it starts in. Sentence
+    boundaries are computed once when the store is built, so downstream code
+    (summarizer, extractors, visualizer, exports) never re-splits the text
+    and can map any character offset back to an audio position.
+    """
+
+    __slots__ = ('text', 'starts', 'ends', 'text_starts', 'text_ends', 'speakers',
+                 'confidences', 'sentence_indices', 'sentence_starts', 'sentence_ends')
+
+    NO_SPEAKER = -1
+
+    def __init__(self):
+        self.text = ""
+        self.starts = array('d')
+        self.ends = array('d')
+        self.text_starts = array('I')
+        self.text_ends = array('I')
+        self.speakers = array('h')
+        self.confidences = array('f')
+        self.sentence_indices = array('I')
+        self.sentence_starts = array('I')
+        self.sentence_ends = array('I')
+
+    @classmethod
+    def from_whisper(cls, whisper_segments, clean=None):
+        """Build a store from Whisper's ``result["segments"]``
+
+        ``clean`` is applied to each segment's text before it is joined into
+        the transcript, so offsets always refer to the cleaned text.
+        """
+        texts = []
+        rows = []
+        for segment in whisper_segments:
+            text = segment["text"].strip()
+            if clean:
+                text = clean(text)
+            if not text:
+                continue
+            avg_logprob = segment.get("avg_logprob")
+            confidence = math.exp(avg_logprob) if avg_logprob is not None else math.nan
+            texts.append(text)
+            rows.append((float(segment["start"]), float(segment["end"]), confidence))
+
+        store = cls()
+        offset = 0
+        for text, (start, end, confidence) in zip(texts, rows):
+            store.starts.append(start)
+            store.ends.append(end)
+            store.text_starts.append(offset)
+            store.text_ends.append(offset + len(text))
+            store.speakers.append(cls.NO_SPEAKER)
+            store.confidences.append(confidence)
+            offset += len(text) + 1
+        store.text = " ".join(texts)
+        store._index_sentences()
+        return store
+
+    @classmethod
+    def from_text(cls, text):
+        """Wrap plain text (no timestamps) so text-only callers share the same code path"""
+        text = text.strip()
+        return cls.from_whisper([{"start": math.nan, "end": math.nan, "text": text}] if text else [])
+
+    @classmethod
+    def from_dicts(cls, rows):
+        """Inverse of to_dicts()
+
+        Rows without text are dropped first (as from_whisper would), so
+        speakers and confidences stay with their own segments.
+        """
+        rows = [row for row in rows if row["text"].strip()]
+        store = cls.from_whisper([
+            {
+                "start": math.nan if row["start"] is None else row["start"],
+                "end": math.nan if row["end"] is None else row["end"],
+                "text": row["text"],
+            }
+            for row in rows
+        ])
+        for i, row in enumerate(rows):
+            if row.get("speaker") is not None:
+                store.speakers[i] = row["speaker"]
+            if row.get("confidence") is not None:
+                store.confidences[i] = row["confidence"]
+        return store
+
+    def _index_sentences(self):
+        """Compute sentence boundaries once and record each segment's first sentence
+
+        Segment starts are passed to the segmenter as boundary hints, which
+        splits long unpunctuated Whisper runs at segment boundaries.
+        """
+        self.sentence_starts = array('I')
+        self.sentence_ends = array('I')
+        for start, end in sentence_spans(self.text, hints=self.text_starts[1:]):
+            self.sentence_starts.append(start)
+            self.sentence_ends.append(end)
+
+        self.sentence_indices = array('I', (
+            max(bisect_right(self.sentence_starts, offset) - 1, 0) for offset in self.text_starts
+        ))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        speaker = self.speakers[index]
+        confidence = self.confidences[index]
+        start = self.starts[index]
+        return Segment(
+            index,
+            None if math.isnan(start) else start,
+            None if math.isnan(start) else self.ends[index],
+            self.text[self.text_starts[index]:self.text_ends[index]],
+            None if speaker == self.NO_SPEAKER else speaker,
+            None if math.isnan(confidence) else confidence,
+            self.sentence_indices[index],
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def has_timestamps(self):
+        return len(self) > 0 and not math.isnan(self.starts[0])
+
+    @property
+    def has_speakers(self):
+        return any(speaker != self.NO_SPEAKER for speaker in self.speakers)
+
+    @property
+    def duration(self):
+        return self.ends[-1] if self.has_timestamps else 0.0
+
+    def set_speaker(self, index, speaker):
+        self.speakers[index] = self.NO_SPEAKER if speaker is None else speaker
+
+    def sentence_count(self):
+        return len(self.sentence_starts)
+
+    def sentence(self, index):
+        return self.text[self.sentence_starts[index]:self.sentence_ends[index]]
+
+    def sentences(self):
+        """All sentence strings, in order"""
+        text = self.text
+        return [text[start:end] for start, end in zip(self.sentence_starts, self.sentence_ends)]
+
+    def segment_at(self, offset):
+        """Index of the segment containing a character offset (None for an empty store)"""
+        if not len(self):
+            return None
+        return max(bisect_right(self.text_starts, offset) - 1, 0)
+
+    def time_at(self, offset):
+        """Audio start time (seconds) of the segment containing a character offset"""
+        index = self.segment_at(offset)
+        if index is None or math.isnan(self.starts[index]):
+            return None
+        return self.starts[index]
+
+    def speaker_at(self, offset):
+        index = self.segment_at(offset)
+        if index is None or self.speakers[index] == self.NO_SPEAKER:
+            return None
+        return self.speakers[index]
+
+    def span_times(self, start_offset, end_offset):
+        """(start, end) seconds covered by a character span, or (None, None) without timestamps"""
+        first = self.segment_at(start_offset)
+        last = self.segment_at(max(end_offset - 1, start_offset))
+        if first is None or math.isnan(self.starts[first]):
+            return None, None
+        return self.starts[first], self.ends[last]
+
+    def sentence_times(self, index):
+        return self.span_times(self.sentence_starts[index], self.sentence_ends[index])
+
+    def locate(self, snippet):
+        """Character offset of a snippet produced from this transcript, or -1"""
+        return self.text.find(snippet.strip())
+
+    def to_dicts(self):
+        return [segment.to_dict() for segment in self]
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the store"""
+        columns = (self.starts, self.ends, self.text_starts, self.text_ends, self.speakers,
+                   self.confidences, self.sentence_indices, self.sentence_starts, self.sentence_ends)
+        return len(self.text) + sum(column.itemsize * len(column) for column in columns)
+
+
+def as_segment_store(transcript):
+    """Accept either plain text or a SegmentStore"""
+    if isinstance(transcript, SegmentStore):
+        return transcript
+    return SegmentStore.from_text(transcript or "")
+
+
+def transcript_text(transcript):
+    """Plain text of a transcript given as a string or a SegmentStore"""
+    if isinstance(transcript, SegmentStore):
+        return transcript.text
+    return transcript or ""
+
+
+def format_timestamp(seconds):
+    """mm:ss (or h:mm:ss) label for an audio position"""
+    if seconds is None or math.isnan(seconds):
+        return ""
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
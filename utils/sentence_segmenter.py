@@ -0,0 +1,162 @@
+import re
+
+# Candidate boundary: terminal punctuation (plus closing quotes/brackets)
+# followed by whitespace or the end of the text. Decimals such as "3.5" and
+# dotted abbreviations inside a token never match.
+_CANDIDATE = re.compile(r'[.!?]+["\')\]]*(?=\s|$)')
+_WORD = re.compile(r"[^\W\d_](?:[^\W\d_]|['-])*")
+
+# Lowercased tokens that end in a period without ending a sentence
+ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e",
+    "approx", "dept", "inc", "ltd", "corp", "vol",
+    "jan", "feb", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov",
+    "mon", "tue", "thu", "fri", "a.m", "p.m", "u.s", "u.k",
+})
+# Abbreviations that are also words ("The team sat."): only abbreviations
+# before a number, as in "No. 5", "Fig. 2" or "Sun. 12"
+NUMBER_ABBREVIATIONS = frozenset({"no", "sat", "sun", "mar", "wed", "dec", "fig", "est", "co"})
+
+# Capitalized words that commonly start a Whisper segment mid-sentence
+_CONTINUATION_WORDS = frozenset({"I", "I'm", "I'll", "I've", "I'd"})
+
+
+class SentenceSegmenter:
+    """Rule-based sentence splitter tuned for Whisper transcripts
+
+    One regex pass finds candidate boundaries; a few cheap checks reject
+    abbreviations, initials and periods followed by a lowercase word. Whisper
+    output is often lightly punctuated, so segment start offsets can be
+    passed as ``hints``: a hint that starts with a capital letter after
+    unpunctuated text opens a new sentence, and sentences longer than
+    ``max_sentence_chars`` are cut at hints regardless. Everything runs in
+    a single pass over the text and the sorted hints.
+    """
+
+    def __init__(self, max_sentence_chars=400, min_sentence_chars=20):
+        self.max_sentence_chars = max_sentence_chars
+        self.min_sentence_chars = min_sentence_chars
+
+    def spans(self, text, hints=None):
+        """(start, end) character offsets of every sentence, whitespace trimmed"""
+        spans = []
+        position = 0
+        for match in _CANDIDATE.finditer(text):
+            end = match.end()
+            if self._is_false_boundary(text, match.start(), end):
+                continue
+            self._append(spans, text, position, end)
+            position = end
+        self._append(spans, text, position, len(text))
+        if hints:
+            spans = self._split_at_hints(text, spans, hints)
+        return spans
+
+    def split(self, text, hints=None):
+        """Sentence strings, in order"""
+        return [text[start:end] for start, end in self.spans(text, hints)]
+
+    @staticmethod
+    def _append(spans, text, start, end):
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if end > start:
+            spans.append((start, end))
+
+    @staticmethod
+    def _is_false_boundary(text, start, end):
+        """True for periods that do not end a sentence"""
+        if text[start] != "." or text[end - 1] in "!?":
+            return False
+
+        # Next word starts lowercase: Whisper capitalizes every sentence
+        following = end
+        while following < len(text) and text[following].isspace():
+            following += 1
+        if following < len(text) and text[following].islower():
+            return True
+
+        if end - start > 1:
+            # Ellipsis before a capitalized word still ends the sentence
+            return False
+        word_start = start
+        while word_start > 0 and not text[word_start - 1].isspace():
+            word_start -= 1
+        word = text[word_start:start]
+        if len(word) == 1 and word.isupper():
+            return True  # An initial, as in "J. Smith"
+        word = word.lower().lstrip("(\"'")
+        if word in NUMBER_ABBREVIATIONS:
+            return following < len(text) and text[following].isdigit()
+        if word in ABBREVIATIONS:
+            # "3 p.m." or "the U.S." before a capitalized word usually closes the sentence
+            return "." not in word or following == len(text) or not text[following].isupper()
+        return False
+
+    def _split_at_hints(self, text, spans, hints):
+        """Cut unpunctuated runs at Whisper segment boundaries"""
+        result = []
+        hint_index = 0
+        hint_count = len(hints)
+        for start, end in spans:
+            while hint_index < hint_count and hints[hint_index] <= start:
+                hint_index += 1
+            piece_start = start
+            while hint_index < hint_count and hints[hint_index] < end:
+                hint = hints[hint_index]
+                hint_index += 1
+                length = hint - piece_start
+                if length < self.min_sentence_chars:
+                    continue
+                if length >= self.max_sentence_chars or self._starts_sentence(text, piece_start, hint):
+                    self._append(result, text, piece_start, hint)
+                    piece_start = hint
+            self._append(result, text, piece_start, end)
+        return result
+
+    @staticmethod
+    def _starts_sentence(text, piece_start, hint):
+        """A segment starting with a capital after text without a trailing comma"""
+        before = hint - 1
+        while before > piece_start and text[before].isspace():
+            before -= 1
+        if text[before] in ",;:-":
+            return False
+        if hint >= len(text) or not text[hint].isupper():
+            return False
+        word_end = text.find(" ", hint)
+        word = text[hint:word_end if word_end != -1 else len(text)]
+        return word not in _CONTINUATION_WORDS
+
+
+_default_segmenter = SentenceSegmenter()
+
+
+def split_sentences(text, hints=None):
+    """Split text with the shared default segmenter"""
+    return _default_segmenter.split(text, hints)
+
+
+def sentence_spans(text, hints=None):
+    return _default_segmenter.spans(text, hints)
+
+
+class SumyTokenizer:
+    """Drop-in for ``sumy.nlp.tokenizers.Tokenizer`` backed by SentenceSegmenter
+
+    sumy then sees exactly the sentences the rest of the pipeline uses, and
+    needs no Punkt model.
+    """
+
+    language = "english"
+
+    def __init__(self, segmenter=None):
+        self.segmenter = segmenter or _default_segmenter
+
+    def to_sentences(self, paragraph):
+        return tuple(self.segmenter.split(paragraph))
+
+    def to_words(self, sentence):
+        return tuple(_WORD.findall(sentence))
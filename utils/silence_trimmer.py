@@ -0,0 +1,126 @@
+import numpy as np
+
+from .speech_detection import energy_speech_intervals, frame_power, relative_db
+
+
+class TimeMap:
+    """Maps times in trimmed audio back to the original recording
+
+    Stores one row per kept chunk: where it starts in the trimmed audio and
+    where it starts in the original, both in seconds. Lookups are a binary
+    search, so remapping every Whisper segment is O(n log k).
+    """
+
+    def __init__(self, trimmed_starts, original_starts, lengths):
+        self.trimmed_starts = np.asarray(trimmed_starts, dtype=np.float64)
+        self.original_starts = np.asarray(original_starts, dtype=np.float64)
+        self.lengths = np.asarray(lengths, dtype=np.float64)
+
+    @classmethod
+    def identity(cls, duration):
+        return cls([0.0], [0.0], [duration])
+
+    @property
+    def kept_seconds(self):
+        return float(self.lengths.sum())
+
+    def to_original(self, times):
+        """Original-recording seconds for trimmed-audio seconds (scalar or array)"""
+        times = np.asarray(times, dtype=np.float64)
+        chunk = np.clip(np.searchsorted(self.trimmed_starts, times, side='right') - 1, 0, None)
+        offset = np.minimum(times - self.trimmed_starts[chunk], self.lengths[chunk])
+        mapped = self.original_starts[chunk] + offset
+        return float(mapped) if mapped.ndim == 0 else mapped
+
+    def remap_segments(self, segments):
+        """Rewrite start/end (and word timestamps) of Whisper segments in place"""
+        for segment in segments:
+            segment["start"] = self.to_original(segment["start"])
+            segment["end"] = self.to_original(segment["end"])
+            for word in segment.get("words") or []:
+                word["start"] = self.to_original(word["start"])
+                word["end"] = self.to_original(word["end"])
+        return segments
+
+    def to_dict(self):
+        return {
+            "trimmed_starts": self.trimmed_starts.tolist(),
+            "original_starts": self.original_starts.tolist(),
+            "lengths": self.lengths.tolist(),
+        }
+
+
+class SilenceTrimmer:
+    """Cuts long non-speech stretches out of a recording before transcription
+
+    Speech is found with the same block-wise frame-energy analysis as the
+    diarizer. Silences longer than ``min_silence`` seconds are cut down to
+    ``padding`` seconds on each side, so word onsets and endings survive and
+    Whisper still sees a short pause between turns. Returns the shortened
+    audio and a TimeMap that puts segment times back on the original clock.
+    """
+
+    def __init__(self, sample_rate=16000, top_db=35, min_silence=1.0, padding=0.3, hop_length=160):
+        self.sample_rate = sample_rate
+        self.top_db = top_db
+        self.min_silence = min_silence
+        self.padding = padding
+        self.hop_length = hop_length
+
+    def keep_intervals(self, audio):
+        """(start_sample, end_sample) regions to keep, padded and merged"""
+        speech = energy_speech_intervals(audio, self.sample_rate, self.hop_length, self.top_db,
+                                         min_gap=self.min_silence)
+        if not speech:
+            return []
+        bounds = np.array(speech, dtype=np.int64)
+        pad = int(self.padding * self.sample_rate)
+        starts = np.maximum(bounds[:, 0] - pad, 0)
+        ends = np.minimum(bounds[:, 1] + pad, len(audio))
+
+        # Padding can make neighbours overlap; merge them
+        overlaps = starts[1:] <= ends[:-1]
+        keep = np.concatenate([[True], ~overlaps])
+        merged_starts = starts[keep]
+        merged_ends = np.concatenate([ends[:-1][~overlaps], ends[-1:]])
+        return list(zip(merged_starts.tolist(), merged_ends.tolist()))
+
+    def trim(self, audio):
+        """Return (trimmed_audio, TimeMap); audio without speech is returned unchanged"""
+        duration = len(audio) / self.sample_rate
+        intervals = self.keep_intervals(audio)
+        if not intervals:
+            return audio, TimeMap.identity(duration)
+
+        lengths = np.array([end - start for start, end in intervals], dtype=np.int64)
+        trimmed_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        trimmed = np.concatenate([audio[start:end] for start, end in intervals])
+        time_map = TimeMap(
+            trimmed_starts / self.sample_rate,
+            np.array([start for start, _ in intervals]) / self.sample_rate,
+            lengths / self.sample_rate,
+        )
+        return trimmed, time_map
+
+
+def normalize_loudness(audio, target_dbfs=-20.0, max_gain_db=30.0, sample_rate=16000, hop_length=160):
+    """Scale audio so its speech frames average ``target_dbfs`` RMS, without clipping
+
+    Quiet recordings (laptop microphones across the room) are brought up to
+    a level Whisper handles well. Loudness is measured on frames within
+    40 dB of the peak, so long silences do not drag the estimate down.
+    """
+    if not len(audio):
+        return audio
+    power = frame_power(audio, hop_length, sample_rate=sample_rate)
+    speech = power[relative_db(power) > -40.0]
+    if not len(speech) or speech.mean() <= 0:
+        return audio
+
+    current_dbfs = 10.0 * np.log10(speech.mean())
+    gain_db = min(target_dbfs - current_dbfs, max_gain_db)
+    peak = float(np.max(np.abs(audio)))
+    if peak > 0:
+        # Never push the peak over full scale
+        gain_db = min(gain_db, -20.0 * np.log10(peak))
+    return (audio * (10.0 ** (gain_db / 20.0))).astype(audio.dtype, copy=False)
@@ -0,0 +1,75 @@
+import numpy as np
+
+
+def frame_power(audio, hop_length=160, block_seconds=60, sample_rate=16000):
+    """Mean power of non-overlapping hop-sized frames
+
+    Frames are computed block by block so memory does not grow with the
+    recording length.
+    """
+    frames = len(audio) // hop_length
+    if frames == 0:
+        return np.zeros(0)
+
+    block = max(1, int(block_seconds * sample_rate) // hop_length)
+    power = np.empty(frames, dtype=np.float64)
+    for start in range(0, frames, block):
+        stop = min(start + block, frames)
+        chunk = audio[start * hop_length:stop * hop_length].reshape(stop - start, hop_length)
+        power[start:stop] = np.mean(np.square(chunk, dtype=np.float64), axis=1)
+    return power
+
+
+def relative_db(power):
+    """Frame power in dB relative to the loudest frame"""
+    if not len(power):
+        return power
+    return 10.0 * np.log10(np.maximum(power, 1e-12) / max(power.max(), 1e-12))
+
+
+def energy_speech_intervals(audio, sample_rate=16000, hop_length=160, top_db=30, min_gap=0.1):
+    """(start_sample, end_sample) regions louder than ``top_db`` below the peak
+
+    Equivalent in spirit to librosa.effects.split. Quiet gaps shorter than
+    ``min_gap`` seconds are bridged so words are not chopped apart.
+    """
+    voiced = relative_db(frame_power(audio, hop_length, sample_rate=sample_rate)) > -top_db
+    if not len(voiced):
+        return []
+
+    edges = np.diff(np.concatenate([[0], voiced.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return []
+    gaps = starts[1:] - ends[:-1]
+    keep = gaps >= int(min_gap * sample_rate / hop_length)
+    starts = np.concatenate([starts[:1], starts[1:][keep]])
+    ends = np.concatenate([ends[:-1][keep], ends[-1:]])
+    return [(int(s) * hop_length, int(e) * hop_length) for s, e in zip(starts, ends)]
+
+
+def quiet_split_points(audio, sample_rate=16000, chunk_seconds=300.0, search_seconds=10.0, hop_length=160):
+    """Sample positions that cut audio into ~``chunk_seconds`` chunks at the quietest nearby frame
+
+    Each cut is placed at the lowest-energy frame within ``search_seconds``
+    of its target, so words are rarely split between chunks. The result is
+    deterministic for the same audio, which lets chunk indexes be reused
+    across runs.
+    """
+    chunk = int(chunk_seconds * sample_rate)
+    if len(audio) <= chunk:
+        return []
+    power = frame_power(audio, hop_length, sample_rate=sample_rate)
+    search = int(search_seconds * sample_rate) // hop_length
+    points = []
+    target = chunk
+    while target < len(audio) - chunk // 4:
+        center = target // hop_length
+        low, high = max(center - search, 0), min(center + search + 1, len(power))
+        cut = (low + int(np.argmin(power[low:high]))) * hop_length if high > low else target
+        if points and cut <= points[-1]:
+            cut = target
+        points.append(cut)
+        target = cut + chunk
+    return points
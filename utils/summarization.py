@@ -1,42 +1,96 @@
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
-from sumy.summarizers.text_rank import TextRankSummarizer
 import re
+from bisect import bisect_right
+from .disfluency import DisfluencyCleaner
+from .keyphrases import extract_keyphrases, meeting_stop_words
+from .nltk_resources import word_tokenize
+from .segments import as_segment_store
+from .sentence_segmenter import SumyTokenizer
+from .summarizer_registry import DEFAULT_ENSEMBLE, EnsembleSummarizer, create_summarizer
+from .topic_segmentation import TopicSegmenter
 
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# Scored key phrases kept with a summary: enough for a word cloud, so the
+# statistics stage and the UI never extract them again
+KEYPHRASE_SCORES = 50
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+
+def _sumy_parser(text):
+    """Sumy parser for a text; sumy is imported on first use
+
+    Sentences come from the shared SentenceSegmenter, so sumy picks from
+    the same sentences as the rest of the pipeline and needs no Punkt model.
+    """
+    from sumy.parsers.plaintext import PlaintextParser
+
+    return PlaintextParser.from_string(text, SumyTokenizer())
 
 class SummaryGenerator:
-    """Handles text summarization using traditional NLP methods"""
+    """Handles text summarization using traditional NLP methods
+    
+    Every public method accepts either a plain transcript string or a
+    SegmentStore. With a store, sentences come from its precomputed
+    boundaries and extracted items carry audio timestamps and speakers.
+    
+    Long transcripts are split into topics (see TopicSegmenter); key
+    points are picked per topic and the result lists each topic with its
+    own summary, key points, action items and decisions.
+    
+    With ``clean_disfluencies`` (the default), fillers and stutters are
+    removed segment by segment before anything else sees the text, so sumy
+    ranks shorter sentences and extracted items read cleanly.
+    
+    ``model_name`` is any registered summarizer (see summarizer_registry).
+    Transcripts of 100 words or more are summarized by an ensemble of
+    ``model_name`` plus ``methods`` (default DEFAULT_ENSEMBLE), fused with
+    ``fusion``. They run in this process unless ``workers`` asks for a
+    process pool (see EnsembleSummarizer), where a method slower than
+    ``method_timeout`` seconds is left out.
+    """
     
-    def __init__(self, model_name="lsa"):
+    ACTION_PATTERNS = [
+        r"(\b[Ww]e\s+(?:need to|should|must|will)\s+[^.!?]+[.!?])",
+        r"(\b[Ii]'ll\s+[^.!?]+[.!?])",
+        r"(\b[Aa]ction\s+[^.!?]+[.!?])",
+        r"(\b[Ll]et'?s\s+[^.!?]+[.!?])",
+        r"(\b[Nn]ext\s+steps?\s*[^.!?]*[.!?])",
+        r"(\b[Tt]o\s+do\s*[^.!?]*[.!?])"
+    ]
+    
+    DECISION_PATTERNS = [
+        r"(\b[Dd]ecided\s+[^.!?]+[.!?])",
+        r"(\b[Aa]greed\s+[^.!?]+[.!?])",
+        r"(\b[Ww]e\s+will\s+[^.!?]+[.!?])",
+        r"(\b[Ff]inalized\s+[^.!?]+[.!?])",
+        r"(\b[Rr]esolved\s+[^.!?]+[.!?])"
+    ]
+    
+    # Item lists of every entry in find_topics
+    TOPIC_SECTIONS = ("summary", "key_points", "action_items", "decisions")
+    
+    def __init__(self, model_name="lsa", clean_disfluencies=True, methods=None, fusion="rrf", method_timeout=30.0,
+                 workers=0):
         self.model_name = model_name
-        self.stop_words = set(stopwords.words('english'))
+        self.ensemble = EnsembleSummarizer((model_name,) + tuple(methods or DEFAULT_ENSEMBLE), fusion=fusion,
+                                           timeout=method_timeout, workers=workers)
+        self.disfluency_cleaner = DisfluencyCleaner() if clean_disfluencies else None
+        self.stop_words = meeting_stop_words()
+        self.topic_segmenter = TopicSegmenter(stop_words=self.stop_words)
         
     def generate_summary(self, text, sentences_count=5):
         """Generate comprehensive meeting summary using traditional NLP"""
         try:
+            segments = self.clean_segments(text)
+            text = segments.text
+            
             # Use Sumy for summarization (no transformers dependency)
             if len(text.split()) < 100:
                 # For very short texts, use extractive methods
-                summary = self.extractive_summarization(text, sentences_count)
+                summary_sentences = self.extractive_sentences(segments, sentences_count)
             else:
                 # For longer texts, use multiple methods
-                summary = self.multi_method_summarization(text, sentences_count)
+                summary_sentences = self.multi_method_sentences(segments, sentences_count)
             
             # Extract structured information
-            structured_result = self.extract_structured_info(text, summary)
+            structured_result = self.extract_structured_info(segments, summary_sentences)
             
             return structured_result
             
@@ -45,51 +99,50 @@ class SummaryGenerator:
     
     def extractive_summarization(self, text, sentences_count=5):
         """Use Sumy library for extractive summarization"""
+        return " ".join(self.extractive_sentences(text, sentences_count))
+    
+    def extractive_sentences(self, text, sentences_count=5):
+        """Sentences selected by the configured Sumy summarizer"""
+        segments = as_segment_store(text)
         try:
-            parser = PlaintextParser.from_string(text, Tokenizer("english"))
-            
-            if self.model_name == "textrank":
-                summarizer = TextRankSummarizer()
-            else:  # Default to LSA
-                summarizer = LsaSummarizer()
+            parser = _sumy_parser(segments.text)
+            summarizer = create_summarizer(self.model_name)
             
-            summary_sentences = summarizer(parser.document, sentences_count)
-            summary = " ".join(str(sentence) for sentence in summary_sentences)
+            summary_sentences = [str(sentence) for sentence in summarizer(parser.document, sentences_count)]
             
-            return summary if summary else self.fallback_summary(text, sentences_count)
+            return summary_sentences if summary_sentences else self.fallback_sentences(segments, sentences_count)
             
         except Exception:
-            return self.fallback_summary(text, sentences_count)
+            return self.fallback_sentences(segments, sentences_count)
     
     def multi_method_summarization(self, text, sentences_count=5):
         """Combine multiple summarization methods"""
+        return " ".join(self.multi_method_sentences(text, sentences_count))
+    
+    def multi_method_sentences(self, text, sentences_count=5):
+        """Sentences ranked best by the ensemble's fused ranking, in transcript order"""
+        segments = as_segment_store(text)
         try:
-            # Method 1: Sumy LSA
-            parser = PlaintextParser.from_string(text, Tokenizer("english"))
-            lsa_summarizer = LsaSummarizer()
-            lsa_summary = lsa_summarizer(parser.document, sentences_count)
+            # Parsed once; every method ranks the same document
+            document = _sumy_parser(segments.text).document
+            chosen = self.ensemble.select(document, sentences_count)
+            summary_sentences = [str(document.sentences[i]) for i in chosen]
             
-            # Method 2: TextRank
-            textrank_summarizer = TextRankSummarizer()
-            textrank_summary = textrank_summarizer(parser.document, sentences_count)
-            
-            # Combine both methods
-            combined_sentences = list(lsa_summary) + list(textrank_summary)
-            unique_sentences = list(dict.fromkeys(str(s) for s in combined_sentences))
-            
-            summary = " ".join(unique_sentences[:sentences_count])
-            
-            return summary if summary else self.fallback_summary(text, sentences_count)
+            return summary_sentences if summary_sentences else self.fallback_sentences(segments, sentences_count)
             
         except Exception:
-            return self.fallback_summary(text, sentences_count)
+            return self.fallback_sentences(segments, sentences_count)
     
     def fallback_summary(self, text, sentences_count=3):
         """Fallback summary using sentence scoring"""
-        sentences = sent_tokenize(text)
+        return " ".join(self.fallback_sentences(text, sentences_count))
+    
+    def fallback_sentences(self, text, sentences_count=3):
+        """Top sentences by length and keyword score"""
+        sentences = as_segment_store(text).sentences()
         
         if len(sentences) <= sentences_count:
-            return text
+            return sentences
         
         # Simple scoring based on sentence length and keywords
         scored_sentences = []
@@ -103,87 +156,220 @@ class SummaryGenerator:
         scored_sentences.sort(reverse=True)
         top_sentences = [sentence for _, sentence in scored_sentences[:sentences_count]]
         
-        return " ".join(top_sentences)
+        return top_sentences
     
     def extract_structured_info(self, full_text, summary):
-        """Extract action items, decisions, and key points using regex patterns"""
+        """Extract action items, decisions, and key points using regex patterns
         
-        # Extract action items
-        action_items = self.extract_action_items(full_text)
+        ``summary`` is the list of selected summary sentences (a plain string
+        is accepted too). Besides the newline-joined strings, the result has
+        an "items" dict with one {"text", "start", "end", "speaker"} entry per
+        line so callers can link back to the audio, a "topics" list (see
+        find_topics), the meeting's top "keyphrases" and, for the statistics
+        and the word cloud, "keyphrase_scores": up to KEYPHRASE_SCORES
+        [phrase, score] pairs from the same extraction.
+        """
+        segments = as_segment_store(full_text)
+        if isinstance(summary, str):
+            summary_sentences = [summary] if summary else []
+        else:
+            summary_sentences = list(summary)
         
-        # Extract decisions
-        decisions = self.extract_decisions(full_text)
-        
-        # Extract key points (most important sentences)
-        key_points = self.extract_key_points(full_text)
+        topics = self.topic_segmenter.segment(segments)
+        keyphrases = extract_keyphrases(segments, KEYPHRASE_SCORES)
+        items = {
+            "overall_summary": [self._locate_item(segments, sentence) for sentence in summary_sentences],
+            # Extract action items
+            "action_items": self.find_action_items(segments),
+            # Extract decisions
+            "decisions": self.find_decisions(segments),
+            # Extract key points (most representative sentence of each topic)
+            "key_points": self.find_key_points(segments, topics),
+        }
         
         return {
-            "overall_summary": summary,
-            "action_items": action_items,
-            "decisions": decisions,
-            "key_points": key_points
+            "overall_summary": " ".join(summary_sentences),
+            "action_items": self._join_items(items["action_items"], "No specific action items identified."),
+            "decisions": self._join_items(items["decisions"], "No specific decisions identified."),
+            "key_points": self._join_items(items["key_points"], ""),
+            "items": items,
+            "topics": self.find_topics(segments, topics),
+            "keyphrases": [phrase for phrase, _ in keyphrases[:10]],
+            "keyphrase_scores": [[phrase, score] for phrase, score in keyphrases],
         }
     
-    def extract_action_items(self, text):
-        """Extract action items using pattern matching"""
-        action_patterns = [
-            r"(\b[Ww]e\s+(?:need to|should|must|will)\s+[^.!?]+[.!?])",
-            r"(\b[Ii]'ll\s+[^.!?]+[.!?])",
-            r"(\b[Aa]ction\s+[^.!?]+[.!?])",
-            r"(\b[Ll]et'?s\s+[^.!?]+[.!?])",
-            r"(\b[Nn]ext\s+steps?\s*[^.!?]*[.!?])",
-            r"(\b[Tt]o\s+do\s*[^.!?]*[.!?])"
-        ]
+    def _item(self, segments, text, start_offset, with_speaker=False):
+        """Build an item dict for a span of the transcript"""
+        start, end = segments.span_times(start_offset, start_offset + len(text))
+        speaker = segments.speaker_at(start_offset)
+        if with_speaker and speaker is not None:
+            from .diarization import speaker_name
+            text = f"{speaker_name(speaker)}: {text}"
+        return {"text": text, "start": start, "end": end, "speaker": speaker}
+    
+    def _locate_item(self, segments, sentence):
+        offset = segments.locate(sentence)
+        if offset < 0:
+            return {"text": sentence, "start": None, "end": None, "speaker": None}
+        return self._item(segments, sentence, offset)
+    
+    def relocate_items(self, summary, segments):
+        """Copy of a summary made for the same transcript text, with item times taken from ``segments``
         
-        action_items = []
-        for pattern in action_patterns:
-            matches = re.findall(pattern, text)
-            action_items.extend(matches)
+        Used when a cached summary is reused: the words match but the
+        audio positions may not.
+        """
+        segments = self.clean_segments(segments)
+        items = {
+            section: [self._relocate_item(segments, item) for item in section_items]
+            for section, section_items in summary.get("items", {}).items()
+        }
+        topics = []
+        for topic in summary.get("topics", []):
+            start, end = segments.span_times(topic["text_start"], topic["text_end"])
+            topics.append(dict(topic, start=start, end=end, **{
+                section: [self._relocate_item(segments, item) for item in topic[section]]
+                for section in self.TOPIC_SECTIONS
+            }))
+        return dict(summary, items=items, topics=topics)
+    
+    def _relocate_item(self, segments, item):
+        text = item["text"]
+        if item.get("speaker") is not None:
+            from .diarization import speaker_name
+            prefix = f"{speaker_name(item['speaker'])}: "
+            if text.startswith(prefix):
+                text = text[len(prefix):]
+        offset = segments.locate(text)
+        start, end = segments.span_times(offset, offset + len(text)) if offset >= 0 else (None, None)
+        return dict(item, start=start, end=end)
+    
+    def _join_items(self, items, empty_message):
+        return "\n".join(item["text"] for item in items) if items else empty_message
+    
+    def _pattern_matches(self, segments, patterns):
+        """(text, offset) of every match, pattern by pattern"""
+        for pattern in patterns:
+            for match in re.finditer(pattern, segments.text):
+                yield match.group(1), match.start(1)
+    
+    def _find_pattern_items(self, segments, patterns, limit=5, with_speaker=False):
+        found = []
+        for text, offset in self._pattern_matches(segments, patterns):
+            if len(found) == limit:
+                break
+            found.append(self._item(segments, text, offset, with_speaker))
+        return found
+    
+    def find_action_items(self, text):
+        """Action item dicts; prefixed with the speaker when the store is diarized"""
+        segments = as_segment_store(text)
+        return self._find_pattern_items(segments, self.ACTION_PATTERNS,
+                                        with_speaker=segments.has_speakers)
+    
+    def find_decisions(self, text):
+        """Decision item dicts"""
+        return self._find_pattern_items(as_segment_store(text), self.DECISION_PATTERNS)
+    
+    def _sentence_items(self, segments, indices):
+        return [self._item(segments, segments.sentence(i), segments.sentence_starts[i]) for i in indices]
+    
+    def _best_sentences(self, segments, topic, count):
+        """Indices of the ``count`` best-ranked sentences of a topic, skipping repeated wording"""
+        seen, best = set(), []
+        for i in topic["ranked_sentences"]:
+            sentence = segments.sentence(i)
+            if sentence not in seen:
+                seen.add(sentence)
+                best.append(i)
+                if len(best) == count:
+                    break
+        return best
+    
+    def _key_point_indices(self, segments, topics, count=5):
+        """Best sentences of each topic, ``count`` split evenly (at least one per topic)"""
+        per_topic = max(1, count // max(len(topics), 1))
+        return sorted(i for topic in topics for i in self._best_sentences(segments, topic, per_topic))
+    
+    def find_key_points(self, text, topics=None):
+        """Key point item dicts in transcript order
         
-        return "\n".join(action_items[:5]) if action_items else "No specific action items identified."
+        The sentences that best match their topic's keywords: one per topic
+        for long meetings, up to five from a meeting with a single topic.
+        ``topics`` may pass in an existing TopicSegmenter result.
+        """
+        segments = as_segment_store(text)
+        if segments.sentence_count() <= 5:
+            return self._sentence_items(segments, range(segments.sentence_count()))
+        if topics is None:
+            topics = self.topic_segmenter.segment(segments)
+        return self._sentence_items(segments, self._key_point_indices(segments, topics))
     
-    def extract_decisions(self, text):
-        """Extract decisions using pattern matching"""
-        decision_patterns = [
-            r"(\b[Dd]ecided\s+[^.!?]+[.!?])",
-            r"(\b[Aa]greed\s+[^.!?]+[.!?])",
-            r"(\b[Ww]e\s+will\s+[^.!?]+[.!?])",
-            r"(\b[Ff]inalized\s+[^.!?]+[.!?])",
-            r"(\b[Rr]esolved\s+[^.!?]+[.!?])"
-        ]
+    def find_topics(self, text, topics=None, sentences_per_topic=2, items_per_topic=5):
+        """Agenda of the meeting: one dict per topic, in order
         
-        decisions = []
-        for pattern in decision_patterns:
-            matches = re.findall(pattern, text)
-            decisions.extend(matches)
+        Each has "title", "keywords", "start"/"end" seconds (None without
+        timestamps), "text_start"/"text_end" character offsets, and item
+        lists like the top-level "items": "summary" (the
+        ``sentences_per_topic`` best sentences), "key_points",
+        "action_items" and "decisions" found inside the topic, in
+        transcript order.
+        """
+        segments = as_segment_store(text)
+        if topics is None:
+            topics = self.topic_segmenter.segment(segments)
+        text_starts = [topic["text_start"] for topic in topics]
         
-        return "\n".join(decisions[:5]) if decisions else "No specific decisions identified."
+        def by_topic(patterns, with_speaker=False):
+            found = [[] for _ in topics]
+            for match, offset in sorted(self._pattern_matches(segments, patterns), key=lambda m: m[1]):
+                bucket = found[max(bisect_right(text_starts, offset) - 1, 0)]
+                if len(bucket) < items_per_topic:
+                    bucket.append(self._item(segments, match, offset, with_speaker))
+            return found
+        
+        actions = by_topic(self.ACTION_PATTERNS, segments.has_speakers)
+        decisions = by_topic(self.DECISION_PATTERNS)
+        key_points = set(self._key_point_indices(segments, topics))
+        return [
+            {
+                "title": topic["title"],
+                "keywords": topic["keywords"],
+                "start": topic["start"],
+                "end": topic["end"],
+                "text_start": topic["text_start"],
+                "text_end": topic["text_end"],
+                "summary": self._sentence_items(
+                    segments, sorted(self._best_sentences(segments, topic, sentences_per_topic))
+                ),
+                "key_points": self._sentence_items(
+                    segments, [i for i in range(topic["start_sentence"], topic["end_sentence"]) if i in key_points]
+                ),
+                "action_items": actions[index],
+                "decisions": decisions[index],
+            }
+            for index, topic in enumerate(topics)
+        ]
+    
+    def extract_action_items(self, text):
+        """Extract action items using pattern matching"""
+        return self._join_items(self.find_action_items(text), "No specific action items identified.")
+    
+    def extract_decisions(self, text):
+        """Extract decisions using pattern matching"""
+        return self._join_items(self.find_decisions(text), "No specific decisions identified.")
     
     def extract_key_points(self, text):
         """Extract key discussion points"""
-        sentences = sent_tokenize(text)
-        
-        if len(sentences) <= 5:
-            return "\n".join(sentences)
-        
-        # Simple heuristic: longer sentences often contain more information
-        key_sentences = sorted(sentences, key=len, reverse=True)[:5]
-        
-        return "\n".join(key_sentences)
+        return self._join_items(self.find_key_points(text), "")
+    
+    def clean_segments(self, transcript):
+        """SegmentStore of a transcript with fillers and stutters removed (unchanged when cleaning is off)"""
+        segments = as_segment_store(transcript)
+        if self.disfluency_cleaner is None:
+            return segments
+        return self.disfluency_cleaner.clean_segments(segments)
     
     def clean_meeting_text(self, text):
         """Clean meeting text by removing fillers and repetitions"""
-        import re
-        
-        # Remove common filler words at the beginning of sentences
-        fillers = ['so', 'okay', 'well', 'like', 'you know', 'i mean', 'actually', 'basically']
-        pattern = r'\b(' + '|'.join(fillers) + r')\b[, ]*'
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-        
-        # Remove repeated phrases
-        text = re.sub(r'(\b\w+\b)( \1)+', r'\1', text)
-        
-        # Clean up extra spaces
-        text = re.sub(r'\s+', ' ', text).strip()
-    
-        return text
+        return (self.disfluency_cleaner or DisfluencyCleaner()).clean(text)
@@ -0,0 +1,290 @@
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+import numpy as np
+
+# name -> factory returning a summarizer; see register_summarizer
+SUMMARIZERS = {}
+
+# Methods the ensemble runs besides the configured model
+DEFAULT_ENSEMBLE = ("lsa", "textrank", "luhn")
+
+
+def register_summarizer(name, factory=None):
+    """Register ``factory()`` under ``name``; works as a decorator too
+
+    The factory returns either a sumy summarizer (any AbstractSummarizer
+    subclass) or an object with ``rank(document)`` returning sentence
+    indices best first. Pooled ensembles send the factory to freshly
+    started worker processes, so it must be a module-level function or
+    class (not a lambda).
+    """
+    if factory is None:
+        return lambda factory: register_summarizer(name, factory)
+    SUMMARIZERS[name] = factory
+    return factory
+
+
+def summarizer_names():
+    return list(SUMMARIZERS)
+
+
+def create_summarizer(name):
+    if name not in SUMMARIZERS:
+        raise ValueError(f"Unknown summarizer: {name} (available: {', '.join(SUMMARIZERS)})")
+    return SUMMARIZERS[name]()
+
+
+@register_summarizer("lsa")
+def _lsa_summarizer():
+    """Sumy's LSA summarizer with its term rows in sorted order
+
+    Sumy numbers the terms by iterating a frozenset, so the matrix rows,
+    and with them ties between sentences, change with PYTHONHASHSEED.
+    Sorting makes the same transcript give the same summary in every process.
+    """
+    from sumy.summarizers.lsa import LsaSummarizer
+
+    class SortedLsaSummarizer(LsaSummarizer):
+        def _create_dictionary(self, document):
+            words = map(self.normalize_word, document.words)
+            unique_words = sorted({self.stem_word(w) for w in words if w not in self._stop_words})
+            return {w: i for i, w in enumerate(unique_words)}
+
+    return SortedLsaSummarizer()
+
+
+@register_summarizer("textrank")
+def _textrank_summarizer():
+    from sumy.summarizers.text_rank import TextRankSummarizer
+
+    return TextRankSummarizer()
+
+
+@register_summarizer("lexrank")
+def _lexrank_summarizer():
+    from sumy.summarizers.lex_rank import LexRankSummarizer
+
+    return LexRankSummarizer()
+
+
+@register_summarizer("luhn")
+def _luhn_summarizer():
+    from sumy.summarizers.luhn import LuhnSummarizer
+
+    return LuhnSummarizer()
+
+
+@register_summarizer("kl")
+def _kl_summarizer():
+    from sumy.summarizers.kl import KLSummarizer
+
+    return KLSummarizer()
+
+
+class _Ranking:
+    """Sentence count for sumy that keeps every sentence and records the rating order
+
+    Sumy summarizers rate all sentences, sort them best first and pass the
+    list to a callable count; recording it there gives the full ranking
+    without touching each summarizer's internals.
+    """
+
+    def __init__(self):
+        self.order = []
+
+    def __call__(self, infos):
+        self.order = [info.order for info in infos]
+        return infos
+
+
+def rank_sentences(name, document, factory=None):
+    """Indices of ``document.sentences`` ranked best first by summarizer ``name`` (or ``factory()``)"""
+    summarizer = factory() if factory is not None else create_summarizer(name)
+    if hasattr(summarizer, "rank"):
+        return [int(index) for index in summarizer.rank(document)]
+    ranking = _Ranking()
+    summarizer(document, ranking)
+    return ranking.order
+
+
+def _rank_in_worker(name, factory, payload):
+    """Executed inside a worker process: (ranking, seconds) for one method
+
+    The factory travels with the task (pickled by reference), so methods
+    registered in the parent work even though the worker did not run the
+    parent's registrations.
+    """
+    started = time.perf_counter()
+    ranking = rank_sentences(name, pickle.loads(payload), factory)
+    return ranking, time.perf_counter() - started
+
+
+def _positions(rankings, count):
+    """(methods x sentences) rank of each sentence per method; unranked sentences rank last"""
+    positions = np.full((len(rankings), count), count, dtype=np.float64)
+    for row, ranking in enumerate(rankings):
+        ranking = np.asarray(ranking, dtype=np.int64)
+        positions[row, ranking] = np.arange(len(ranking))
+    return positions
+
+
+def reciprocal_rank_fusion(rankings, count, k=60):
+    """Fused ranking: each method adds 1 / (k + rank) to a sentence's score"""
+    scores = (1.0 / (k + 1 + _positions(rankings, count))).sum(axis=0)
+    return [int(i) for i in np.lexsort((np.arange(count), -scores))]
+
+
+def borda_fusion(rankings, count):
+    """Fused ranking: each method gives a sentence one point per sentence ranked below it"""
+    scores = (count - 1 - _positions(rankings, count)).clip(min=0).sum(axis=0)
+    return [int(i) for i in np.lexsort((np.arange(count), -scores))]
+
+
+FUSIONS = {"rrf": reciprocal_rank_fusion, "borda": borda_fusion}
+
+
+
+def _pool_context():
+    """Start method for ensemble workers: never fork, which is unsafe in threaded hosts like Streamlit"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _terminate_pool(executor):
+    """Stop a pool's workers, including ones still busy with a timed-out method
+
+    Python 3.14 has ProcessPoolExecutor.terminate_workers(); before that the
+    worker processes are only reachable through the executor's internals.
+    """
+    terminate = getattr(executor, "terminate_workers", None)
+    if terminate is not None:
+        terminate()
+        return
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join()
+
+
+class EnsembleSummarizer:
+    """Runs several registered summarizers on one parsed document and fuses their rankings
+
+    By default (``workers=0``) the methods run one after another in this
+    process, without timeouts. With ``workers`` > 0 (None: one per
+    method), every call starts its own pool of that many processes
+    (forkserver, or spawn where that is unavailable), pickles the parsed
+    document once and lets each method rank every sentence in a worker,
+    so the wall time is that of the slowest method rather than the sum.
+    A method that is not done within its timeout (``timeouts[name]``,
+    else ``timeout`` seconds) or fails is left out of the fusion; the
+    call's pool is shut down when it returns, and its workers are
+    terminated if one is stuck. Pools are never shared, so one call's
+    timeout cannot disturb another's. Starting workers costs about a
+    second, which only pays off for long transcripts on several cores.
+
+    Rankings are fused with reciprocal rank fusion ("rrf") or a Borda
+    count ("borda"); ties go to the earlier sentence.
+
+    ``last_run`` holds each method's status ("ok", "timeout" or "failed")
+    and seconds from the latest call.
+    """
+
+    def __init__(self, methods=DEFAULT_ENSEMBLE, fusion="rrf", timeout=30.0, timeouts=None, workers=0):
+        methods = list(dict.fromkeys(methods))
+        if not methods:
+            raise ValueError("An ensemble needs at least one method")
+        for name in methods:
+            if name not in SUMMARIZERS:
+                raise ValueError(f"Unknown summarizer: {name} (available: {', '.join(SUMMARIZERS)})")
+        if fusion not in FUSIONS:
+            raise ValueError(f"Unknown fusion: {fusion} (available: {', '.join(FUSIONS)})")
+        self.methods = methods
+        self.fusion = fusion
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        # workers=None gives one process per method, so a slow method never delays another's start
+        self.workers = len(methods) if workers is None else workers
+        self.last_run = {}
+
+    def to_dict(self):
+        """Settings that change the summary (used in checkpoint keys)"""
+        return {"methods": self.methods, "fusion": self.fusion}
+
+    def rank(self, document):
+        """Fused ranking of ``document.sentences``, best first"""
+        count = len(document.sentences)
+        if not count:
+            return []
+        if self.workers == 0:
+            rankings = self._rank_here(document)
+        else:
+            rankings = self._rank_in_pool(document)
+        if not rankings:
+            raise Exception("No summarizer finished: " + ", ".join(
+                f"{name} {run['status']}" for name, run in self.last_run.items()))
+        return FUSIONS[self.fusion](rankings, count)
+
+    def select(self, document, sentences_count):
+        """Indices of the ``sentences_count`` best sentences with distinct text, in document order"""
+        chosen, seen = [], set()
+        for index in self.rank(document):
+            text = str(document.sentences[index])
+            if text not in seen:
+                seen.add(text)
+                chosen.append(index)
+                if len(chosen) == sentences_count:
+                    break
+        return sorted(chosen)
+
+    def _rank_here(self, document):
+        self.last_run = {}
+        rankings = []
+        for name in self.methods:
+            started = time.perf_counter()
+            try:
+                rankings.append(rank_sentences(name, document))
+                status = "ok"
+            except Exception as e:
+                print(f"⚠️ {name} summarizer failed: {str(e)}")
+                status = "failed"
+            self.last_run[name] = {"status": status, "seconds": round(time.perf_counter() - started, 3)}
+        return rankings
+
+    def _rank_in_pool(self, document):
+        payload = pickle.dumps(document)
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+        started = time.monotonic()
+        futures = {name: executor.submit(_rank_in_worker, name, SUMMARIZERS[name], payload)
+                   for name in self.methods}
+
+        self.last_run = {}
+        rankings = {}
+        stuck = False
+        # Wait for the shortest deadlines first; every method's clock started at submission
+        for name in sorted(self.methods, key=self._timeout_for):
+            limit = self._timeout_for(name)
+            try:
+                ranking, seconds = futures[name].result(timeout=max(started + limit - time.monotonic(), 0))
+                rankings[name] = ranking
+                self.last_run[name] = {"status": "ok", "seconds": round(seconds, 3)}
+            except FutureTimeoutError:
+                print(f"⏱️ {name} summarizer did not finish within {limit:g}s; fusing the other methods")
+                futures[name].cancel()
+                stuck = True
+                self.last_run[name] = {"status": "timeout", "seconds": limit}
+            except Exception as e:
+                print(f"⚠️ {name} summarizer failed: {str(e)}")
+                self.last_run[name] = {"status": "failed", "seconds": round(time.monotonic() - started, 3)}
+        if stuck:
+            _terminate_pool(executor)
+        else:
+            executor.shutdown(wait=True)
+        return [rankings[name] for name in self.methods if name in rankings]
+
+    def _timeout_for(self, name):
+        return self.timeouts.get(name, self.timeout)
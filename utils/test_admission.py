@@ -0,0 +1,66 @@
+"""Tests for admission control: memory budget, fairness and queue positions
+
+    python -m pytest utils -q
+"""
+from .admission import AUDIO_MEMORY_MB_PER_SECOND, AdmissionController
+from .model_selection import MODEL_NAMES
+from .pipeline import MeetingPipeline
+
+TINY, BASE, SMALL = MODEL_NAMES["tiny"], MODEL_NAMES["base"], MODEL_NAMES["small"]
+MEMORY = {"tiny": 100, "base": 200, "small": 400}
+
+
+def controller(memory_budget_mb=500, cpu_budget=8):
+    return AdmissionController(memory_budget_mb=memory_budget_mb, cpu_budget=cpu_budget, threads_per_job=1,
+                               model_memory_mb=MEMORY)
+
+
+def test_refuses_jobs_over_the_memory_budget_until_one_finishes():
+    admission = controller()
+    first = admission.request("a", SMALL)
+    second = admission.request("b", BASE)
+    assert first.granted
+    assert not second.granted and second.position == 1
+    assert not second.wait(timeout=0.05)
+    first.release()
+    assert second.granted and second.position == 0
+    assert admission.status()["memory_used_mb"] == 200
+
+
+def test_charges_preview_models_and_audio():
+    admission = controller()
+    ticket = admission.request("a", SMALL, duration=40, extra_models=(TINY,))
+    assert ticket.memory_mb == 400 + 100 + 40 * AUDIO_MEMORY_MB_PER_SECOND
+    assert not admission.request("b", TINY).granted
+
+
+def test_a_job_larger_than_the_budget_runs_alone():
+    admission = controller(memory_budget_mb=300)
+    ticket = admission.request("a", SMALL)
+    assert ticket.granted
+    assert not admission.request("b", TINY).granted
+
+
+def test_sessions_take_turns():
+    admission = controller(memory_budget_mb=450)
+    running = admission.request("busy", SMALL)
+    busy = [admission.request("busy", SMALL) for _ in range(3)]
+    other = admission.request("other", SMALL)
+    # A session that has not been served yet goes ahead of the busy session's backlog
+    assert [t.position for t in busy + [other]] == [2, 3, 4, 1]
+
+    running.release()
+    assert other.granted and not any(t.granted for t in busy)
+    late = admission.request("other", SMALL)
+    other.release()
+    # Round-robin: "other" was served last, so "busy" goes next even though "other" queued again
+    assert busy[0].granted and not late.granted
+    assert [busy[1].position, late.position, busy[2].position] == [2, 1, 3]
+
+
+def test_unload_models_frees_the_pipeline_generators():
+    pipeline = MeetingPipeline(BASE, "lsa")
+    pipeline.get_transcript_generator()
+    pipeline.get_transcript_generator(TINY)
+    pipeline.unload_models()
+    assert pipeline._transcript_generators == {}
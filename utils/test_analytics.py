@@ -0,0 +1,84 @@
+"""Tests for cross-meeting analytics: rollup merges, series and tag views
+
+    python -m pytest utils -q
+"""
+from datetime import date
+
+import pytest
+
+from .analytics import MeetingAnalytics, Rollup, TopTerms, duration_labels, period_key
+
+STOP_WORDS = {"the", "is", "we", "to", "and", "a", "on"}
+
+
+def meeting(created_at, transcript, minutes, tags=(), action_items=1):
+    return {
+        "created_at": created_at,
+        "transcript": transcript,
+        "audio_info": {"duration": minutes * 60.0},
+        "statistics": {"total_words": len(transcript.split())},
+        "summary": {"items": {"action_items": [{"text": "x"}] * action_items, "decisions": []}},
+        "tags": list(tags),
+    }
+
+
+@pytest.fixture
+def analytics(tmp_path):
+    analytics = MeetingAnalytics(str(tmp_path / "analytics.db"), stop_words=STOP_WORDS)
+    # Mon 2 and Wed 4 March are ISO week 10, Mon 9 March is week 11
+    analytics.record(meeting("2026-03-02T09:00:00", "budget budget budget review", 20, tags=["finance"]))
+    analytics.record(meeting("2026-03-04T09:00:00", "budget and hiring plan", 50, tags=["finance", "eng"]))
+    analytics.record(meeting("2026-03-09T09:00:00", "hiring hiring interviews", 95, tags=["eng"],
+                             action_items=3))
+    yield analytics
+    analytics.close()
+
+
+def test_series_by_week_and_day(analytics):
+    weeks = analytics.series("week")
+    assert [(week["period"], week["meetings"], week["action_items"]) for week in weeks] == [
+        ("2026-W10", 2, 2), ("2026-W11", 1, 3)]
+    assert weeks[0]["audio_minutes"] == pytest.approx(70)
+    assert weeks[0]["top_terms"][0] == ("budget", 4)
+
+    days = analytics.series("day", start=date(2026, 3, 3), end=date(2026, 3, 10))
+    assert [day["period"] for day in days] == ["2026-03-04", "2026-03-09"]
+    with pytest.raises(ValueError):
+        analytics.series("month")
+
+
+def test_summary_merges_day_rollups(analytics):
+    total = analytics.summary()
+    assert (total["meetings"], total["words"], total["action_items"]) == (3, 11, 5)
+    labels = duration_labels()
+    assert (total["duration_histogram"][labels[1]], total["duration_histogram"][labels[3]],
+            total["duration_histogram"][labels[-1]]) == (1, 1, 1)
+    assert dict(total["top_terms"])["hiring"] == 3
+
+    assert analytics.summary(start=date(2026, 3, 5))["meetings"] == 1
+
+
+def test_tags(analytics):
+    assert analytics.tags() == ["eng", "finance"]
+    assert [week["meetings"] for week in analytics.series("week", tag="eng")] == [1, 1]
+    compared = analytics.compare_tags(top_terms=1)
+    assert (compared["finance"]["meetings"], compared["finance"]["top_terms"]) == (2, [("budget", 4)])
+
+
+def test_merged_rollups_equal_one_rollup_of_everything():
+    meetings = [(600, 100, 1, 0, {"budget": 3, "plan": 1}), (3000, 400, 2, 1, {"plan": 2, "hiring": 5})]
+    together = Rollup(terms=TopTerms(10))
+    parts = []
+    for meeting_args in meetings:
+        together.add_meeting(*meeting_args)
+        part = Rollup(terms=TopTerms(10))
+        part.add_meeting(*meeting_args)
+        parts.append(part)
+    merged = parts[0].merge(parts[1])
+    assert merged.to_dict() == together.to_dict()
+    assert merged.terms.top(2) == [("hiring", 5), ("budget", 3)]
+
+
+def test_period_key():
+    assert period_key(date(2026, 1, 1), "day") == "2026-01-01"
+    assert period_key(date(2026, 1, 1), "week") == "2026-W01"
@@ -0,0 +1,82 @@
+"""Tests for the HTTP service: validation, job lifecycle endpoints and back-pressure
+
+    python -m pytest utils -q
+"""
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from aiohttp import FormData, test_utils
+
+import api_server
+
+
+def upload(filename="meeting.wav", content=b"RIFF0000WAVE"):
+    data = FormData()
+    data.add_field("file", content, filename=filename, content_type="application/octet-stream")
+    return data
+
+
+def run(scenario, max_queued=2):
+    """Run ``scenario(client)`` against an app whose workers never pick jobs up"""
+    async def main():
+        app = api_server.create_app(workers=1, max_queued=max_queued)
+        async with test_utils.TestClient(test_utils.TestServer(app)) as client:
+            return await scenario(client)
+    return asyncio.run(main())
+
+
+@pytest.fixture(autouse=True)
+def idle_workers(monkeypatch):
+    # Jobs stay queued, so the endpoints are tested without running Whisper
+    monkeypatch.setattr(api_server.JobManager, "start", lambda self: None)
+
+
+def test_health():
+    async def scenario(client):
+        response = await client.get("/health")
+        assert response.status == 200
+        return await response.json()
+    health = run(scenario)
+    assert (health["queued"], health["max_queued"], health["running"], health["workers"]) == (0, 2, 0, 1)
+    assert "memory_budget_mb" in health["admission"]
+
+
+@pytest.mark.parametrize("query, filename, status", [
+    ("?transcription_model=whisper-huge", "meeting.wav", 400),
+    ("?summarization_model=nope", "meeting.wav", 400),
+    ("?preset=fastest", "meeting.wav", 400),
+    ("", "notes.txt", 415),
+])
+def test_rejects_bad_submissions(query, filename, status):
+    async def scenario(client):
+        response = await client.post(f"/jobs{query}", data=upload(filename))
+        return response.status
+    assert run(scenario) == status
+
+
+def test_job_lifecycle_and_full_queue():
+    async def scenario(client):
+        response = await client.post("/jobs?summarization_model=lsa&preset=fast&language=en",
+                                     data=upload(), headers={"X-Session-Id": "team-a"})
+        assert response.status == 202
+        job = await response.json()
+        assert response.headers["Location"] == f"/jobs/{job['job_id']}"
+        assert (job["status"], job["filename"], job["decode_options"]["preset"]) == ("queued", "meeting.wav", "fast")
+        manager = client.app["job_manager"]
+        assert os.path.exists(manager.jobs[job["job_id"]].audio_path)
+        assert manager.jobs[job["job_id"]].session_id == "team-a"
+
+        status = await (await client.get(f"/jobs/{job['job_id']}")).json()
+        assert status["job_id"] == job["job_id"]
+        assert (await client.get(f"/jobs/{job['job_id']}/result")).status == 409
+        assert (await client.get("/jobs/unknown")).status == 404
+
+        full = await client.post("/jobs", data=upload())
+        assert full.status == 503 and full.headers["Retry-After"] == "10"
+        for queued in manager.jobs.values():
+            os.unlink(queued.audio_path)
+    run(scenario, max_queued=1)
@@ -0,0 +1,78 @@
+"""Tests for checkpointed transcription: resuming after a partial failure
+
+    python -m pytest utils -q
+"""
+import numpy as np
+import pytest
+import soundfile as sf
+
+from .checkpoints import CheckpointStore
+from .transcription import SAMPLE_RATE, TranscriptGenerator
+
+
+class FlakyWhisper:
+    """Stands in for a loaded Whisper model; raises on the ``fail_on``-th call"""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        self.calls.append(options.get("initial_prompt"))
+        if len(self.calls) == self.fail_on:
+            raise RuntimeError("worker killed")
+        return {"segments": [{"start": 0.0, "end": len(audio) / SAMPLE_RATE,
+                              "text": f" Part {len(self.calls)} of the meeting."}]}
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """10 s of four tone bursts, which split into four chunks of about 3 s"""
+    t = np.arange(2 * SAMPLE_RATE) / SAMPLE_RATE
+    burst = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    audio = np.concatenate([burst, np.zeros(SAMPLE_RATE // 2, dtype=np.float32)] * 4)
+    path = str(tmp_path / "meeting.wav")
+    sf.write(path, audio, SAMPLE_RATE)
+    return path
+
+
+def generator(model):
+    generator = TranscriptGenerator("tiny", chunk_seconds=3)
+    generator.model = model
+    return generator
+
+
+def test_resumes_from_the_chunks_finished_before_a_failure(recording, tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    crashed = FlakyWhisper(fail_on=3)
+    with pytest.raises(Exception, match="worker killed"):
+        generator(crashed).transcribe_with_segments(recording, store.open(recording, model="tiny"))
+    assert sorted(store.open(recording, model="tiny").chunks()) == [0, 1]
+
+    retry = FlakyWhisper()
+    segments = generator(retry).transcribe_with_segments(recording, store.open(recording, model="tiny"))
+    # Only the two missing chunks ran again, prompted with the end of the saved ones
+    assert len(retry.calls) == 2 and "Part 2 of the meeting." in retry.calls[0]
+    assert [segment.text for segment in segments] == [
+        "Part 1 of the meeting.", "Part 2 of the meeting.", "Part 1 of the meeting.", "Part 2 of the meeting."]
+    assert [segment.start for segment in segments] == [0.0, 2.0, 5.0, 8.0]
+    store.close()
+
+
+def test_checkpoints_are_keyed_by_settings(recording, tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    checkpoint = store.open(recording, model="tiny")
+    checkpoint.save_chunk(0, [{"start": 0.0, "end": 1.0, "text": "Hi."}])
+    assert store.open(recording, model="tiny").chunks() == {0: [{"start": 0.0, "end": 1.0, "text": "Hi."}]}
+    assert store.open(recording, model="base").chunks() == {}
+
+    calls = []
+    compute = lambda: calls.append(1) or {"words": 3}
+    assert checkpoint.cached("statistics", compute) == {"words": 3}
+    assert store.open(recording, model="tiny").cached("statistics", compute) == {"words": 3}
+    assert len(calls) == 1
+
+    checkpoint.clear()
+    assert store.open(recording, model="tiny").chunks() == {}
+    assert store.prune(max_age_hours=-1) == 2
+    store.close()
@@ -0,0 +1,63 @@
+"""Tests for speaker diarization: clustering, turns and speaker assignment
+
+    python -m pytest utils -q
+"""
+import numpy as np
+
+from .diarization import SpeakerDiarizer, assign_speakers, format_speaker_transcript
+from .segments import SegmentStore
+
+SAMPLE_RATE = 16000
+
+
+def voices(rng, count, dims=40):
+    """Unit embeddings scattered tightly around ``count`` orthogonal speaker directions"""
+    return [np.eye(dims)[speaker] * 5 + rng.normal(0, 0.3, dims) for speaker in range(count)]
+
+
+def normalized(rows):
+    rows = np.array(rows, dtype=np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def test_cluster_separates_speakers_in_order_of_appearance():
+    rng = np.random.default_rng(0)
+    centers = voices(rng, 3)
+    order = [2, 2, 0, 1, 0, 2, 1, 1, 0]
+    embeddings = normalized([centers[speaker] + rng.normal(0, 0.3, 40) for speaker in order])
+    labels = SpeakerDiarizer().cluster(embeddings)
+    assert labels.tolist() == [0, 0, 1, 2, 1, 0, 2, 2, 1]
+
+
+def test_cluster_caps_speakers_and_handles_no_windows():
+    rng = np.random.default_rng(1)
+    embeddings = normalized(voices(rng, 5))
+    assert set(SpeakerDiarizer(max_speakers=2).cluster(embeddings).tolist()) <= {0, 1}
+    assert len(SpeakerDiarizer().cluster(np.zeros((0, 40), dtype=np.float32))) == 0
+
+
+def tone(frequency, seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return 0.5 * np.sin(2 * np.pi * frequency * t) * (1 + 0.3 * np.sin(2 * np.pi * 3 * t))
+
+
+def test_diarize_audio_finds_alternating_turns():
+    silence = np.zeros(SAMPLE_RATE)
+    audio = np.concatenate([tone(180, 4), silence, tone(1400, 4), silence, tone(180, 4)]).astype(np.float32)
+    turns = SpeakerDiarizer(sample_rate=SAMPLE_RATE).diarize_audio(audio)
+    assert [turn["speaker"] for turn in turns] == [0, 1, 0]
+    assert [round(turn["start"]) for turn in turns] == [0, 5, 10]
+
+
+def test_assign_speakers_by_overlap():
+    segments = SegmentStore.from_dicts([
+        {"start": 0.0, "end": 3.0, "text": "Hello all."},
+        {"start": 3.0, "end": 6.0, "text": "Mostly the second speaker."},
+        {"start": 9.0, "end": 10.0, "text": "After every turn."},
+    ])
+    turns = [{"start": 0.0, "end": 3.5, "speaker": 0}, {"start": 3.5, "end": 8.0, "speaker": 1}]
+    assign_speakers(segments, turns)
+    assert [segment.speaker for segment in segments] == [0, 1, 1]
+    assert format_speaker_transcript(segments) == (
+        "Speaker 1: Hello all.\n\nSpeaker 2: Mostly the second speaker. After every turn."
+    )
@@ -0,0 +1,95 @@
+"""Tests for the export formats: subtitle timestamps, JSON and Markdown shape
+
+    python -m pytest utils -q
+"""
+import io
+import json
+import zipfile
+
+import pytest
+
+from .exports import EXPORT_FORMATS, export_bytes, export_filename, export_zip
+
+RESULT = {
+    "source": "standup.mp3",
+    "created_at": "2026-03-02T09:30:05",
+    "transcription_model": "openai/whisper-base",
+    "summarization_model": "lsa",
+    "audio_info": {"duration": 3725.0},
+    "transcript": "Welcome back. Ship it <today> & tell QA.",
+    "segments": [
+        {"start": 0.0, "end": 1.5, "speaker": 0, "text": "Welcome back."},
+        {"start": 3661.25, "end": 3663.999, "speaker": 1, "text": "Ship it <today> & tell QA."},
+        {"start": None, "end": None, "speaker": None, "text": "Untimed aside."},
+    ],
+    "summary": {
+        "overall_summary": "Welcome back.",
+        "items": {
+            "overall_summary": [{"text": "Welcome back.", "start": 0.0}],
+            "action_items": [{"text": "Ship it today.", "start": 3661.25}],
+            "decisions": [],
+            "key_points": [],
+        },
+        "keyphrases": ["ship", "qa"],
+    },
+    "statistics": {"total_words": 9, "unique_words": 9, "sentences": 2, "words_per_minute": 0.15,
+                   "most_common_words": [["ship", 1], ["qa", 1]]},
+    "tags": ["eng"],
+}
+
+
+def text(name, result=RESULT):
+    return export_bytes(result, name).decode("utf-8")
+
+
+def test_srt_cues():
+    assert text("srt") == (
+        "1\n00:00:00,000 --> 00:00:01,500\nSpeaker 1: Welcome back.\n\n"
+        "2\n01:01:01,250 --> 01:01:03,999\nSpeaker 2: Ship it <today> & tell QA.\n\n"
+    )
+
+
+def test_vtt_cues_escape_text_and_tag_voices():
+    assert text("vtt") == (
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:01.500\n<v Speaker 1>Welcome back.\n\n"
+        "01:01:01.250 --> 01:01:03.999\n<v Speaker 2>Ship it &lt;today&gt; &amp; tell QA.\n\n"
+    )
+
+
+def test_json_is_the_full_result():
+    assert json.loads(text("json")) == RESULT
+
+
+def test_markdown_shape():
+    markdown = text("md")
+    headings = [line for line in markdown.splitlines() if line.startswith("#")]
+    assert headings == ["# standup", "## Executive Summary", "## Action Items", "## Statistics", "## Transcript"]
+    assert "**Tags:** eng" in markdown and "**Key phrases:** ship, qa" in markdown
+    assert "- [ ] [1:01:01] Ship it today.\n" in markdown
+    assert "`00:00` **Speaker 1:** Welcome back.\n\n`1:01:01` **Speaker 2:** Ship it <today> & tell QA.\n" in markdown
+    assert "| Words | 9 |" in markdown and "Untimed aside.\n" in markdown
+
+
+def test_filenames_and_zip():
+    assert export_filename(RESULT, "srt") == "standup_20260302_093005.srt"
+    assert export_filename({"source": "a.wav"}, "transcript") == "a_transcript.txt"
+    with pytest.raises(ValueError):
+        export_filename(RESULT, "pdf")
+
+    buffer = io.BytesIO()
+    assert export_zip([RESULT, RESULT, {"source": "broken.mp3", "error": "boom"}], buffer) == 2
+    with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as archive:
+        names = archive.namelist()
+        assert len(names) == 7 and "errors.txt" in names
+        assert archive.read("errors.txt") == b"broken.mp3: boom\n"
+
+
+@pytest.mark.parametrize("name", list(EXPORT_FORMATS))
+def test_every_format_exports_a_result_without_segments(name):
+    exported = export_bytes({"source": "x.mp3", "transcript": "Hello."}, name)
+    if name in ("srt", "vtt"):
+        # Subtitles need timestamps, so an untimed transcript has no cues
+        assert exported == {"srt": b"", "vtt": b"WEBVTT\n\n"}[name]
+    else:
+        assert exported
@@ -0,0 +1,44 @@
+"""Tests for the meeting store: saving and reloading full results
+
+    python -m pytest utils -q
+"""
+import json
+import sqlite3
+
+from .meeting_store import MeetingStore
+from .pipeline import MeetingPipeline
+
+AUDIO_INFO = {"duration": 600.0, "sample_rate": 16000, "channels": 1, "samples": 9600000}
+
+
+def test_round_trip(diarized_corpus, tmp_path):
+    store = MeetingStore(str(tmp_path / "meetings.db"))
+    pipeline = MeetingPipeline(summarization_model="lsa", meeting_store=store)
+    result = pipeline.finish("standup.mp3", AUDIO_INFO, diarized_corpus["medium"], tags=["weekly", "eng"],
+                             model_selection={"model": "openai/whisper-base", "reason": "test"},
+                             postprocessing={"merged": 3})
+    assert result["summary"]["keyphrase_scores"]
+
+    loaded = store.get(result["meeting_id"])
+    expected = json.loads(json.dumps(dict(result, related=None)))
+    actual = json.loads(json.dumps(dict(loaded, related=None)))
+    assert actual == expected
+    assert store.list_meetings()[0]["tags"] == ["weekly", "eng"]
+    store.close()
+
+
+def test_opens_a_store_from_before_the_json_columns(tmp_path):
+    path = str(tmp_path / "meetings.db")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE meetings (id INTEGER PRIMARY KEY, source TEXT NOT NULL, "
+                       "created_at TEXT NOT NULL, duration REAL, sample_rate INTEGER, channels INTEGER, "
+                       "samples INTEGER, transcription_model TEXT, summarization_model TEXT, timings TEXT)")
+    connection.execute("INSERT INTO meetings (source, created_at, timings) VALUES ('old.mp3', '2026-01-05', '{}')")
+    connection.commit()
+    connection.close()
+
+    store = MeetingStore(path)
+    [meeting] = store.list_meetings()
+    assert (meeting["tags"], meeting["decode_options"]) == ([], None)
+    assert store.get(meeting["id"])["summary"]["keyphrase_scores"] == []
+    store.close()
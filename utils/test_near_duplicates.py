@@ -0,0 +1,81 @@
+"""Tests for near-duplicate detection and the reused-results cache
+
+    python -m pytest utils -q
+"""
+import pytest
+
+from .near_duplicates import DuplicateIndex, MinHasher, shingles
+from .pipeline import MeetingPipeline
+
+AUDIO_INFO = {"duration": 600.0, "sample_rate": 16000, "channels": 1, "samples": 9600000}
+PRICING = (
+    "Priya opened with the pricing page. Conversion dropped after the redesign, mostly on mobile, "
+    "and the annual plan toggle confuses people. Marcus thinks the comparison table is too long. "
+    "Elena wants to test two layouts for a week before anything ships. We agreed to keep the free "
+    "tier as it is and revisit enterprise pricing in the next planning cycle. Support tickets about "
+    "invoices doubled, so finance will join the next call to explain the billing changes."
+)
+HIRING = (
+    "Ken reviewed the hiring plan for the platform team. Two backend roles are open and one offer "
+    "is pending. Interview loops take too long because panels are hard to schedule across time "
+    "zones, so recruiters will batch them on Tuesdays. Aisha asked for a clearer rubric for the "
+    "system design round, and Tom will draft one with the staff engineers by the end of the month."
+)
+
+
+def result(source, transcript, action_items=()):
+    return {"source": source, "created_at": "2026-03-02T10:00:00", "transcript": transcript,
+            "summary": {"items": {"action_items": [{"text": text} for text in action_items]}}}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = DuplicateIndex(str(tmp_path / "duplicates.db"))
+    yield index
+    index.close()
+
+
+def test_minhash_estimates_jaccard_similarity():
+    first = {f"shingle {i}" for i in range(300)}
+    second = {f"shingle {i}" for i in range(100, 400)}
+    hasher = MinHasher(num_perm=256)
+    # Exact Jaccard: 200 shared of 400
+    assert hasher.similarity(hasher.signature(first), hasher.signature(second)) == pytest.approx(0.5, abs=0.1)
+    assert hasher.similarity(hasher.signature(first), hasher.signature(set(first))) == 1.0
+    assert shingles("We ship it", 3) == {"we ship it"} and shingles("", 3) == set()
+
+
+def test_finds_near_duplicate_meetings_and_recurring_items(index):
+    edited = PRICING.replace("mostly on mobile", "mostly on phones")
+    original = index.add_meeting(result("monday.mp3", PRICING,
+                                        ["Priya will send the pricing page mockups by Friday."]))
+    index.add_meeting(result("other.mp3", HIRING))
+
+    [match] = index.similar_meetings(edited)
+    assert (match["meeting_id"], match["source"]) == (original, "monday.mp3") and match["similarity"] > 0.7
+    assert index.similar_meetings(edited, exclude=original) == []
+
+    [recurring] = index.recurring_action_items(["Priya will send the pricing page mockups by Monday.",
+                                                "Tom books the venue."])
+    assert recurring["text"].endswith("by Monday.") and recurring["matches"][0]["meeting_id"] == original
+
+    index.delete_meeting(original)
+    assert index.similar_meetings(edited) == []
+
+
+def test_pipeline_reuses_results_for_an_unchanged_transcript(diarized_corpus, index):
+    segments = diarized_corpus["medium"]
+    pipeline = MeetingPipeline(summarization_model="lsa", duplicate_index=index)
+    first = pipeline.finish("first.mp3", AUDIO_INFO, segments)
+    assert "summary" in first["timings"]
+
+    second = pipeline.finish("second.mp3", AUDIO_INFO, segments)
+    assert "summary" not in second["timings"]
+    assert second["summary"]["keyphrases"] == first["summary"]["keyphrases"]
+    assert second["statistics"]["total_words"] == first["statistics"]["total_words"]
+    assert second["related"]["similar_meetings"][0]["similarity"] == 1.0
+
+    # Different summary settings do not share cached results
+    other = MeetingPipeline(summarization_model="lsa", duplicate_index=index, clean_disfluencies=False)
+    assert index.cached_results(segments, other.summary_settings()) is None
+    assert "summary" in other.finish("third.mp3", AUDIO_INFO, segments)["timings"]
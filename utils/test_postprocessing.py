@@ -0,0 +1,79 @@
+"""Tests for the confidence-based transcript post-processing
+
+    python -m pytest utils -q
+"""
+import numpy as np
+
+from .postprocessing import TranscriptPostProcessor, compression_ratio, larger_model, low_confidence_segments
+from .segments import SegmentStore
+
+
+def segment(start, text, logprob=-0.3, no_speech=0.05, duration=4.0):
+    return {"start": start, "end": start + duration, "text": text, "avg_logprob": logprob,
+            "no_speech_prob": no_speech}
+
+
+def test_drops_hallucinations_on_silence():
+    kept, dropped = TranscriptPostProcessor().filter([
+        segment(0, " Let's look at the budget."),
+        segment(4, " Thank you for watching!", logprob=-0.4, no_speech=0.9),
+        segment(8, " The the the the the the the the the the the the the the the the the the."),
+        segment(12, " Something unclear.", logprob=-1.6, no_speech=0.8),
+        segment(16, " Thank you.", no_speech=0.1),
+    ])
+    assert [s["text"] for s in kept] == [" Let's look at the budget.", " Thank you."]
+    assert [s["reason"].split(" (")[0] for s in dropped] == [
+        "no speech", "repetitive text", "no speech"
+    ]
+
+
+def test_repeats_are_capped():
+    processor = TranscriptPostProcessor(max_repeats=2)
+    kept, dropped = processor.filter([segment(i * 4, " We need more time.") for i in range(5)])
+    assert len(kept) == 2 and len(dropped) == 3
+    kept, _ = processor.filter([segment(0, " Okay."), segment(4, " Okay.", logprob=-1.2)])
+    assert len(kept) == 1
+
+
+def test_refines_only_the_worst_spans_within_budget():
+    segments = [segment(i * 4, f" Sentence number {i}.") for i in range(10)]
+    segments[2]["avg_logprob"] = segments[3]["avg_logprob"] = -1.5
+    segments[7]["avg_logprob"] = -0.9
+    processor = TranscriptPostProcessor(max_refine_fraction=0.2, padding=0.0)
+    assert processor.refine_spans(segments) == [(2, 3)]
+
+    calls = []
+
+    def transcribe(piece, offset):
+        calls.append((len(piece), offset))
+        return [segment(offset, " A much clearer sentence.", logprob=-0.2, duration=len(piece) / 16000)]
+
+    audio = np.zeros(40 * 16000, dtype=np.float32)
+    refined_segments, refined = processor.refine_segments(segments, audio, transcribe)
+    assert calls == [(8 * 16000, 8.0)]
+    assert len(refined_segments) == 9
+    assert refined_segments[2]["text"] == " A much clearer sentence."
+    assert refined[0]["before"] == "Sentence number 2. Sentence number 3."
+
+
+def test_keeps_original_when_refinement_is_no_better():
+    segments = [segment(0, " Mumbled words.", logprob=-1.2), segment(4, " Clear words.")]
+
+    def transcribe(piece, offset):
+        return [segment(offset, " Other mumbled words.", logprob=-1.15)]
+
+    result, refined = TranscriptPostProcessor().refine_segments(segments, np.zeros(16000 * 8), transcribe)
+    assert result == segments and refined == []
+
+
+def test_low_confidence_segments_and_helpers():
+    store = SegmentStore.from_whisper([segment(0, " Clear."), segment(4, " Unclear.", logprob=-1.5)])
+    assert low_confidence_segments(store) == [1]
+    assert larger_model("openai/whisper-tiny") == "base" and larger_model("small") is None
+    assert compression_ratio("abc " * 50) > 2.4 > compression_ratio("We agreed to ship on Friday.")
+
+
+def test_settings_that_change_the_transcript_are_in_to_dict():
+    base = TranscriptPostProcessor().to_dict()
+    assert TranscriptPostProcessor(padding=1.0).to_dict() != base
+    assert TranscriptPostProcessor(min_gain=0.5).to_dict() != base
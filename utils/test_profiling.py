@@ -0,0 +1,59 @@
+"""Tests for per-meeting profiling: report folder contents and the on/off switch
+
+    python -m pytest utils -q
+"""
+import os
+import time
+
+import numpy as np
+import pytest
+
+from .profiling import PROFILE_ENV, RunProfiler, profiling_enabled
+
+
+def busy_work(seconds=0.2):
+    buffers = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        buffers.append(np.ones(50_000))
+    return len(buffers)
+
+
+def test_writes_reports_in_a_folder_per_run(tmp_path):
+    with RunProfiler("Team sync #3.mp3", enabled=True, output_dir=str(tmp_path)) as profiler:
+        busy_work()
+
+    assert os.path.dirname(profiler.path) == str(tmp_path)
+    assert os.path.basename(profiler.path).endswith("_Team_sync_3")
+    assert sorted(os.listdir(profiler.path)) == ["flamegraph.folded", "profile.prof", "report.txt"]
+    assert profiler.summary["samples"] > 0 and not profiler.summary["failed"]
+    with open(os.path.join(profiler.path, "report.txt"), encoding="utf-8") as f:
+        report = f.read()
+    assert report.startswith("PROFILE: Team sync #3.mp3\n")
+    assert "MEMORY ALLOCATORS" in report and "busy_work" in report
+    with open(os.path.join(profiler.path, "flamegraph.folded"), encoding="utf-8") as f:
+        assert any("busy_work (test_profiling.py" in line for line in f)
+
+
+def test_a_failed_run_still_gets_a_report(tmp_path):
+    with pytest.raises(RuntimeError):
+        with RunProfiler("broken.wav", enabled=True, output_dir=str(tmp_path)) as profiler:
+            busy_work(0.05)
+            raise RuntimeError("transcription failed")
+    assert profiler.summary["failed"]
+    with open(os.path.join(profiler.path, "report.txt"), encoding="utf-8") as f:
+        assert f.readline() == "PROFILE: broken.wav (run failed)\n"
+
+
+def test_disabled_profiler_does_nothing(tmp_path, monkeypatch):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    with RunProfiler("quiet.mp3", output_dir=str(tmp_path)) as profiler:
+        busy_work(0.01)
+    assert profiler.path is None and os.listdir(tmp_path) == []
+
+
+def test_profiling_enabled(monkeypatch):
+    monkeypatch.setenv(PROFILE_ENV, "yes")
+    assert profiling_enabled() and not profiling_enabled(False)
+    monkeypatch.setenv(PROFILE_ENV, "0")
+    assert not profiling_enabled() and profiling_enabled(True)
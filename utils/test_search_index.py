@@ -0,0 +1,81 @@
+"""Tests for the meeting search index: FTS5 hits and TF-IDF similarity
+
+    python -m pytest utils -q
+"""
+import pytest
+
+from .search_index import MeetingSearchIndex, tokenize
+
+
+def meeting(source, lines, action_items=(), keyphrases=()):
+    return {
+        "source": source,
+        "created_at": "2026-03-02T10:00:00",
+        "audio_info": {"duration": 60.0},
+        "segments": [{"start": 10.0 * i, "end": 10.0 * i + 9, "speaker": i % 2, "text": text}
+                     for i, text in enumerate(lines)],
+        "summary": {
+            "items": {"action_items": [{"text": text, "start": 5.0, "speaker": 1} for text in action_items]},
+            "keyphrases": list(keyphrases),
+        },
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = MeetingSearchIndex(str(tmp_path / "search.db"))
+    index.add_meeting(meeting("budget.mp3", ["The quarterly budget is over by ten percent.",
+                                             "Marketing spend needs to come down."],
+                              action_items=["Elena will revise the budget forecast."],
+                              keyphrases=["quarterly budget", "marketing spend"]))
+    index.add_meeting(meeting("migration.mp3", ["We are migrating the database this weekend.",
+                                                "The rollback plan is ready."],
+                              keyphrases=["database migration"]))
+    index.add_meeting(meeting("hiring.mp3", ["Two backend roles are open.", "Interviews start Monday."]))
+    yield index
+    index.close()
+
+
+def test_search_ranks_stemmed_matches_with_snippets(index):
+    hits = index.search("migration")
+    assert {hit["title"] for hit in hits} == {"migration.mp3"}
+    transcript = next(hit for hit in hits if hit["kind"] == "transcript")
+    assert "**migrating**" in transcript["snippet"] and transcript["start"] == 0.0
+
+
+def test_search_filters_kinds_and_ignores_query_syntax(index):
+    hits = index.search("budget", kinds=["action_item"])
+    assert [(hit["title"], hit["kind"], hit["speaker"]) for hit in hits] == [("budget.mp3", "action_item", 1)]
+    assert [hit["title"] for hit in index.search('forecast" (')] == ["budget.mp3"]
+    assert index.search("  ") == []
+
+
+def test_similar_prefers_the_meeting_about_the_query(index):
+    hits = index.similar("database rollback this weekend")
+    assert hits[0]["title"] == "migration.mp3"
+    assert all(hit["score"] <= hits[0]["score"] for hit in hits)
+    assert index.similar("zebra") == []
+
+
+def test_replacing_and_deleting_meetings_updates_both_indexes(index):
+    meeting_id = index.search("interviews")[0]["meeting_id"]
+    index.add_meeting(meeting("hiring.mp3", ["Offers went out to two engineers."]), meeting_id=meeting_id)
+    assert index.search("interviews") == []
+    assert index.similar("offers engineers")[0]["meeting_id"] == meeting_id
+
+    index.delete_meeting(meeting_id)
+    assert index.meeting_count() == 2
+    assert index.search("offers") == [] and index.similar("offers engineers") == []
+
+
+def test_vector_index_can_be_disabled(tmp_path):
+    index = MeetingSearchIndex(str(tmp_path / "fts_only.db"), vector_index=False)
+    index.add_meeting(meeting("a.mp3", ["Budget review."]))
+    assert index.search("budget")[0]["title"] == "a.mp3"
+    with pytest.raises(ValueError):
+        index.similar("budget")
+    index.close()
+
+
+def test_tokenize():
+    assert tokenize("We'll ship v2 on Friday!") == ["we'll", "ship", "v2", "on", "friday"]
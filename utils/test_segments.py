@@ -0,0 +1,26 @@
+"""Tests for SegmentStore round trips
+
+    python -m pytest utils -q
+"""
+import math
+
+from .segments import SegmentStore
+
+
+def test_round_trip_skips_empty_rows():
+    store = SegmentStore.from_dicts([
+        {"start": 0.0, "end": 1.0, "text": "  ", "speaker": 0, "confidence": 0.1},
+        {"start": 1.0, "end": 3.0, "text": "hello there.", "speaker": 1, "confidence": 0.9},
+        {"start": 3.0, "end": 4.0, "text": "", "speaker": 2, "confidence": 0.2},
+        {"start": 4.0, "end": 6.0, "text": "Bye now.", "speaker": None, "confidence": None},
+    ])
+    rows = store.to_dicts()
+    assert [(r["text"], r["speaker"], r["start"]) for r in rows] == [("hello there.", 1, 1.0), ("Bye now.", None, 4.0)]
+    assert math.isclose(rows[0]["confidence"], 0.9, rel_tol=1e-6)
+    assert SegmentStore.from_dicts(rows).to_dicts() == rows
+
+
+def test_round_trip_of_text_without_timestamps():
+    rows = SegmentStore.from_text("One sentence. Another one.").to_dicts()
+    assert rows[0]["start"] is None and rows[0]["end"] is None
+    assert SegmentStore.from_dicts(rows).text == "One sentence. Another one."
@@ -0,0 +1,64 @@
+"""Tests for silence trimming: kept intervals and TimeMap remapping
+
+    python -m pytest utils -q
+"""
+import numpy as np
+import pytest
+
+from .silence_trimmer import SilenceTrimmer, TimeMap, normalize_loudness
+
+SAMPLE_RATE = 16000
+
+
+def test_to_original_maps_times_within_kept_chunks():
+    # Kept: 2-5 s and 10-14 s of the original, back to back in the trimmed audio
+    time_map = TimeMap([0.0, 3.0], [2.0, 10.0], [3.0, 4.0])
+    assert time_map.kept_seconds == 7.0
+    assert time_map.to_original(0.0) == 2.0
+    assert time_map.to_original(2.5) == 4.5
+    assert time_map.to_original(3.0) == 10.0
+    assert time_map.to_original(6.5) == 13.5
+    # Past the end of the trimmed audio: clamped to the end of the last chunk
+    assert time_map.to_original(9.0) == 14.0
+    assert time_map.to_original([1.0, 4.0]).tolist() == [3.0, 11.0]
+
+
+def test_remap_segments_and_words_in_place():
+    time_map = TimeMap([0.0, 3.0], [2.0, 10.0], [3.0, 4.0])
+    segments = [{"start": 1.0, "end": 4.0, "text": "Across the cut.",
+                 "words": [{"start": 1.0, "end": 1.5}, {"start": 3.5, "end": 4.0}]}]
+    assert time_map.remap_segments(segments) is segments
+    assert (segments[0]["start"], segments[0]["end"]) == (3.0, 11.0)
+    assert segments[0]["words"] == [{"start": 3.0, "end": 3.5}, {"start": 10.5, "end": 11.0}]
+
+
+def test_identity_and_round_trip():
+    assert TimeMap.identity(30.0).to_original(12.5) == 12.5
+    time_map = TimeMap([0.0, 3.0], [2.0, 10.0], [3.0, 4.0])
+    assert TimeMap(**time_map.to_dict()).to_original(6.5) == 13.5
+
+
+def test_trim_cuts_long_silences_and_maps_back():
+    t = np.arange(2 * SAMPLE_RATE) / SAMPLE_RATE
+    speech = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    silence = np.zeros(6 * SAMPLE_RATE, dtype=np.float32)
+    audio = np.concatenate([speech, silence, speech])
+    trimmer = SilenceTrimmer(sample_rate=SAMPLE_RATE, padding=0.3)
+
+    trimmed, time_map = trimmer.trim(audio)
+    assert len(trimmed) / SAMPLE_RATE == pytest.approx(4.6, abs=0.05)
+    # The second burst starts 8 s into the original and 2.6 s into the trimmed audio
+    assert time_map.to_original(2.6) == pytest.approx(8.0, abs=0.05)
+
+    # Nothing stands out from digital silence, so nothing is cut
+    quiet = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    unchanged, time_map = trimmer.trim(quiet)
+    assert np.array_equal(unchanged, quiet) and time_map.to_original(0.5) == 0.5
+
+
+def test_normalize_loudness_raises_quiet_audio_without_clipping():
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    quiet = (0.01 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    louder = normalize_loudness(quiet)
+    assert louder.dtype == np.float32
+    assert 0.05 < np.abs(louder).max() <= 1.0
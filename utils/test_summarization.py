@@ -0,0 +1,231 @@
+"""Regression and throughput tests for SummaryGenerator
+
+    python -m pytest utils -q
+    MEETING_NOTES_UPDATE_GOLDEN=1 python -m pytest utils -q   # after an intended output change
+
+Golden outputs live in utils/golden/summarization.json. Timing floors are
+deliberately loose (several times below a laptop's throughput); scale them
+with MEETING_NOTES_PERF_SCALE on slower machines.
+"""
+import time
+
+import pytest
+
+from .corpus import CORPUS_SIZES, agenda_transcript, synthetic_transcript
+from .disfluency import DisfluencyCleaner
+from .keyphrases import KeyphraseExtractor
+from .segments import SegmentStore
+from .sentence_segmenter import split_sentences
+from .summarization import SummaryGenerator, _sumy_parser
+from .summarizer_registry import EnsembleSummarizer, borda_fusion, reciprocal_rank_fusion, register_summarizer
+from .topic_segmentation import TopicSegmenter
+
+EXTRACTORS = ["extract_action_items", "extract_decisions", "extract_key_points"]
+
+
+# Registered at import so the ensemble's worker processes know them too
+@register_summarizer("test_reversed")
+class ReversedSummarizer:
+    def rank(self, document):
+        return range(len(document.sentences) - 1, -1, -1)
+
+
+@register_summarizer("test_stalled")
+class StalledSummarizer:
+    def rank(self, document):
+        time.sleep(30)
+        return range(len(document.sentences))
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return SummaryGenerator("lsa")
+
+
+@pytest.mark.parametrize("size", list(CORPUS_SIZES))
+@pytest.mark.parametrize("extractor", EXTRACTORS)
+def test_extractor_golden(generator, corpus, golden, extractor, size):
+    golden.check(f"{extractor}/{size}", getattr(generator, extractor)(corpus[size]))
+
+
+@pytest.mark.parametrize("size", list(CORPUS_SIZES))
+def test_generate_summary_golden(generator, corpus, golden, size):
+    golden.check(f"generate_summary/{size}", generator.generate_summary(corpus[size]))
+
+
+@pytest.mark.parametrize("size", ["short", "medium"])
+def test_generate_summary_diarized_golden(generator, diarized_corpus, golden, size):
+    """Items of a diarized transcript carry timestamps and speaker prefixes"""
+    golden.check(f"generate_summary_diarized/{size}", generator.generate_summary(diarized_corpus[size]))
+
+
+def test_textrank_summary_golden(corpus, golden):
+    golden.check("generate_summary_textrank/medium", SummaryGenerator("textrank").generate_summary(corpus["medium"]))
+
+
+def test_same_items_for_text_and_segments(generator, corpus, diarized_corpus):
+    """Structured extraction does not depend on how the transcript was passed in"""
+    text = diarized_corpus["medium"].text
+    assert generator.extract_decisions(text) == generator.extract_decisions(diarized_corpus["medium"])
+    assert generator.extract_key_points(text) == generator.extract_key_points(diarized_corpus["medium"])
+
+
+def test_items_point_into_the_audio(generator, diarized_corpus):
+    segments = diarized_corpus["medium"]
+    summary = generator.generate_summary(segments)
+    for section, items in summary["items"].items():
+        for item in items:
+            assert item["start"] is not None, f"{section} item without a timestamp: {item['text']}"
+            assert 0 <= item["start"] <= item["end"] <= segments.duration
+
+
+def test_empty_transcript(generator):
+    summary = generator.generate_summary("")
+    assert summary["action_items"] == "No specific action items identified."
+    assert summary["decisions"] == "No specific decisions identified."
+    assert summary["items"]["key_points"] == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_topic_boundaries(generator, seed):
+    """Every change of topic is found within two sentences, with at most one spurious boundary"""
+    text, starts = agenda_transcript(topics=6, seed=seed)
+    found = [topic["start_sentence"] for topic in generator.topic_segmenter.segment(text)]
+    assert found[0] == 0
+    missed = [start for start in starts[1:] if not any(abs(start - f) <= 2 for f in found)]
+    extra = [f for f in found[1:] if not any(abs(start - f) <= 2 for start in starts)]
+    assert not missed, f"Missed topic boundaries {missed} (found {found})"
+    assert len(extra) <= 1, f"Spurious topic boundaries {extra} (expected {starts})"
+
+
+def test_agenda_golden(generator, golden):
+    text, _ = agenda_transcript(topics=4, seed=7)
+    golden.check("find_topics/agenda", generator.find_topics(text))
+    golden.check("find_key_points/agenda", generator.find_key_points(text))
+
+
+def test_topic_segmentation_throughput(corpus, timer):
+    text = corpus["long"] * 10
+    timer.assert_throughput(TopicSegmenter().segment, text, units=len(text.split()),
+                            min_per_second=50_000, rounds=3, label="TopicSegmenter.segment (words)")
+
+
+def test_keyphrases_golden(corpus, golden):
+    golden.check("keyphrases/medium", KeyphraseExtractor().extract(corpus["medium"], 20))
+
+
+def test_keyphrases_cached_per_transcript(corpus):
+    extractor = KeyphraseExtractor(cache_size=1)
+    first = extractor.extract(corpus["medium"])
+    assert extractor.extract(corpus["medium"][:]) == first
+    assert len(extractor._cache) == 1
+    extractor.extract(corpus["short"])
+    assert list(extractor._cache) == [extractor.transcript_hash(corpus["short"])]
+
+
+def test_keyphrase_throughput(timer):
+    """100k words well under a second, without the cache"""
+    text = synthetic_transcript(100_000, seed=3)
+    timer.assert_throughput(KeyphraseExtractor(cache_size=0).extract, text, units=len(text.split()),
+                            min_per_second=400_000, rounds=3, label="KeyphraseExtractor.extract (words)")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Um, so we need to, uh, finish the the budget.", "We need to, finish the budget."),
+    ("Well, I like it. Well done. You know the answer.", "I like it. Well done. You know the answer."),
+    ("We need to we need to ship it. Okay. Yeah, agreed.", "We need to ship it. Agreed."),
+    ("The plan um uh is the the um the plan.", "The plan is the plan."),
+    ("Uh, um.", ""),
+    ("I think that that is fine.", "I think that that is fine."),
+    ("We had had enough of the the delays.", "We had had enough of the delays."),
+    ("It was that that that one.", "It was that that one."),
+    ("What it is, is a plan.", "What it is, is a plan."),
+    ("So that is is the plan.", "That is the plan."),
+])
+def test_clean_meeting_text(generator, text, expected):
+    assert generator.clean_meeting_text(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("The answer is no. We ship Friday.", ["The answer is no.", "We ship Friday."]),
+    ("I said no. Then we left.", ["I said no.", "Then we left."]),
+    ("Ticket No. 5 is open. Dr. Smith owns it.", ["Ticket No. 5 is open.", "Dr. Smith owns it."]),
+    ("The team sat. Then we started.", ["The team sat.", "Then we started."]),
+    ("Launch is on Sun. We ship Monday.", ["Launch is on Sun.", "We ship Monday."]),
+    ("Prices went up in Dec. Sales held.", ["Prices went up in Dec.", "Sales held."]),
+    ("See Fig. 2 and the plan for Sun. 12 March.", ["See Fig. 2 and the plan for Sun. 12 March."]),
+    ("Call at 3 p.m. Then we ship.", ["Call at 3 p.m.", "Then we ship."]),
+    ("Call at 3 p.m. tomorrow, e.g. after lunch.", ["Call at 3 p.m. tomorrow, e.g. after lunch."]),
+    ("J. Smith said we grew 3.5 percent. Great!", ["J. Smith said we grew 3.5 percent.", "Great!"]),
+])
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+
+def test_clean_segments_keep_times_and_speakers():
+    store = SegmentStore.from_dicts([
+        {"start": 0.0, "end": 2.0, "text": "Um, uh.", "speaker": 0},
+        {"start": 2.0, "end": 5.0, "text": "So the the budget is fine.", "speaker": 1},
+    ])
+    cleaned = DisfluencyCleaner().clean_segments(store)
+    assert [(s.start, s.end, s.text, s.speaker) for s in cleaned] == [(2.0, 5.0, "The budget is fine.", 1)]
+
+
+def test_disfluency_cleaner_throughput(timer):
+    text = synthetic_transcript(100_000, seed=4)
+    timer.assert_throughput(DisfluencyCleaner().clean, text, units=len(text.split()),
+                            min_per_second=300_000, rounds=3, label="DisfluencyCleaner.clean (words)")
+
+
+def test_rank_fusion():
+    rankings = [[0, 1, 2, 3], [1, 0, 3, 2], [1, 2, 0]]
+    assert reciprocal_rank_fusion(rankings, 4) == [1, 0, 2, 3]
+    assert borda_fusion(rankings, 4) == [1, 0, 2, 3]
+    # Ties go to the earlier sentence
+    assert reciprocal_rank_fusion([[0, 1], [1, 0]], 2) == [0, 1]
+
+
+def test_ensemble_skips_a_stalled_method(corpus):
+    document = _sumy_parser(corpus["short"]).document
+    ensemble = EnsembleSummarizer(["test_reversed", "test_stalled", "luhn"], timeout=30.0,
+                                  timeouts={"test_stalled": 3.0}, workers=None)
+    started = time.perf_counter()
+    chosen = ensemble.select(document, 2)
+    assert time.perf_counter() - started < 4.5
+    assert ensemble.last_run["test_stalled"]["status"] == "timeout"
+    assert [ensemble.last_run[name]["status"] for name in ("test_reversed", "luhn")] == ["ok", "ok"]
+    assert len(chosen) == 2 and chosen == sorted(chosen)
+    # Each call has its own pool; the next one is unaffected by the stuck worker
+    ensemble = EnsembleSummarizer(["test_reversed", "lsa", "luhn"], workers=2)
+    ensemble.select(document, 2)
+    assert all(run["status"] == "ok" for run in ensemble.last_run.values())
+
+
+def test_ensemble_in_process_matches_pool(corpus):
+    document = _sumy_parser(corpus["medium"]).document
+    pooled = EnsembleSummarizer(["lsa", "textrank", "test_reversed"], fusion="borda", workers=None).rank(document)
+    assert EnsembleSummarizer(["lsa", "textrank", "test_reversed"], fusion="borda", workers=0).rank(document) == pooled
+    with pytest.raises(ValueError):
+        EnsembleSummarizer(["lsa", "missing"])
+
+
+@pytest.mark.parametrize("extractor", EXTRACTORS)
+def test_extractor_throughput(generator, corpus, timer, extractor):
+    text = corpus["long"]
+    timer.assert_throughput(getattr(generator, extractor), text, units=len(text.split()),
+                            min_per_second=150_000, label=f"{extractor} (words)")
+
+
+def test_generate_summary_throughput(generator, corpus, timer):
+    text = corpus["medium"]
+    timer.assert_throughput(generator.generate_summary, text, units=len(text.split()),
+                            min_per_second=2_000, rounds=3, label="generate_summary (words)")
+
+
+def test_generate_summary_scaling(generator, corpus, timer):
+    """A transcript 3x longer must not take more than ~30x as long (catches accidental blow-ups)"""
+    medium = timer.measure(generator.generate_summary, corpus["medium"], rounds=2)
+    long = timer.measure(generator.generate_summary, corpus["long"], rounds=1, warmup=0)
+    ratio = long / medium
+    print(f"⏱️ generate_summary long/medium: {ratio:.1f}x")
+    assert ratio <= 30 * timer.scale
@@ -0,0 +1,102 @@
+"""Tests for the SQLite work queue: leases, expiry, stealing and the merge follow-up
+
+    python -m pytest utils -q
+"""
+import json
+import os
+
+import pytest
+
+from .distributed import CHUNK_TASK, MERGE_TASK, DistributedCoordinator, _merge_follow_up
+from .work_queue import FollowUp, SQLiteWorkQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SQLiteWorkQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_put_is_idempotent_and_claims_lease_one_worker(queue):
+    assert queue.put("job", "chunk", 0, {"n": 0})
+    assert not queue.put("job", "chunk", 0, {"n": 0})
+    task = queue.claim("a")
+    assert (task.key, task.payload, task.attempt, task.worker_id) == ("0", {"n": 0}, 1, "a")
+    assert queue.claim("b") is None
+    assert queue.heartbeat(task)
+    assert queue.complete(task, {"ok": True})
+    assert queue.results("job", "chunk") == {"0": {"ok": True}}
+    assert not queue.heartbeat(task)
+
+
+def test_expired_lease_is_stolen_and_the_stale_worker_cannot_finish(queue):
+    queue.put("job", "chunk", 0, {})
+    stale = queue.claim("a", lease_seconds=-1)
+    stolen = queue.claim("b")
+    assert stolen.key == stale.key and stolen.attempt == 2 and stolen.worker_id == "b"
+    assert not queue.heartbeat(stale)
+    assert not queue.complete(stale, "old")
+    assert not queue.fail(stale, "old")
+    assert queue.complete(stolen, "new")
+    assert queue.results("job", "chunk") == {"0": "new"}
+
+
+def test_lease_expiring_max_attempts_times_fails_the_task(queue):
+    queue.put("job", "chunk", 0, {})
+    queue.claim("a", lease_seconds=-1)
+    queue.claim("b", lease_seconds=-1)
+    assert queue.claim("c") is None
+    [(kind, key, error)] = queue.errors("job")
+    assert (kind, key) == ("chunk", "0") and "Lease expired 2 times" in error
+
+
+def test_fail_retries_until_max_attempts(queue):
+    queue.put("job", "chunk", 0, {})
+    assert queue.fail(queue.claim("a"), "boom")
+    assert queue.progress("job") == {"chunk": {"queued": 1}}
+    assert queue.fail(queue.claim("a"), "boom again")
+    assert queue.errors("job") == [("chunk", "0", "boom again")]
+    assert queue.claim("a") is None
+
+
+def test_merges_go_ahead_of_chunks(queue):
+    queue.put("job", "chunk", 0, {})
+    queue.put("other", "merge", 0, {}, priority=-1)
+    assert queue.claim("a").kind == "merge"
+
+
+def test_last_completion_queues_the_follow_up(queue):
+    for index in range(3):
+        queue.put("job", CHUNK_TASK, index, {})
+    follow_up = FollowUp(MERGE_TASK, 0, {"job_dir": "d"}, after=3, priority=-1)
+    tasks = [queue.claim("a"), queue.claim("b"), queue.claim("c")]
+    for task in tasks[:2]:
+        assert queue.complete(task, [], follow_up=follow_up)
+    assert MERGE_TASK not in queue.progress("job")
+    # A completion that lost its lease does not count either
+    assert not queue.complete(tasks[0], [], follow_up=follow_up)
+    assert MERGE_TASK not in queue.progress("job")
+    assert queue.complete(tasks[2], [], follow_up=follow_up)
+    assert queue.progress("job")[MERGE_TASK] == {"queued": 1}
+    merge = queue.claim("a")
+    assert (merge.kind, merge.payload) == (MERGE_TASK, {"job_dir": "d"})
+
+
+def test_coordinator_queues_a_missing_merge(queue, tmp_path):
+    coordinator = DistributedCoordinator(queue, work_dir=str(tmp_path / "work"))
+    job_dir = os.path.join(coordinator.work_dir, "job")
+    os.makedirs(job_dir)
+    with open(os.path.join(job_dir, "job.json"), "w", encoding="utf-8") as f:
+        json.dump({"chunk_count": 2}, f)
+    for index in range(2):
+        queue.put("job", CHUNK_TASK, index, {})
+    assert not coordinator.queue_merge_if_ready("job")
+    # Chunks completed without the follow-up, as by a worker that died before queueing the merge
+    queue.complete(queue.claim("a"), [])
+    queue.complete(queue.claim("a"), [])
+    assert coordinator.queue_merge_if_ready("job")
+    assert not coordinator.queue_merge_if_ready("job")
+    assert queue.claim("a").payload == _merge_follow_up(job_dir, {"chunk_count": 2}).payload
+    with pytest.raises(TimeoutError):
+        coordinator.wait("job", timeout=0, poll_interval=0)
@@ -0,0 +1,142 @@
+import re
+from collections import defaultdict
+from itertools import chain
+
+import numpy as np
+
+from .segments import as_segment_store
+
+# Everything that is not a letter or whitespace is dropped before splitting,
+# so "don't" counts as "dont" and numbers disappear (as in the word cloud)
+_NON_LETTERS = re.compile(r'[^a-z\s]+')
+# ASCII record separator: whitespace to the regex and to str.split; removed from the input first
+_SEPARATOR = '\x1e'
+
+
+def _unique_counts(codes):
+    """np.unique(codes, return_counts=True) via one in-place sort"""
+    codes = np.sort(codes)
+    if not len(codes):
+        return codes, codes
+    starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+    counts = np.diff(np.append(starts, len(codes)))
+    return codes[starts], counts
+
+
+class TextStatistics:
+    """Word counts, n-grams and TF-IDF for a set of documents from one tokenizing pass
+
+    Each document (a transcript sentence, or a whole transcript when
+    comparing meetings) is lowercased, cleaned with one compiled regex and
+    split. Tokens are mapped to integer ids as they are seen, and every
+    statistic is then computed on NumPy arrays of ids: term counts with
+    ``bincount``, bigrams as packed ``id * vocabulary + id`` codes and
+    document frequencies from unique (document, term) codes. Memory is one
+    int32 per token plus the vocabulary.
+    """
+
+    def __init__(self, documents, stop_words=frozenset(), min_word_length=3):
+        documents = [document.replace(_SEPARATOR, ' ') for document in documents]
+        # One regex pass over all documents; the separator is whitespace, so it
+        # survives cleaning and splits the result back into documents
+        cleaned = _NON_LETTERS.sub('', _SEPARATOR.join(documents).lower()).split(_SEPARATOR)
+        token_lists = list(map(str.split, cleaned)) if documents else []
+
+        # Ids in first-seen order, assigned without a Python-level loop
+        vocabulary = defaultdict()
+        vocabulary.default_factory = vocabulary.__len__
+        ids = list(map(vocabulary.__getitem__, chain.from_iterable(token_lists)))
+
+        self.vocabulary = list(vocabulary)
+        self.ids = np.array(ids, dtype=np.int32)
+        self.document_lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+        self.raw_document_lengths = np.fromiter(map(len, map(str.split, documents)), dtype=np.int64,
+                                                count=len(documents))
+        self.counts = np.bincount(self.ids, minlength=len(self.vocabulary))
+
+        # Per-term flag: counted in frequencies (not a stop word, long enough)
+        self.content = np.fromiter(
+            (len(word) >= min_word_length and word not in stop_words for word in self.vocabulary),
+            dtype=bool, count=len(self.vocabulary)
+        )
+        self.content_counts = np.where(self.content, self.counts, 0)
+
+    @classmethod
+    def from_transcript(cls, transcript, stop_words=frozenset(), min_word_length=3):
+        """Statistics for one transcript, with its sentences as documents"""
+        return cls(as_segment_store(transcript).sentences(), stop_words, min_word_length)
+
+    @property
+    def document_count(self):
+        return len(self.document_lengths)
+
+    @property
+    def total_words(self):
+        """Whitespace-separated words, punctuation and numbers included"""
+        return int(self.raw_document_lengths.sum())
+
+    @property
+    def unique_words(self):
+        """Distinct content words"""
+        return int(np.count_nonzero(self.content_counts))
+
+    def content_words(self):
+        """Content tokens in transcript order"""
+        return [self.vocabulary[i] for i in self.ids[self.content[self.ids]]]
+
+    def _top(self, scores, n):
+        """Indices of the n highest scores; ties keep first-seen order"""
+        order = np.argsort(-scores, kind='stable')[:n]
+        return order[scores[order] > 0]
+
+    def most_common(self, n=10):
+        """[(word, count)] like Counter.most_common over content words"""
+        return [(self.vocabulary[i], int(self.content_counts[i])) for i in self._top(self.content_counts, n)]
+
+    def ngrams(self, n=10):
+        """Most common adjacent content-word pairs within a document, as ("a b", count)"""
+        if len(self.ids) < 2:
+            return []
+        # Pairs must not cross a document boundary
+        same_document = np.ones(len(self.ids) - 1, dtype=bool)
+        boundaries = np.cumsum(self.document_lengths)[:-1]
+        same_document[boundaries[(boundaries > 0) & (boundaries < len(self.ids))] - 1] = False
+
+        first, second = self.ids[:-1], self.ids[1:]
+        keep = same_document & self.content[first] & self.content[second]
+        codes = first[keep].astype(np.int64) * len(self.vocabulary) + second[keep]
+        if not len(codes):
+            return []
+        unique, counts = _unique_counts(codes)
+        order = np.argsort(-counts, kind='stable')[:n]
+        return [
+            (f"{self.vocabulary[code // len(self.vocabulary)]} {self.vocabulary[code % len(self.vocabulary)]}",
+             int(count))
+            for code, count in zip(unique[order], counts[order]) if count > 1
+        ]
+
+    def document_frequencies(self):
+        """Number of documents containing each term"""
+        document_ids = np.repeat(np.arange(self.document_count, dtype=np.int64), self.document_lengths)
+        codes, _ = _unique_counts(document_ids * len(self.vocabulary) + self.ids)
+        return np.bincount(codes % len(self.vocabulary), minlength=len(self.vocabulary))
+
+    def tfidf(self, n=10):
+        """Content words ranked by count * log(N / df), as (word, score)"""
+        if not self.document_count:
+            return []
+        df = self.document_frequencies()
+        idf = np.log(self.document_count / np.maximum(df, 1))
+        scores = self.content_counts * idf
+        return [(self.vocabulary[i], round(float(scores[i]), 3)) for i in self._top(scores, n)]
+
+    def document_length_stats(self):
+        """Mean, median and max words per document"""
+        lengths = self.raw_document_lengths
+        if not len(lengths):
+            return {'mean': 0, 'median': 0, 'max': 0}
+        return {
+            'mean': float(lengths.mean()),
+            'median': float(np.median(lengths)),
+            'max': int(lengths.max()),
+        }
@@ -0,0 +1,222 @@
+import numpy as np
+
+from .segments import as_segment_store
+from .text_stats import TextStatistics, _unique_counts
+
+
+def _window_codes(sentence_ids, term_ids, vocabulary_size, gap_count, block_size, side):
+    """Packed (gap, term) codes and counts of every left or right window
+
+    A token in sentence i is in the left window of gaps i+1..i+k and in
+    the right window of gaps i-k+1..i (gap g sits before sentence g), so
+    each token yields ``block_size`` codes and the windows are never built
+    as dense vectors.
+    """
+    shifts = np.arange(block_size)
+    if side == "left":
+        gaps = sentence_ids[:, None] + 1 + shifts[None, :]
+    else:
+        gaps = sentence_ids[:, None] - shifts[None, :]
+    terms = np.broadcast_to(term_ids[:, None], gaps.shape)
+    valid = (gaps >= 1) & (gaps <= gap_count)
+    return _unique_counts(gaps[valid].astype(np.int64) * vocabulary_size + terms[valid])
+
+
+def _topic_term_counts(sentence_ids, term_ids, starts, sentence_count, vocabulary_size):
+    """Packed (topic, term) codes and counts for topics starting at the sentence indices ``starts``"""
+    topic_of_sentence = np.searchsorted(np.array(starts), np.arange(sentence_count), side="right") - 1
+    topic_ids = topic_of_sentence[sentence_ids]
+    codes, counts = _unique_counts(topic_ids * vocabulary_size + term_ids)
+    return topic_ids, codes, counts
+
+
+class TopicSegmenter:
+    """TextTiling: splits a transcript into topics where the vocabulary shifts
+
+    For every gap between two sentences, the term counts of the
+    ``block_size`` sentences before and after it are compared by cosine
+    similarity. All gaps are scored at once from packed (gap, term) codes,
+    so the work grows with the number of tokens times ``block_size``, not
+    with sentences times vocabulary. Scores are smoothed, each gap's depth
+    (how far it sits below the peaks on either side) is found in one pass
+    each way, and the deepest gaps above ``mean - std / 2`` become topic
+    boundaries, at least ``min_topic_sentences`` apart. Neighbouring topics
+    whose overall vocabularies are still alike (cosine at least
+    ``merge_similarity``) are then merged, which removes the dips that
+    repeated phrasing causes inside one topic.
+
+    Each topic gets keywords (content words ranked by count in the topic
+    times inverse sentence frequency in the meeting), a title made from
+    them, and its sentences ranked by how well they match those keywords.
+    """
+
+    def __init__(self, block_size=6, smoothing_width=3, min_topic_sentences=8, merge_similarity=0.5, keywords=4,
+                 stop_words=None):
+        if block_size < 1 or min_topic_sentences < 1:
+            raise ValueError("block_size and min_topic_sentences must be at least 1")
+        self.block_size = block_size
+        self.smoothing_width = smoothing_width
+        self.min_topic_sentences = min_topic_sentences
+        self.merge_similarity = merge_similarity
+        self.keywords = keywords
+        if stop_words is None:
+            from .keyphrases import meeting_stop_words
+
+            stop_words = meeting_stop_words()
+        self.stop_words = stop_words
+
+    def _content_tokens(self, stats):
+        """(sentence id, term id) of every content token"""
+        sentence_ids = np.repeat(np.arange(stats.document_count), stats.document_lengths)
+        keep = stats.content[stats.ids]
+        return sentence_ids[keep], stats.ids[keep].astype(np.int64)
+
+    def gap_scores(self, stats):
+        """Cosine similarity across each of the ``document_count - 1`` gaps"""
+        gap_count = stats.document_count - 1
+        if gap_count < 1:
+            return np.zeros(0)
+        sentence_ids, term_ids = self._content_tokens(stats)
+        size = max(len(stats.vocabulary), 1)
+        left_codes, left_counts = _window_codes(sentence_ids, term_ids, size, gap_count, self.block_size, "left")
+        right_codes, right_counts = _window_codes(sentence_ids, term_ids, size, gap_count, self.block_size,
+                                                  "right")
+
+        _, left_index, right_index = np.intersect1d(left_codes, right_codes, assume_unique=True,
+                                                    return_indices=True)
+        dot = np.bincount(left_codes[left_index] // size,
+                          weights=left_counts[left_index] * right_counts[right_index], minlength=gap_count + 1)
+        left_norm = np.bincount(left_codes // size, weights=left_counts.astype(np.float64) ** 2,
+                                minlength=gap_count + 1)
+        right_norm = np.bincount(right_codes // size, weights=right_counts.astype(np.float64) ** 2,
+                                 minlength=gap_count + 1)
+        norm = np.sqrt(left_norm * right_norm)
+        scores = np.divide(dot, norm, out=np.zeros_like(dot), where=norm > 0)
+        return scores[1:]
+
+    @staticmethod
+    def depth_scores(scores):
+        """How far each gap lies below the nearest peak on its left plus the one on its right"""
+        count = len(scores)
+        left_peak = scores.copy()
+        right_peak = scores.copy()
+        for i in range(1, count):
+            if scores[i - 1] >= scores[i]:
+                left_peak[i] = left_peak[i - 1]
+        for i in range(count - 2, -1, -1):
+            if scores[i + 1] >= scores[i]:
+                right_peak[i] = right_peak[i + 1]
+        return (left_peak - scores) + (right_peak - scores)
+
+    def boundaries(self, stats):
+        """Sentence indices where a new topic starts (the first topic starting at 0 is implied)"""
+        sentence_count = stats.document_count
+        if sentence_count < 2 * self.min_topic_sentences:
+            return []
+        scores = self.gap_scores(stats)
+        if self.smoothing_width > 1:
+            kernel = np.ones(self.smoothing_width) / self.smoothing_width
+            scores = np.convolve(np.pad(scores, self.smoothing_width // 2, mode="edge"), kernel, mode="valid")
+            scores = scores[:sentence_count - 1]
+        depth = self.depth_scores(scores)
+        cutoff = depth.mean() - depth.std() / 2
+
+        # Gap i sits before sentence i + 1; deepest gaps claim their place first
+        chosen = []
+        for gap in np.argsort(-depth, kind="stable"):
+            sentence = int(gap) + 1
+            if depth[gap] <= cutoff or depth[gap] <= 0:
+                break
+            if sentence < self.min_topic_sentences or sentence_count - sentence < self.min_topic_sentences:
+                continue
+            if all(abs(sentence - other) >= self.min_topic_sentences for other in chosen):
+                chosen.append(sentence)
+        return self._merge_similar(stats, [0] + sorted(chosen))[1:]
+
+    def _merge_similar(self, stats, starts):
+        """Drop the boundary between the most alike neighbouring topics until none reach merge_similarity"""
+        sentence_ids, term_ids = self._content_tokens(stats)
+        size = max(len(stats.vocabulary), 1)
+        while len(starts) > 1:
+            _, codes, counts = _topic_term_counts(sentence_ids, term_ids, starts, stats.document_count, size)
+            counts = counts.astype(np.float64)
+            # Topic t + 1's codes moved down by one topic line up with topic t's codes for the same term
+            _, index, next_index = np.intersect1d(codes, codes - size, assume_unique=True, return_indices=True)
+            dot = np.bincount(codes[index] // size, weights=counts[index] * counts[next_index],
+                              minlength=len(starts))[:-1]
+            norm = np.sqrt(np.bincount(codes // size, weights=counts ** 2, minlength=len(starts)))
+            similarity = np.divide(dot, norm[:-1] * norm[1:], out=np.zeros_like(dot), where=norm[:-1] * norm[1:] > 0)
+            best = int(np.argmax(similarity))
+            if similarity[best] < self.merge_similarity:
+                break
+            del starts[best + 1]
+        return starts
+
+    def segment(self, transcript):
+        """Topic dicts in transcript order
+
+        Each has "index", "title", "keywords", "start_sentence",
+        "end_sentence" (exclusive), "start"/"end" seconds (None without
+        timestamps), "text_start"/"text_end" character offsets and
+        "ranked_sentences" (sentence indices, best match to the keywords
+        first).
+        """
+        segments = as_segment_store(transcript)
+        sentence_count = segments.sentence_count()
+        if not sentence_count:
+            return []
+        stats = TextStatistics(segments.sentences(), self.stop_words)
+        starts = [0] + self.boundaries(stats)
+        ends = starts[1:] + [sentence_count]
+        keywords, ranked = self._describe(stats, starts)
+
+        topics = []
+        for index, (first, last) in enumerate(zip(starts, ends)):
+            text_start = segments.sentence_starts[first]
+            text_end = segments.sentence_ends[last - 1]
+            start, end = segments.span_times(text_start, text_end)
+            words = keywords[index]
+            topics.append({
+                "index": index,
+                "title": ", ".join(words[:3]).capitalize() if words else f"Topic {index + 1}",
+                "keywords": words,
+                "start_sentence": first,
+                "end_sentence": last,
+                "start": start,
+                "end": end,
+                "text_start": text_start,
+                "text_end": text_end,
+                "ranked_sentences": ranked[index],
+            })
+        return topics
+
+    def _describe(self, stats, starts):
+        """Keywords and sentence ranking of every topic, from one pass over the content tokens"""
+        topic_count = len(starts)
+        sentence_ids, term_ids = self._content_tokens(stats)
+        size = max(len(stats.vocabulary), 1)
+        topic_ids, codes, counts = _topic_term_counts(sentence_ids, term_ids, starts, stats.document_count, size)
+
+        # Term weight within a topic: count in the topic times log inverse sentence frequency
+        idf = np.log((stats.document_count + 1) / (stats.document_frequencies() + 1)) + 1
+        weights = counts * idf[codes % size]
+        code_topics = codes // size
+        order = np.lexsort((-weights, code_topics))
+        keywords = [[] for _ in range(topic_count)]
+        for position in order:
+            topic = code_topics[position]
+            if len(keywords[topic]) < self.keywords:
+                keywords[topic].append(stats.vocabulary[codes[position] % size])
+
+        # A sentence's score is the weight of its words in its own topic, normalized by length
+        token_weights = weights[np.searchsorted(codes, topic_ids * size + term_ids)]
+        sentence_scores = np.bincount(sentence_ids, weights=token_weights, minlength=stats.document_count)
+        lengths = np.bincount(sentence_ids, minlength=stats.document_count)
+        sentence_scores = np.divide(sentence_scores, np.sqrt(lengths), out=np.zeros(stats.document_count),
+                                    where=lengths > 0)
+        ranked = []
+        for topic, first in enumerate(starts):
+            last = starts[topic + 1] if topic + 1 < topic_count else stats.document_count
+            local = np.argsort(-sentence_scores[first:last], kind="stable")
+            ranked.append([int(first + i) for i in local])
+        return keywords, ranked
@@ -1,27 +1,45 @@
-import whisper
-import torch
 import tempfile
 import os
 from .audio_processor import AudioProcessor
+from .segments import SegmentStore
+from .model_selection import whisper_size
+from .decode_options import DecodeOptions
+from .speech_detection import quiet_split_points
+from .admission import set_torch_threads
+from .postprocessing import larger_model
+
+# Whisper reads 16 kHz mono
+SAMPLE_RATE = 16000
 
 class TranscriptGenerator:
     """Handles speech-to-text transcription using OpenAI Whisper directly"""
     
-    def __init__(self, model_name="tiny"):
-        # Map model names from app to whisper model sizes
-        model_map = {
-            "openai/whisper-tiny": "tiny",
-            "openai/whisper-base": "base", 
-            "openai/whisper-small": "small"
-        }
-        
-        self.whisper_model_size = model_map.get(model_name, "base")
+    def __init__(self, model_name="tiny", trim_silence=False, normalize_loudness=False, decode_options=None,
+                 chunk_seconds=300, num_threads=None, postprocessor=None):
+        # Map model names from app to whisper model sizes; unknown names are an error
+        self.whisper_model_size = whisper_size(model_name)
         self.model = None
         self.audio_processor = AudioProcessor()
+        # Cut dead air before Whisper sees it; segment times are mapped back
+        self.trim_silence = trim_silence
+        self.normalize_loudness = normalize_loudness
+        # Language, beam search and fallback settings for every transcribe call
+        self.decode_options = decode_options or DecodeOptions()
+        # Length of the independently checkpointed pieces of a long recording
+        self.chunk_seconds = chunk_seconds
+        # Torch intra-op threads; set by admission control so concurrent jobs share the cores
+        self.num_threads = num_threads
+        # Optional TranscriptPostProcessor: drops hallucinations, re-checks unclear passages
+        self.postprocessor = postprocessor
+        self._refiner = None
+        self.last_postprocessing = None
         
     def load_model(self):
         """Load the Whisper model"""
         try:
+            # Imported here: whisper pulls in torch, which dominates startup time
+            import whisper
+            
             print(f"Loading Whisper model: {self.whisper_model_size}")
             self.model = whisper.load_model(self.whisper_model_size)
             print("✅ Whisper model loaded successfully")
@@ -30,46 +48,188 @@ class TranscriptGenerator:
     
     def transcribe_audio(self, audio_path):
         """Transcribe audio file to text using Whisper"""
+        return self.transcribe_with_segments(audio_path).text
+    
+    def transcribe_with_segments(self, audio_path, checkpoint=None):
+        """Transcribe audio file and keep Whisper's timestamped segments
+        
+        Returns a SegmentStore; its ``text`` is the cleaned transcript.
+        With a ``checkpoint`` (see utils.checkpoints) the audio is
+        transcribed in chunks and chunks finished by an earlier attempt are
+        reused.
+        """
         try:
-            if self.model is None:
-                self.load_model()
-            
-            # Preprocess audio
-            processed_audio_path = self.audio_processor.preprocess_audio(audio_path)
-            
-            # Perform transcription with Whisper
-            print("Starting transcription with Whisper...")
-            result = self.model.transcribe(
-                processed_audio_path,
-                fp16=False  # Use FP32 for better compatibility
-            )
-            
-            # Cleanup processed audio file
-            if processed_audio_path != audio_path:
-                os.unlink(processed_audio_path)
+            if self.num_threads:
+                set_torch_threads(self.num_threads)
+            if checkpoint is not None:
+                result = {"segments": self._transcribe_chunks(audio_path, checkpoint)}
+            elif self.trim_silence or self.normalize_loudness:
+                if self.model is None:
+                    self.load_model()
+                # Whisper takes the prepared array directly, no temporary WAV needed
+                audio, time_map = self.audio_processor.load_for_transcription(
+                    audio_path, trim_silence=self.trim_silence, normalize=self.normalize_loudness
+                )
+                print("Starting transcription with Whisper...")
+                result = self.model.transcribe(audio, **self.decode_options.to_whisper_kwargs())
+                if time_map is not None:
+                    time_map.remap_segments(result.get("segments", []))
+            else:
+                if self.model is None:
+                    self.load_model()
+                
+                # Preprocess audio
+                processed_audio_path = self.audio_processor.preprocess_audio(audio_path)
+                
+                # Perform transcription with Whisper
+                print("Starting transcription with Whisper...")
+                result = self.model.transcribe(
+                    processed_audio_path,
+                    **self.decode_options.to_whisper_kwargs()
+                )
+                
+                # Cleanup processed audio file
+                if processed_audio_path != audio_path:
+                    os.unlink(processed_audio_path)
             
-            transcript = result["text"]
-            
-            # Clean and format transcript
-            cleaned_transcript = self.clean_transcript(transcript)
-            
-            return cleaned_transcript
+            whisper_segments = self.postprocess(result.get("segments", []), audio_path)
+            return self.build_segments(whisper_segments)
             
         except Exception as e:
             raise Exception(f"Transcription failed: {str(e)}")
     
-    def clean_transcript(self, transcript):
-        """Clean and format the transcript text"""
-        import re
+    def postprocess(self, whisper_segments, audio_path=None):
+        """Whisper segments after the postprocessor's checks (unchanged without one)
         
-        # Remove extra whitespace
-        transcript = re.sub(r'\s+', ' ', transcript).strip()
+        Re-transcription needs ``audio_path``; the audio is reloaded on the
+        original clock, which is the clock the segment times are on.
+        A report of what changed is kept in ``last_postprocessing``.
+        """
+        if self.postprocessor is None:
+            return whisper_segments
+        segments, dropped = self.postprocessor.filter(whisper_segments)
+        refined = []
+        if self.postprocessor.refine and audio_path is not None and self.postprocessor.refine_spans(segments):
+            refiner = self.get_refiner()
+            if refiner is not None:
+                audio, _ = self.audio_processor.load_for_transcription(
+                    audio_path, trim_silence=False, normalize=self.normalize_loudness
+                )
+                print(f"🔍 Re-checking unclear passages with Whisper {refiner.whisper_model_size}...")
+                segments, refined = self.postprocessor.refine_segments(segments, audio, refiner.transcribe_array,
+                                                                       SAMPLE_RATE)
+        if dropped or refined:
+            print(f"🧹 Post-processing: dropped {len(dropped)} hallucinated or repeated segment(s), "
+                  f"re-transcribed {len(refined)} unclear passage(s)")
+        self.last_postprocessing = {
+            "dropped": [{key: segment.get(key) for key in ("start", "end", "text", "reason")} for segment in dropped],
+            "refined": refined,
+        }
+        return segments
+    
+    def get_refiner(self):
+        """Transcriber for unclear passages: the postprocessor's refine_model or the next larger size"""
+        if self._refiner is None:
+            model = self.postprocessor.refine_model or larger_model(self.whisper_model_size)
+            if model is None or whisper_size(model) == self.whisper_model_size:
+                return None
+            self._refiner = TranscriptGenerator(model, decode_options=self.decode_options,
+                                                num_threads=self.num_threads)
+        return self._refiner
+    
+    def build_segments(self, whisper_segments):
+        """SegmentStore of Whisper segments, cleaned so character offsets refer to the final transcript"""
+        segments = SegmentStore.from_whisper(whisper_segments, clean=self.clean_segment_text)
+        if segments.text:
+            segments.text = segments.text[0].upper() + segments.text[1:]
+        return segments
+    
+    def prepare_audio(self, audio_path):
+        """(audio, time_map, bounds): prepared 16 kHz audio and the sample bounds of its chunks
         
-        # Basic punctuation restoration
-        transcript = re.sub(r'(\w)([.!?])(\w)', r'\1\2 \3', transcript)
+        Chunks are cut at quiet points and are the same for the same audio
+        and settings, so chunk indexes can be shared between runs and nodes.
+        """
+        audio, time_map = self.audio_processor.load_for_transcription(
+            audio_path, trim_silence=self.trim_silence, normalize=self.normalize_loudness
+        )
+        bounds = [0] + quiet_split_points(audio, SAMPLE_RATE, self.chunk_seconds) + [len(audio)]
+        return audio, time_map, bounds
+    
+    def transcribe_array(self, audio, offset=0.0, initial_prompt=None):
+        """Whisper segments of one piece of prepared audio
+        
+        Each has "start", "end", "text" and Whisper's "avg_logprob",
+        "no_speech_prob" and "compression_ratio".
+        
+        Times are shifted by ``offset`` seconds, i.e. they are on the clock
+        of the audio the piece was cut from.
+        """
+        if self.num_threads:
+            set_torch_threads(self.num_threads)
+        if self.model is None:
+            self.load_model()
+        options = self.decode_options.to_whisper_kwargs()
+        if initial_prompt and options["condition_on_previous_text"]:
+            options["initial_prompt"] = initial_prompt
+        result = self.model.transcribe(audio, **options)
+        return [
+            {
+                "start": segment["start"] + offset,
+                "end": segment["end"] + offset,
+                "text": segment["text"],
+                "avg_logprob": segment.get("avg_logprob"),
+                "no_speech_prob": segment.get("no_speech_prob"),
+                "compression_ratio": segment.get("compression_ratio"),
+            }
+            for segment in result.get("segments", [])
+        ]
+    
+    def _transcribe_chunks(self, audio_path, checkpoint):
+        """Whisper segments for the whole file, one checkpointed chunk at a time
+        
+        Chunks are cut at quiet points of the prepared audio and committed
+        as soon as each finishes, with times already on the original clock.
+        Finished chunks are read back instead of transcribed again. The
+        tail of the previous chunk is passed as Whisper's prompt, as
+        condition_on_previous_text would have done within one call.
+        """
+        audio, time_map, bounds = self.prepare_audio(audio_path)
+        done = checkpoint.chunks()
+        if done:
+            print(f"♻️ Resuming transcription: {len(done)}/{len(bounds) - 1} chunks already done")
+        
+        whisper_segments = []
+        for index, (start, end) in enumerate(zip(bounds, bounds[1:])):
+            if index not in done:
+                prompt = " ".join(segment["text"].strip() for segment in whisper_segments[-3:])
+                print(f"Transcribing chunk {index + 1}/{len(bounds) - 1} with Whisper...")
+                chunk_segments = self.transcribe_array(audio[start:end], start / SAMPLE_RATE, prompt)
+                if time_map is not None:
+                    time_map.remap_segments(chunk_segments)
+                checkpoint.save_chunk(index, chunk_segments)
+                done[index] = chunk_segments
+            whisper_segments.extend(done[index])
+        return whisper_segments
+    
+    def clean_transcript(self, transcript):
+        """Clean and format the transcript text"""
+        transcript = self.clean_segment_text(transcript)
         
         # Capitalize first letter
         if transcript:
             transcript = transcript[0].upper() + transcript[1:]
         
         return transcript
+    
+    def clean_segment_text(self, text):
+        """Normalize whitespace and punctuation spacing of a piece of transcript"""
+        import re
+        
+        # Remove extra whitespace
+        text = re.sub(r'\s+', ' ', text).strip()
+        
+        # Basic punctuation restoration
+        text = re.sub(r'(\w)([.!?])(\w)', r'\1\2 \3', text)
+        
+        return text
@@ -1,66 +1,62 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
-from collections import Counter
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-import re
 import io
 import base64
+from .disfluency import FILLER_WORDS
+from .keyphrases import MEETING_WORDS, default_extractor
+from .nltk_resources import english_stopwords
+from .segments import SegmentStore, transcript_text
+from .text_stats import TextStatistics
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# matplotlib and wordcloud are imported inside the chart methods: they are
+# only needed when a chart is drawn, and importing them costs seconds.
 
 class TextVisualizer:
     """Handles text visualization including word clouds and frequency analysis"""
     
+    # Custom stop words for meeting context
+    CUSTOM_STOP_WORDS = FILLER_WORDS | MEETING_WORDS | frozenset({
+        'maybe', 'please', 'thank', 'thanks', 'hello', 'hi', 'hey', 'today'
+    })
+    
+    # English + custom stop words, built once per process and shared
+    _stop_words = None
+    
     def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
-        # Add custom stop words for meeting context
-        self.custom_stop_words = {
-            'so', 'okay', 'well', 'like', 'you know', 'i mean', 'actually', 
-            'basically', 'uh', 'um', 'ah', 'yes', 'no', 'maybe', 'please',
-            'thank', 'thanks', 'hello', 'hi', 'hey', 'meeting', 'discuss',
-            'discussion', 'team', 'project', 'today'
-        }
-        self.stop_words.update(self.custom_stop_words)
+        self.custom_stop_words = self.CUSTOM_STOP_WORDS
+        if TextVisualizer._stop_words is None:
+            TextVisualizer._stop_words = english_stopwords() | self.CUSTOM_STOP_WORDS
+        self.stop_words = TextVisualizer._stop_words
+        self._analyzed = None
+    
+    def analyze(self, text):
+        """TextStatistics for a transcript, reused while the same object is passed in
+        
+        The word cloud, the frequency chart and the statistics all read from
+        one tokenizing pass instead of each re-tokenizing the transcript.
+        """
+        if self._analyzed is None or self._analyzed[0] is not text:
+            self._analyzed = (text, TextStatistics.from_transcript(text, self.stop_words))
+        return self._analyzed[1]
     
     def preprocess_text_for_visualization(self, text):
         """Clean and preprocess text for visualization"""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove special characters and numbers
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        
-        # Tokenize
-        words = word_tokenize(text)
-        
-        # Remove stop words and short words
-        filtered_words = [
-            word for word in words 
-            if word not in self.stop_words and len(word) > 2
-        ]
-        
-        return filtered_words
+        return self.analyze(text).content_words()
     
-    def generate_wordcloud(self, text, width=800, height=400):
-        """Generate word cloud from text and return as base64 image"""
+    def generate_wordcloud(self, text, width=800, height=400, keyphrases=None):
+        """Generate word cloud from text and return as base64 image
+        
+        ``keyphrases`` are [phrase, score] pairs already extracted (a
+        summary's "keyphrase_scores"); without them the text is extracted.
+        """
         try:
-            # Preprocess text
-            words = self.preprocess_text_for_visualization(text)
-            processed_text = ' '.join(words)
+            import matplotlib.pyplot as plt
+            from wordcloud import WordCloud
+            
+            # Key phrases; plain word counts when none repeat
+            if keyphrases is None:
+                keyphrases = default_extractor().extract(text, 100)
+            frequencies = dict(keyphrases) or dict(self.analyze(text).most_common(100))
             
-            if not processed_text.strip():
+            if not frequencies:
                 return None
             
             # Create word cloud
@@ -73,13 +69,13 @@ class TextVisualizer:
                 contour_width=1,
                 contour_color='steelblue',
                 relative_scaling=0.5
-            ).generate(processed_text)
+            ).generate_from_frequencies(frequencies)
             
             # Convert to base64 for Streamlit
             plt.figure(figsize=(10, 5))
             plt.imshow(wordcloud, interpolation='bilinear')
             plt.axis('off')
-            plt.title('Word Cloud - Most Frequent Meeting Terms', fontsize=16, pad=20)
+            plt.title('Word Cloud - Key Meeting Phrases', fontsize=16, pad=20)
             
             # Save to buffer
             buffer = io.BytesIO()
@@ -96,10 +92,8 @@ class TextVisualizer:
     def generate_word_frequency_chart(self, text, top_n=20):
         """Generate word frequency bar chart"""
         try:
-            # Preprocess and count words
-            words = self.preprocess_text_for_visualization(text)
-            word_freq = Counter(words)
-            most_common = word_freq.most_common(top_n)
+            # Count words
+            most_common = self.analyze(text).most_common(top_n)
             
             if not most_common:
                 return None
@@ -109,6 +103,7 @@ class TextVisualizer:
             counts = [item[1] for item in most_common]
             
             # Create plot
+            import matplotlib.pyplot as plt
             plt.figure(figsize=(12, 6))
             bars = plt.barh(words_list, counts, color='skyblue', edgecolor='navy')
             
@@ -138,30 +133,53 @@ class TextVisualizer:
             print(f"Error generating frequency chart: {e}")
             return None
     
-    def generate_text_statistics(self, text):
-        """Generate basic text statistics"""
-        words = self.preprocess_text_for_visualization(text)
-        sentences = nltk.sent_tokenize(text)
+    def generate_text_statistics(self, text, keyphrases=None):
+        """Generate basic text statistics
+        
+        A SegmentStore contributes its precomputed sentence count and, when
+        timestamped, the spoken duration and words per minute. The top ten
+        of ``keyphrases`` ([phrase, score] pairs, as in a summary's
+        "keyphrase_scores") are used as they are; without them the text is
+        extracted.
+        """
+        if keyphrases is None:
+            keyphrases = default_extractor().extract(text, 10)
+        segments = text if isinstance(text, SegmentStore) else SegmentStore.from_text(text)
+        analysis = self.analyze(text)
+        sentences = segments.sentence_count()
+        total_words = analysis.total_words
         
         stats = {
-            'total_words': len(text.split()),
-            'unique_words': len(set(words)),
-            'sentences': len(sentences),
-            'avg_sentence_length': len(text.split()) / len(sentences) if sentences else 0,
-            'most_common_words': Counter(words).most_common(10)
+            'total_words': total_words,
+            'unique_words': analysis.unique_words,
+            'sentences': sentences,
+            'avg_sentence_length': total_words / sentences if sentences else 0,
+            'longest_sentence': analysis.document_length_stats()['max'],
+            'most_common_words': analysis.most_common(10),
+            'top_phrases': analysis.ngrams(10),
+            'keywords': analysis.tfidf(10),
+            'keyphrases': [(phrase, score) for phrase, score in keyphrases[:10]]
         }
         
+        if segments.has_timestamps and segments.duration > 0:
+            stats['duration_minutes'] = segments.duration / 60
+            stats['words_per_minute'] = total_words / stats['duration_minutes']
+        
         return stats
     
-    def create_visualization_section(self, text):
-        """Create complete visualization section for Streamlit"""
-        if not text or len(text.strip()) < 50:
+    def create_visualization_section(self, text, keyphrases=None):
+        """Create complete visualization section for Streamlit
+        
+        Pass the summary's "keyphrase_scores" as ``keyphrases`` so the
+        meeting is not extracted a second time.
+        """
+        if len(transcript_text(text).strip()) < 50:
             return None
         
         # Generate visualizations
-        wordcloud_buffer = self.generate_wordcloud(text)
+        wordcloud_buffer = self.generate_wordcloud(text, keyphrases=keyphrases)
         freq_chart_buffer = self.generate_word_frequency_chart(text)
-        stats = self.generate_text_statistics(text)
+        stats = self.generate_text_statistics(text, keyphrases=keyphrases)
         
         return {
             'wordcloud': wordcloud_buffer,
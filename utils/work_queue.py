@@ -0,0 +1,307 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+
+from .paths import get_data_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    task_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'queued',
+    worker_id TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    UNIQUE (job_id, kind, task_key)
+);
+CREATE INDEX IF NOT EXISTS tasks_claim ON tasks(state, priority, id);
+CREATE INDEX IF NOT EXISTS tasks_job ON tasks(job_id, kind);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    host TEXT,
+    info TEXT,
+    started_at REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+"""
+
+
+def default_worker_id():
+    """'<host>-<pid>-<random>', unique per worker process across nodes"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class Task:
+    """One claimed unit of work; ``attempt`` identifies this lease"""
+
+    def __init__(self, task_id, job_id, kind, key, payload, attempt, worker_id):
+        self.id = task_id
+        self.job_id = job_id
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.attempt = attempt
+        self.worker_id = worker_id
+
+    def __repr__(self):
+        return f"Task({self.job_id}/{self.kind}/{self.key}, attempt {self.attempt})"
+
+
+class FollowUp:
+    """A task ``complete`` queues in the same transaction once ``after`` tasks of
+    the completed task's kind are done for its job (e.g. the merge after the last chunk)"""
+
+    def __init__(self, kind, key, payload, after, priority=0):
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.after = after
+        self.priority = priority
+
+
+class WorkQueue(ABC):
+    """Interface of the queue distributed workers coordinate through
+
+    Tasks belong to a job and are unique per (job, kind, key), so putting
+    the same task twice is harmless. A claimed task is leased to one worker
+    for ``lease_seconds``; the worker renews the lease with ``heartbeat``.
+    If the worker dies or stalls, the lease runs out and the next ``claim``
+    from any node steals the task. ``complete`` and ``fail`` only count
+    when the caller still holds the lease, so a stalled worker that wakes
+    up after its task was stolen cannot overwrite the newer result.
+
+    SQLiteWorkQueue is the implementation shipped here; other backends
+    (e.g. Redis) subclass this and implement every abstract method.
+    """
+
+    @abstractmethod
+    def put(self, job_id, kind, key, payload, priority=0):
+        """Queue a task; returns False if it already exists"""
+
+    @abstractmethod
+    def claim(self, worker_id, kinds=None, lease_seconds=60):
+        """Lease the next runnable task (lowest priority value first) or return None"""
+
+    @abstractmethod
+    def heartbeat(self, task, lease_seconds=60):
+        """Extend the lease; False if it was lost (the task was stolen or finished)"""
+
+    @abstractmethod
+    def complete(self, task, result=None, follow_up=None):
+        """Store the result and queue ``follow_up`` if it is due, atomically; False if the lease was lost"""
+
+    @abstractmethod
+    def fail(self, task, error, retry=True):
+        """Give the task back (or mark it failed after ``max_attempts``); False if the lease was lost"""
+
+    @abstractmethod
+    def results(self, job_id, kind):
+        """{key: result} of the finished tasks of one kind"""
+
+    @abstractmethod
+    def errors(self, job_id):
+        """[(kind, key, error)] of the failed tasks of one job"""
+
+    @abstractmethod
+    def progress(self, job_id):
+        """{kind: {state: count}} for one job"""
+
+    @abstractmethod
+    def register_worker(self, worker_id, info=None):
+        """Record (or refresh) a worker node as alive"""
+
+    @abstractmethod
+    def unregister_worker(self, worker_id):
+        """Forget a worker node that stopped"""
+
+    @abstractmethod
+    def workers(self, alive_within=120.0):
+        """Workers seen in the last ``alive_within`` seconds"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """Work queue in one SQLite file, shared by every worker process and node
+
+    For several machines, put the file on storage they all mount and pass
+    ``shared=True``: WAL mode needs shared memory on one host, so a
+    network file system gets a rollback journal instead. Every claim is one
+    ``BEGIN IMMEDIATE`` transaction, so two workers never lease the same
+    task. Results are stored as JSON.
+    """
+
+    def __init__(self, db_path=None, shared=False, max_attempts=3, busy_timeout=30.0):
+        self.db_path = db_path or get_data_path("work_queue.db")
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.db_path, timeout=busy_timeout, check_same_thread=False,
+                                          isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(f"PRAGMA journal_mode={'DELETE' if shared else 'WAL'}")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _transaction(self, func, *args):
+        """Run func(connection, *args) in one write transaction"""
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                value = func(self.connection, *args)
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+            return value
+
+    @staticmethod
+    def _insert(connection, job_id, kind, key, payload, priority):
+        cursor = connection.execute(
+            "INSERT OR IGNORE INTO tasks (job_id, kind, task_key, payload, priority, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, str(key), json.dumps(payload), priority, time.time())
+        )
+        return cursor.rowcount == 1
+
+    def put(self, job_id, kind, key, payload, priority=0):
+        return self._transaction(self._insert, job_id, kind, key, payload, priority)
+
+    def claim(self, worker_id, kinds=None, lease_seconds=60):
+        def lease(connection):
+            now = time.time()
+            kind_filter = f"AND kind IN ({','.join('?' * len(kinds))})" if kinds else ""
+            # Queued tasks first; then tasks whose worker stopped sending heartbeats
+            row = connection.execute(
+                f"SELECT * FROM tasks WHERE (state = 'queued' OR (state = 'running' AND lease_expires < ?)) "
+                f"{kind_filter} ORDER BY state = 'running', priority, id LIMIT 1",
+                [now] + list(kinds or [])
+            ).fetchone()
+            if row is None:
+                return None
+            if row["state"] == "running":
+                print(f"🔁 {worker_id} steals {row['job_id']}/{row['kind']}/{row['task_key']} "
+                      f"from {row['worker_id']} (lease expired)")
+                if row["attempts"] >= self.max_attempts:
+                    connection.execute(
+                        "UPDATE tasks SET state = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                        (f"Lease expired {row['attempts']} times (last worker: {row['worker_id']})", now,
+                         row["id"])
+                    )
+                    return lease(connection)
+            connection.execute(
+                "UPDATE tasks SET state = 'running', worker_id = ?, attempts = attempts + 1, lease_expires = ? "
+                "WHERE id = ?", (worker_id, now + lease_seconds, row["id"])
+            )
+            return Task(row["id"], row["job_id"], row["kind"], row["task_key"], json.loads(row["payload"]),
+                        row["attempts"] + 1, worker_id)
+        return self._transaction(lease)
+
+    def _holds_lease(self, task):
+        return ("id = ? AND state = 'running' AND worker_id = ? AND attempts = ?",
+                (task.id, task.worker_id, task.attempt))
+
+    def heartbeat(self, task, lease_seconds=60):
+        condition, params = self._holds_lease(task)
+        return self._transaction(lambda connection: connection.execute(
+            f"UPDATE tasks SET lease_expires = ? WHERE {condition}", (time.time() + lease_seconds,) + params
+        ).rowcount == 1)
+
+    def complete(self, task, result=None, follow_up=None):
+        condition, params = self._holds_lease(task)
+
+        def finish(connection):
+            if connection.execute(
+                f"UPDATE tasks SET state = 'done', result = ?, error = NULL, finished_at = ?, lease_expires = NULL "
+                f"WHERE {condition}", (json.dumps(result), time.time()) + params
+            ).rowcount != 1:
+                return False
+            # Same transaction as the update: a worker dying right after its
+            # last chunk cannot leave the job without its merge
+            if follow_up is not None and connection.execute(
+                "SELECT COUNT(*) FROM tasks WHERE job_id = ? AND kind = ? AND state = 'done'",
+                (task.job_id, task.kind)
+            ).fetchone()[0] >= follow_up.after:
+                self._insert(connection, task.job_id, follow_up.kind, follow_up.key, follow_up.payload,
+                             follow_up.priority)
+            return True
+        return self._transaction(finish)
+
+    def fail(self, task, error, retry=True):
+        condition, params = self._holds_lease(task)
+        state = "queued" if retry and task.attempt < self.max_attempts else "failed"
+        return self._transaction(lambda connection: connection.execute(
+            f"UPDATE tasks SET state = ?, error = ?, lease_expires = NULL, "
+            f"finished_at = CASE WHEN ? = 'failed' THEN ? END WHERE {condition}",
+            (state, str(error), state, time.time()) + params
+        ).rowcount == 1)
+
+    def results(self, job_id, kind):
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT task_key, result FROM tasks WHERE job_id = ? AND kind = ? AND state = 'done'",
+                (job_id, kind)
+            ).fetchall()
+        return {row["task_key"]: json.loads(row["result"]) for row in rows}
+
+    def errors(self, job_id):
+        """[(kind, key, error)] of the failed tasks of one job"""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT kind, task_key, error FROM tasks WHERE job_id = ? AND state = 'failed' ORDER BY id",
+                (job_id,)
+            ).fetchall()
+        return [(row["kind"], row["task_key"], row["error"]) for row in rows]
+
+    def progress(self, job_id):
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT kind, state, COUNT(*) AS count FROM tasks WHERE job_id = ? GROUP BY kind, state",
+                (job_id,)
+            ).fetchall()
+        progress = {}
+        for row in rows:
+            progress.setdefault(row["kind"], {})[row["state"]] = row["count"]
+        return progress
+
+    def delete_job(self, job_id):
+        self._transaction(lambda connection: connection.execute("DELETE FROM tasks WHERE job_id = ?", (job_id,)))
+
+    def register_worker(self, worker_id, info=None):
+        """Record (or refresh) a worker node; ``last_seen`` doubles as its liveness heartbeat"""
+        now = time.time()
+        self._transaction(lambda connection: connection.execute(
+            "INSERT INTO workers (worker_id, host, info, started_at, last_seen) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(worker_id) DO UPDATE SET last_seen = excluded.last_seen, info = excluded.info",
+            (worker_id, socket.gethostname(), json.dumps(info or {}), now, now)
+        ))
+
+    def unregister_worker(self, worker_id):
+        self._transaction(lambda connection: connection.execute(
+            "DELETE FROM workers WHERE worker_id = ?", (worker_id,)
+        ))
+
+    def workers(self, alive_within=120.0):
+        """Workers seen in the last ``alive_within`` seconds, with the task each is running"""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT w.worker_id, w.host, w.info, w.last_seen, "
+                "(SELECT job_id || '/' || kind || '/' || task_key FROM tasks t "
+                " WHERE t.worker_id = w.worker_id AND t.state = 'running' LIMIT 1) AS task "
+                "FROM workers w WHERE w.last_seen >= ? ORDER BY w.worker_id",
+                (time.time() - alive_within,)
+            ).fetchall()
+        return [dict(row, info=json.loads(row["info"] or "{}")) for row in rows]